@@ -0,0 +1,415 @@
+"""
+Load test and latency benchmark for the forecasting API. Run
+
+    python src/api/benchmark.py --help
+
+for usage help.
+
+The API is started in a subprocess against synthetic models generated in a temporary directory,
+so no database, trained model or network access is needed. Results are written as JSON, to be
+compared across commits.
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+from src.constants import FIT_TIMESTAMP_FORMAT, FORECAST_MAX_HORIZON, LOGS, ROOT
+from src.logger_definition import get_logger
+from src.models.artifact_store import ArtifactStore
+from src.models.forecast_table import ForecastTable
+from src.models.serving_model import ServingModel
+
+logger = get_logger(__file__)
+
+
+def synthetic_serving_model(
+    coin_id: str, fit_timestamp: str, k_states: int, rng: np.random.Generator
+) -> ServingModel:
+    """Builds a serving model with random, stable state space matrices.
+
+    Forecasts are meaningless, but cost the same as those of a fitted model with as many states,
+    e.g. 32 states for the default (30, 1, 30) order.
+
+    Args:
+        coin_id (str): Coin name.
+        fit_timestamp (str): Fit timestamp of the model.
+        k_states (int): Number of states.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        ServingModel: The synthetic model.
+    """
+    transition = rng.normal(size=(k_states, k_states))
+    transition *= 0.95 / np.abs(np.linalg.eigvals(transition)).max()
+
+    selection = rng.normal(size=(k_states, 1))
+
+    return ServingModel(
+        coin_id=coin_id,
+        fit_timestamp=fit_timestamp,
+        start_date=datetime.date.today() - datetime.timedelta(days=1),
+        params=rng.normal(size=2 * k_states),
+        exog_params=np.array([rng.uniform(100, 1000)]),
+        design=rng.normal(size=k_states),
+        obs_cov=0.0,
+        transition=transition,
+        state_intercept=np.zeros(k_states),
+        selected_state_cov=selection @ selection.T,
+        state=rng.normal(size=k_states),
+        state_cov=np.eye(k_states),
+    )
+
+
+def write_synthetic_models(
+    models_dir: Path, num_coins: int, k_states: int, max_horizon: int, seed: int = 0
+) -> list[str]:
+    """Stores synthetic serving models and forecast tables as the trainer does.
+
+    Args:
+        models_dir (Path): Root of the artifact store to write the models to.
+        num_coins (int): Number of coins to generate models for.
+        k_states (int): Number of states of each model.
+        max_horizon (int): Number of days covered by the forecast tables.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        list[str]: Names of the generated coins.
+    """
+    rng = np.random.default_rng(seed)
+    fit_timestamp = datetime.datetime.now().strftime(FIT_TIMESTAMP_FORMAT)
+    z_score = NormalDist().inv_cdf(0.975)
+
+    store = ArtifactStore(models_dir)
+
+    coins = [f"coin{i}" for i in range(num_coins)]
+
+    for coin_id in coins:
+        model = synthetic_serving_model(coin_id, fit_timestamp, k_states, rng)
+        mean, var = model.forecast_mean_var(max_horizon)
+        table = ForecastTable(
+            coin_id=coin_id,
+            fit_timestamp=fit_timestamp,
+            start_date=model.start_date,
+            mean=mean,
+            lower=mean - z_score * np.sqrt(var),
+            upper=mean + z_score * np.sqrt(var),
+            alpha=0.05,
+            var=var,
+        )
+
+        artifacts = {}
+        for name, artifact in [("forecast_table", table), ("serving_model", model)]:
+            tmp_path = store.temporary_path()
+            artifact.save(tmp_path)
+            artifacts[name] = store.put_file(tmp_path)
+
+        model_name = f"{coin_id}_ARIMA_synthetic"
+        store.add_version(
+            {
+                "version": f"{model_name}_{fit_timestamp}",
+                "coin_id": coin_id,
+                "model_name": model_name,
+                "fit_timestamp": fit_timestamp,
+                "artifacts": artifacts,
+            }
+        )
+
+    return coins
+
+
+def read_rss_mb(pid: int) -> dict[str, float]:
+    """Reads current and peak resident memory of a process and its children from /proc.
+
+    Args:
+        pid (int): Process id.
+
+    Returns:
+        dict[str, float]: Current and peak RSS of the process, and current RSS of its children,
+            in MB. Empty if /proc is not available.
+    """
+
+    def status_kb(process_id: int, field: str) -> float:
+        with open(f"/proc/{process_id}/status") as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return float(line.split()[1])
+        return 0.0
+
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as file:
+            children = [int(child) for child in file.read().split()]
+
+        return {
+            "server": status_kb(pid, "VmRSS") / 1024,
+            "server_peak": status_kb(pid, "VmHWM") / 1024,
+            "workers": sum(status_kb(child, "VmRSS") for child in children) / 1024,
+        }
+    except OSError:
+        return {}
+
+
+def parse_horizon_mix(horizon_mix: str) -> dict[int, float]:
+    """Parses a horizon mix such as "7:0.5,30:0.3,365:0.15,730:0.05".
+
+    Args:
+        horizon_mix (str): Comma separated days:weight pairs.
+
+    Returns:
+        dict[int, float]: Weight per horizon in days.
+    """
+    mix = {}
+    for pair in horizon_mix.split(","):
+        days, weight = pair.split(":")
+        mix[int(days)] = float(weight)
+
+    return mix
+
+
+def wait_for_server(port: int, timeout: float = 30.0):
+    """Polls the API until it answers, raising TimeoutError after timeout seconds."""
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/coins")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise TimeoutError(f"API did not start within {timeout} seconds")
+
+
+def run_load(
+    port: int,
+    coins: list[str],
+    horizon_mix: dict[int, float],
+    endpoint: str,
+    num_requests: int,
+    concurrency: int,
+    seed: int = 0,
+) -> tuple[list[tuple[int, int, float]], float]:
+    """Sends num_requests requests from concurrency keep-alive connections.
+
+    Returns:
+        tuple[list[tuple[int, int, float]], float]: Horizon, status and latency in seconds of
+            every request, and the wall clock duration of the run.
+    """
+    rng = random.Random(seed)
+    start_date = datetime.date.today() - datetime.timedelta(days=1)
+    horizons = rng.choices(list(horizon_mix), weights=list(horizon_mix.values()), k=num_requests)
+
+    paths = []
+    for horizon in horizons:
+        target_date = start_date + datetime.timedelta(days=horizon)
+        path = f"/predictions/{rng.choice(coins)}/{target_date}"
+        paths.append(path + "/quantiles" if endpoint == "quantiles" else path)
+
+    results = []
+    lock = threading.Lock()
+    next_request = iter(range(num_requests))
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        while True:
+            with lock:
+                index = next(next_request, None)
+            if index is None:
+                break
+
+            request_start = time.perf_counter()
+            connection.request("GET", paths[index])
+            response = connection.getresponse()
+            response.read()
+            latency = time.perf_counter() - request_start
+
+            with lock:
+                results.append((horizons[index], response.status, latency))
+
+        connection.close()
+
+    run_start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results, time.perf_counter() - run_start
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """Computes latency percentiles in milliseconds."""
+    if not latencies:
+        return {}
+
+    latencies_ms = np.array(latencies) * 1000
+
+    return {
+        "p50": float(np.percentile(latencies_ms, 50)),
+        "p95": float(np.percentile(latencies_ms, 95)),
+        "p99": float(np.percentile(latencies_ms, 99)),
+        "mean": float(latencies_ms.mean()),
+        "max": float(latencies_ms.max()),
+    }
+
+
+def get_commit() -> str | None:
+    """Returns the short hash of the checked out commit, None outside of a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def serve(models_dir: Path, port: int):
+    """Runs the API with a model registry pointing to models_dir. Used by the benchmark process."""
+    import uvicorn
+
+    from src.api import forecasting_api
+    from src.api.model_registry import ModelRegistry
+
+    forecasting_api.model_registry = ModelRegistry(models_dir=models_dir)
+    uvicorn.run(forecasting_api.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("benchmark")
+
+    parser.add_argument(
+        "-n", "--requests", type=int, default=2000, help="Number of measured requests"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=8, help="Number of concurrent connections"
+    )
+    parser.add_argument(
+        "--horizons",
+        default="7:0.5,30:0.3,365:0.15,730:0.05",
+        help="Comma separated days:weight pairs of forecast horizons to request",
+    )
+    parser.add_argument(
+        "--endpoint",
+        choices=["predictions", "quantiles"],
+        default="predictions",
+        help="Endpoint to benchmark",
+    )
+    parser.add_argument("--coins", type=int, default=2, help="Number of synthetic coins")
+    parser.add_argument(
+        "--states", type=int, default=32, help="Number of states of the synthetic models"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=100, help="Number of unmeasured warmup requests"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("-o", "--output", type=Path, help="Path of the JSON results file")
+    parser.add_argument("--serve", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        sys.exit()
+
+    horizon_mix = parse_horizon_mix(args.horizons)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models_dir = Path(tmp_dir)
+        coins = write_synthetic_models(
+            models_dir, args.coins, args.states, FORECAST_MAX_HORIZON, seed=args.seed
+        )
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(models_dir), "--port", str(port)],
+            cwd=ROOT,
+            env={**os.environ, "PYTHONPATH": str(ROOT)},
+        )
+
+        try:
+            wait_for_server(port)
+            rss_start = read_rss_mb(server.pid)
+
+            logger.info(f"Warming up with {args.warmup} requests")
+            run_load(port, coins, horizon_mix, args.endpoint, args.warmup, args.concurrency)
+
+            logger.info(
+                f"Sending {args.requests} requests with concurrency {args.concurrency} to"
+                f" {args.endpoint}"
+            )
+            results, duration = run_load(
+                port,
+                coins,
+                horizon_mix,
+                args.endpoint,
+                args.requests,
+                args.concurrency,
+                seed=args.seed,
+            )
+            rss_end = read_rss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+    status_counts = {}
+    for _, status, _ in results:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+
+    report = {
+        "commit": get_commit(),
+        "timestamp": datetime.datetime.now().isoformat(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "horizons": horizon_mix,
+            "endpoint": args.endpoint,
+            "coins": args.coins,
+            "states": args.states,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "duration_seconds": duration,
+        "requests_per_second": len(results) / duration,
+        "status_counts": status_counts,
+        "latency_ms": summarize_latencies([latency for _, _, latency in results]),
+        "latency_ms_by_horizon": {
+            str(horizon): summarize_latencies(
+                [latency for days, _, latency in results if days == horizon]
+            )
+            for horizon in horizon_mix
+        },
+        "rss_mb": {"start": rss_start, "end": rss_end},
+    }
+
+    output = args.output or LOGS / f"benchmark_{report['commit']}_{int(time.time())}.json"
+    output.write_text(json.dumps(report, indent=2))
+
+    latency = report["latency_ms"]
+    logger.info(
+        f"{report['requests_per_second']:.1f} requests/s, p50 {latency['p50']:.2f}ms,"
+        f" p95 {latency['p95']:.2f}ms, p99 {latency['p99']:.2f}ms. Results saved to {output}"
+    )
@@ -0,0 +1,92 @@
+"""
+Defines an in memory cache for the forecasts served by the forecasting API.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.constants import FORECAST_CACHE_MAX_SIZE
+from src.models.serving_model import ServingModel
+
+
+class ForecastCache:
+    """Bounded LRU cache of forecasted prices, keyed by coin and model fit timestamp.
+
+    A forecast to day N+30 contains the forecast to day N+10, so for every model only the longest
+    horizon computed so far is stored, and shorter target dates are served by slicing it. Since the
+    fit timestamp is part of the key, a retrained model never reuses forecasts of its predecessor.
+    Besides forecast means, other per day statistics such as the forecast variances can be cached
+    under their own name.
+
+    Args:
+        max_size (int, optional): Maximum number of cached forecasts. The least recently used
+            entry is evicted once exceeded. Defaults to FORECAST_CACHE_MAX_SIZE.
+    """
+
+    def __init__(self, max_size: int = FORECAST_CACHE_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("Cache max size must be a positive integer")
+
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drops every cached forecast."""
+        with self._lock:
+            self._entries.clear()
+
+    def lookup(
+        self, model: ServingModel, num_forecast_days: int, statistic: str = "mean"
+    ) -> np.ndarray | None:
+        """Slices the cached forecast of model, if it covers the given horizon.
+
+        Args:
+            model (ServingModel): Trained model to forecast with.
+            num_forecast_days (int): Number of days to forecast.
+            statistic (str, optional): Forecasted statistic to look up. Defaults to "mean".
+
+        Returns:
+            np.ndarray | None: Forecasted values, or None on a cache miss.
+        """
+        key = (model.coin, model.fit_timestamp, statistic)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and len(cached) >= num_forecast_days:
+                self._entries.move_to_end(key)
+                return cached[:num_forecast_days]
+
+        return None
+
+    def store(self, model: ServingModel, forecasted_values: np.ndarray, statistic: str = "mean"):
+        """Caches forecasted values of model, unless a longer horizon is already cached.
+
+        Args:
+            model (ServingModel): Model that produced the forecast.
+            forecasted_values (np.ndarray): Forecasted values, one per forecasted day.
+            statistic (str, optional): Forecasted statistic to store. Defaults to "mean".
+        """
+        key = (model.coin, model.fit_timestamp, statistic)
+        forecasted_values.setflags(write=False)
+
+        with self._lock:
+            # Drop forecasts from previous fits of the same coin, they will never be hit again
+            for stale_key in [
+                k for k in self._entries if k[0] == model.coin and k[1] != model.fit_timestamp
+            ]:
+                del self._entries[stale_key]
+
+            # Another request may have stored a longer horizon in the meantime
+            cached = self._entries.get(key)
+            if cached is None or len(cached) < len(forecasted_values):
+                self._entries[key] = forecasted_values
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,129 @@
+"""
+Defines the bounded worker pool that runs CPU bound forecasts for the forecasting API.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from src.constants import (
+    FORECAST_MAX_QUEUE_SIZE,
+    FORECAST_MAX_WORKERS,
+    FORECAST_WORKER_MODEL_CACHE_SIZE,
+)
+from src.models.serving_model import ServingModel
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the forecast queue is full and the request should be retried later."""
+
+
+@lru_cache(maxsize=FORECAST_WORKER_MODEL_CACHE_SIZE)
+def _load_model(model_path: str) -> ServingModel:
+    """Loads a model inside a worker process, caching it for subsequent forecasts.
+
+    Model paths point to timestamped artifacts in the history dir, which are never overwritten, so
+    caching by path is safe across retrains.
+    """
+    return ServingModel.load(model_path)
+
+
+def _forecast_mean(model_path: str, num_forecast_days: int) -> np.ndarray:
+    """Forecasts prices with the model stored at model_path. Runs inside a worker process."""
+    return _load_model(model_path).forecast_mean(num_forecast_days)
+
+
+def _forecast_mean_var(model_path: str, num_forecast_days: int) -> tuple[np.ndarray, np.ndarray]:
+    """Forecasts prices and variances with the model stored at model_path, in a worker process."""
+    return _load_model(model_path).forecast_mean_var(num_forecast_days)
+
+
+class ForecastExecutor:
+    """Size limited process pool for forecasts, with a bounded request queue.
+
+    Forecasting long horizons is CPU bound work, so it runs in worker processes, away from the GIL
+    and the event loop serving cheap requests. Each worker keeps its own copies of the models it
+    used recently, so only the model path and horizon are sent per request. Once max_workers
+    forecasts are running and max_queue_size more are waiting, new submissions are rejected with
+    ExecutorBusyError instead of piling up.
+
+    Args:
+        max_workers (int, optional): Number of worker processes. Defaults to FORECAST_MAX_WORKERS.
+        max_queue_size (int, optional): Number of forecasts allowed to wait for a free worker.
+            Defaults to FORECAST_MAX_QUEUE_SIZE.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = FORECAST_MAX_WORKERS,
+        max_queue_size: int = FORECAST_MAX_QUEUE_SIZE,
+    ):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self):
+        """Starts the worker processes."""
+        if self._executor is None:
+            # Spawn instead of fork, the API process runs threads that must not be forked
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self):
+        """Stops the worker processes, cancelling queued forecasts."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def forecast_mean(self, model_path: str, num_forecast_days: int) -> np.ndarray:
+        """Forecasts prices with the model stored at model_path in a worker process.
+
+        Args:
+            model_path (str): Resolved path to the serving model.
+            num_forecast_days (int): Number of days to forecast.
+
+        Raises:
+            ExecutorBusyError: Every worker is busy and the queue is full.
+
+        Returns:
+            np.ndarray: Forecasted prices, one per forecasted day.
+        """
+        return await self._submit(_forecast_mean, model_path, num_forecast_days)
+
+    async def forecast_mean_var(
+        self, model_path: str, num_forecast_days: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Forecasts prices and their variances with the model stored at model_path.
+
+        Args:
+            model_path (str): Resolved path to the serving model.
+            num_forecast_days (int): Number of days to forecast.
+
+        Raises:
+            ExecutorBusyError: Every worker is busy and the queue is full.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Forecasted prices and their variances.
+        """
+        return await self._submit(_forecast_mean_var, model_path, num_forecast_days)
+
+    async def _submit(self, func, *args):
+        """Runs func in a worker process, unless the queue is full."""
+        # The counter is only touched from the event loop thread, so no lock is needed
+        if self.pending >= self.max_workers + self.max_queue_size:
+            raise ExecutorBusyError("Forecast queue is full")
+
+        self.start()
+        self.pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
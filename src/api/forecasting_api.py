@@ -1,28 +1,76 @@
 """
-API for serving of the forecasting models.
+API for serving of the forecasting models. Run
+
+    uvicorn src.api.forecasting_api:app --host 0.0.0.0 --port 8000
+
+The module is imported by uvicorn instead of run as a script, since forecast workers are spawned
+processes that re-execute the main script on start, which would build another registry, executor
+and app in every worker.
 """
 
+import asyncio
 import datetime
-import pickle
-from enum import auto
-
-from fastapi import FastAPI
-from fastapi_utils.enums import StrEnum
+import time
+from collections import defaultdict
 
-from src.constants import ARIMA_DEAFULT_ORDER, MODELS_FORECASTING
-from src.models.forecasters import ARIMAModel  # noqa
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
-ethereum_model_name = (
-    f"ethereum_ARIMA_{'.'.join(list([str(o) for o in ARIMA_DEAFULT_ORDER]))}_0.0.0.0"
+from src.api import metrics
+from src.api.forecast_cache import ForecastCache
+from src.api.forecast_executor import ExecutorBusyError, ForecastExecutor
+from src.api.model_registry import LoadedModel, ModelRegistry
+from src.constants import (
+    BATCH_PREDICTIONS_MAX_SIZE,
+    FIT_TIMESTAMP_FORMAT,
+    FORECAST_QUANTILES,
 )
-ethereum_model_path = MODELS_FORECASTING / f"{ethereum_model_name}_latest.pickle"
-with open(ethereum_model_path, "rb") as file:
-    ethereum_model = pickle.load(file)
+from src.models.serving_model import normal_quantiles
 
-bitcoin_model_name = f"bitcoin_ARIMA_{'.'.join(list([str(o) for o in ARIMA_DEAFULT_ORDER]))}"
-bitcoin_model_path = MODELS_FORECASTING / f"{bitcoin_model_name}_0.0.0.0_latest.pickle"
-with open(bitcoin_model_path, "rb") as file:
-    bitcoin_model = pickle.load(file)
+# Models are discovered from the models dir and loaded on first request. Retrained models are
+# picked up by the registry watcher without restarting the API
+model_registry = ModelRegistry()
+
+# Forecasts beyond the precomputed tables are cached per model, so repeated requests are served
+# without running the forecast recursions again
+forecast_cache = ForecastCache()
+
+# Cache misses are computed in a bounded process pool, so they never block the event loop
+forecast_executor = ForecastExecutor()
+
+# In process metrics, exposed at /metrics
+requests_total = metrics.Counter(
+    "api_requests_total", "Prediction requests served.", ("endpoint", "coin_id", "status")
+)
+request_duration = metrics.Histogram(
+    "api_request_duration_seconds",
+    "Prediction request latency, including response serialization.",
+    ("endpoint", "horizon_le"),
+)
+forecasts_total = metrics.Counter(
+    "api_forecasts_total",
+    "Forecasts served, by source: precomputed table, cache or forecast worker.",
+    ("coin_id", "source"),
+)
+forecast_duration = metrics.Histogram(
+    "api_forecast_duration_seconds",
+    "Time to get forecasted prices, including queueing for a worker.",
+    ("source", "horizon_le"),
+)
+forecast_queue_pending = metrics.Gauge(
+    "api_forecast_queue_pending", "Forecasts running or waiting for a worker."
+)
+model_load_seconds = metrics.Gauge(
+    "api_model_load_seconds", "Time it took to load the current model.", ("coin_id",)
+)
+model_fit_timestamp = metrics.Gauge(
+    "api_model_fit_timestamp_seconds",
+    "Fit time of the current model as a unix timestamp.",
+    ("coin_id", "fit_timestamp"),
+)
 
 app = FastAPI(
     title="Ecoin Forecast API",
@@ -31,9 +79,34 @@ app = FastAPI(
 )
 
 
-class AvailableCoins(StrEnum):
-    bitcoin = auto()
-    ethereum = auto()
+@app.on_event("startup")
+def start_background_workers():
+    model_registry.start_watching()
+    forecast_executor.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    model_registry.stop_watching()
+    forecast_executor.shutdown()
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Records count and latency of the requests whose handler set request.state.endpoint."""
+    start = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        endpoint = getattr(request.state, "endpoint", None)
+        if endpoint is not None:
+            horizon = metrics.horizon_bucket(getattr(request.state, "num_forecast_days", None))
+            requests_total.inc(endpoint, request.state.coin_id, str(status))
+            request_duration.observe(time.perf_counter() - start, endpoint, horizon)
 
 
 @app.get("/")
@@ -46,23 +119,310 @@ def root():
     return
 
 
-@app.get("/predictions/{coin_id}/{target_date}")
-def get_predictions(coin_id: AvailableCoins, target_date: datetime.date):
-    # Predict according to passed coin
-    if coin_id == "ethereum":
-        predictions = ethereum_model.forecast(target_date=target_date)
-    elif coin_id == "bitcoin":
-        predictions = bitcoin_model.forecast(target_date=target_date)
+@app.get("/coins")
+def available_coins() -> list[str]:
+    return model_registry.coins()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    # Model and queue metrics are snapshots, refreshed on every scrape
+    forecast_queue_pending.set(forecast_executor.pending)
+
+    model_load_seconds.clear()
+    model_fit_timestamp.clear()
+    for coin_id, loaded_model in model_registry.loaded().items():
+        fit_timestamp = loaded_model.model.fit_timestamp
+        fit_time = datetime.datetime.strptime(fit_timestamp, FIT_TIMESTAMP_FORMAT)
+
+        model_load_seconds.set(loaded_model.load_seconds, coin_id)
+        model_fit_timestamp.set(fit_time.timestamp(), coin_id, fit_timestamp)
+
+    return metrics.render(
+        [
+            requests_total,
+            request_duration,
+            forecasts_total,
+            forecast_duration,
+            forecast_queue_pending,
+            model_load_seconds,
+            model_fit_timestamp,
+        ]
+    )
+
+
+class PredictionRequest(BaseModel):
+    coin_id: str
+    target_date: datetime.date
+
+
+async def get_loaded_model(coin_id: str) -> LoadedModel:
+    """Gets the current model for coin_id, reading it from disk off the event loop if needed.
+
+    Args:
+        coin_id (str): Coin to get the model for.
+
+    Raises:
+        HTTPException: 404 if no model is trained for coin_id.
+
+    Returns:
+        LoadedModel: The current model for coin_id.
+    """
+    loaded_model = model_registry.get_loaded(coin_id)
+
+    if loaded_model is None:
+        try:
+            loaded_model = await run_in_threadpool(model_registry.get, coin_id)
+        except KeyError:
+            raise HTTPException(
+                status_code=404,
+                detail=(
+                    f"No model trained for {coin_id}. Coin must be one of"
+                    f" {' '.join(model_registry.coins())}"
+                ),
+            )
+
+    return loaded_model
+
+
+def get_forecast_horizon(loaded_model: LoadedModel, target_date: datetime.date) -> int:
+    """Computes the number of days to forecast to reach target_date.
+
+    Args:
+        loaded_model (LoadedModel): Model to forecast with.
+        target_date (datetime.date): Target date to predict.
+
+    Raises:
+        HTTPException: 422 if target_date is not after the model train data.
+
+    Returns:
+        int: Number of days to forecast.
+    """
+    try:
+        return loaded_model.model.forecast_horizon(target_date)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+
+
+async def run_in_forecast_worker(forecast, *args):
+    """Awaits a forecast executor call, answering 503 if the forecast queue is full."""
+    try:
+        return await forecast(*args)
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many forecasts in progress, please retry later",
+            headers={"Retry-After": "1"},
+        )
+
+
+def record_forecast(coin_id: str, source: str, num_forecast_days: int, start: float):
+    """Records where a forecast was served from and how long it took since start."""
+    forecasts_total.inc(coin_id, source)
+    forecast_duration.observe(
+        time.perf_counter() - start, source, metrics.horizon_bucket(num_forecast_days)
+    )
+
+
+async def get_forecast_mean(loaded_model: LoadedModel, num_forecast_days: int) -> np.ndarray:
+    """Gets forecasted prices from the precomputed table, the cache or a forecast worker.
+
+    Args:
+        loaded_model (LoadedModel): Model to forecast with.
+        num_forecast_days (int): Number of days to forecast.
+
+    Raises:
+        HTTPException: 503 if the forecast queue is full.
+
+    Returns:
+        np.ndarray: Forecasted prices, one per forecasted day.
+    """
+    start = time.perf_counter()
+    model = loaded_model.model
+
+    # Serve from the precomputed table when possible, fall back to the model otherwise
+    forecast_table = loaded_model.forecast_table
+    if forecast_table is not None and num_forecast_days <= forecast_table.max_horizon:
+        source = "table"
+        forecasted_prices = forecast_table.mean[:num_forecast_days]
+    elif (forecasted_prices := forecast_cache.lookup(model, num_forecast_days)) is not None:
+        source = "cache"
+    else:
+        source = "worker"
+        forecasted_prices = await run_in_forecast_worker(
+            forecast_executor.forecast_mean, str(loaded_model.path), num_forecast_days
+        )
+        forecast_cache.store(model, forecasted_prices)
+
+    record_forecast(model.coin, source, num_forecast_days, start)
+
+    return forecasted_prices
+
+
+async def get_forecast_mean_var(
+    loaded_model: LoadedModel, num_forecast_days: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gets forecasted prices and variances from the table, the cache or a forecast worker.
+
+    Args:
+        loaded_model (LoadedModel): Model to forecast with.
+        num_forecast_days (int): Number of days to forecast.
+
+    Raises:
+        HTTPException: 503 if the forecast queue is full.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Forecasted prices and their variances.
+    """
+    start = time.perf_counter()
+    model = loaded_model.model
+
+    forecast_table = loaded_model.forecast_table
+    if (
+        forecast_table is not None
+        and forecast_table.var is not None
+        and num_forecast_days <= forecast_table.max_horizon
+    ):
+        source = "table"
+        forecasted_prices = forecast_table.mean[:num_forecast_days]
+        forecasted_vars = forecast_table.var[:num_forecast_days]
+    elif (forecasted_prices := forecast_cache.lookup(model, num_forecast_days)) is not None and (
+        forecasted_vars := forecast_cache.lookup(model, num_forecast_days, "var")
+    ) is not None:
+        source = "cache"
     else:
-        raise ValueError(
-            "No model trained for required coin. Coin must be one of"
-            f" {' '.join([coin for coin in AvailableCoins])}"
+        source = "worker"
+        forecasted_prices, forecasted_vars = await run_in_forecast_worker(
+            forecast_executor.forecast_mean_var, str(loaded_model.path), num_forecast_days
+        )
+        forecast_cache.store(model, forecasted_prices)
+        forecast_cache.store(model, forecasted_vars, "var")
+
+    record_forecast(model.coin, source, num_forecast_days, start)
+
+    return forecasted_prices, forecasted_vars
+
+
+@app.get("/predictions/{coin_id}/{target_date}")
+async def get_predictions(request: Request, coin_id: str, target_date: datetime.date):
+    # Only label metrics with known coins, to keep their cardinality bounded
+    request.state.endpoint, request.state.coin_id = "predictions", "unknown"
+
+    loaded_model = await get_loaded_model(coin_id)
+    request.state.coin_id = coin_id
+
+    num_forecast_days = get_forecast_horizon(loaded_model, target_date)
+    request.state.num_forecast_days = num_forecast_days
+
+    forecasted_prices = await get_forecast_mean(loaded_model, num_forecast_days)
+
+    return dict(
+        zip(loaded_model.model.forecast_dates(num_forecast_days), forecasted_prices.tolist())
+    )
+
+
+@app.get("/predictions/{coin_id}/{target_date}/quantiles")
+async def get_prediction_quantiles(
+    request: Request,
+    coin_id: str,
+    target_date: datetime.date,
+    q: list[float] = Query(list(FORECAST_QUANTILES)),
+):
+    """Forecasts several price quantiles for every date until target_date.
+
+    Quantiles are computed for the whole horizon at once, from the Gaussian forecast means and
+    variances, and returned per date keyed by quantile.
+    """
+    request.state.endpoint, request.state.coin_id = "prediction_quantiles", "unknown"
+
+    if any(not 0 < quantile < 1 for quantile in q):
+        raise HTTPException(status_code=422, detail="Quantiles must be strictly between 0 and 1")
+
+    loaded_model = await get_loaded_model(coin_id)
+    request.state.coin_id = coin_id
+
+    num_forecast_days = get_forecast_horizon(loaded_model, target_date)
+    request.state.num_forecast_days = num_forecast_days
+
+    forecasted_prices, forecasted_vars = await get_forecast_mean_var(
+        loaded_model, num_forecast_days
+    )
+    forecasted_quantiles = normal_quantiles(forecasted_prices, forecasted_vars, q)
+
+    quantile_names = [str(quantile) for quantile in q]
+    return {
+        date: dict(zip(quantile_names, values))
+        for date, values in zip(
+            loaded_model.model.forecast_dates(num_forecast_days), forecasted_quantiles.tolist()
+        )
+    }
+
+
+@app.post("/predictions")
+async def get_batch_predictions(request: Request, prediction_requests: list[PredictionRequest]):
+    """Forecasts many coin and target date pairs in one call.
+
+    Requests are grouped by coin, and each coin is forecasted once at the longest requested
+    horizon. Every request is answered with a slice of that forecast, in request order.
+
+    Every coin and target date is validated before any forecast starts, so an invalid request
+    fails the whole batch without leaving forecasts running for the other coins.
+    """
+    request.state.endpoint, request.state.coin_id = "batch_predictions", "all"
+
+    if len(prediction_requests) > BATCH_PREDICTIONS_MAX_SIZE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {BATCH_PREDICTIONS_MAX_SIZE} predictions can be requested at once",
         )
 
-    return predictions
+    target_dates_by_coin = defaultdict(set)
+    for prediction_request in prediction_requests:
+        target_dates_by_coin[prediction_request.coin_id].add(prediction_request.target_date)
 
+    # Raises 404 for unknown coins, models are read from disk concurrently
+    loaded_models = dict(
+        zip(
+            target_dates_by_coin,
+            await asyncio.gather(*[get_loaded_model(coin) for coin in target_dates_by_coin]),
+        )
+    )
 
-if __name__ == "__main__":
-    import uvicorn
+    # Raises 422 for target dates not after the train data
+    horizons_by_coin = {
+        coin_id: {date: get_forecast_horizon(loaded_models[coin_id], date) for date in target_dates}
+        for coin_id, target_dates in target_dates_by_coin.items()
+    }
+    request.state.num_forecast_days = max(
+        (max(horizons.values()) for horizons in horizons_by_coin.values()), default=None
+    )
+
+    async def forecast_coin(coin_id: str, horizons: dict[datetime.date, int]):
+        loaded_model = loaded_models[coin_id]
+        max_horizon = max(horizons.values())
+
+        forecasted_prices = (await get_forecast_mean(loaded_model, max_horizon)).tolist()
+        forecast_dates = loaded_model.model.forecast_dates(max_horizon)
+
+        return coin_id, {
+            date: dict(zip(forecast_dates[:horizon], forecasted_prices[:horizon]))
+            for date, horizon in horizons.items()
+        }
+
+    # Coins are forecasted concurrently, misses for different models run in parallel workers
+    predictions_by_coin = dict(
+        await asyncio.gather(
+            *[forecast_coin(coin, horizons) for coin, horizons in horizons_by_coin.items()]
+        )
+    )
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    return [
+        {
+            "coin_id": prediction_request.coin_id,
+            "target_date": prediction_request.target_date,
+            "predictions": predictions_by_coin[prediction_request.coin_id][
+                prediction_request.target_date
+            ],
+        }
+        for prediction_request in prediction_requests
+    ]
@@ -0,0 +1,172 @@
+"""
+Defines lightweight in process metrics exposed by the forecasting API in Prometheus text format.
+
+See the exposition format in: https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+import bisect
+import threading
+from collections.abc import Iterable
+
+from src.constants import METRICS_HORIZON_BUCKETS, METRICS_LATENCY_BUCKETS
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...]) -> str:
+    """Formats label pairs as `{name="value",...}`, escaping values as the format requires."""
+    if not label_names:
+        return ""
+
+    pairs = []
+    for name, value in zip(label_names, label_values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def horizon_bucket(num_forecast_days: int | None) -> str:
+    """Maps a forecast horizon to the smallest METRICS_HORIZON_BUCKETS bound fitting it.
+
+    Args:
+        num_forecast_days (int | None): Number of forecasted days, None if unknown.
+
+    Returns:
+        str: The bucket upper bound, "+Inf" beyond the last bound or "none" if unknown.
+    """
+    if num_forecast_days is None:
+        return "none"
+
+    index = bisect.bisect_left(METRICS_HORIZON_BUCKETS, num_forecast_days)
+    if index == len(METRICS_HORIZON_BUCKETS):
+        return "+Inf"
+
+    return str(METRICS_HORIZON_BUCKETS[index])
+
+
+class _Metric:
+    """Base class for labeled metrics, storing one value per combination of label values."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Drops every recorded label combination."""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        """Renders the metric as Prometheus text format lines."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+        with self._lock:
+            values = sorted(self._values.items())
+
+        for label_values, value in values:
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. of requests served."""
+
+    type_name = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. a queue size or a model load time."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, *label_values: str):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, counted in cumulative buckets.
+
+    Args:
+        name (str): Metric name.
+        documentation (str): Metric help text.
+        label_names (Iterable[str], optional): Names of the metric labels.
+        buckets (Iterable[float], optional): Upper bounds of the buckets. Defaults to
+            METRICS_LATENCY_BUCKETS.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = METRICS_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: count per bucket (last one is +Inf), then sum of observations
+        self._observations: dict[tuple[str, ...], list[float]] = {}
+
+    def clear(self):
+        with self._lock:
+            self._observations.clear()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            observations = self._observations.get(label_values)
+            if observations is None:
+                observations = self._observations[label_values] = [0.0] * (len(self.buckets) + 2)
+            observations[index] += 1
+            observations[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        label_names = self.label_names + ("le",)
+
+        with self._lock:
+            observations = sorted((k, list(v)) for k, v in self._observations.items())
+
+        for label_values, counts in observations:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                labels = _format_labels(label_names, label_values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-1])}")
+
+        return lines
+
+
+def render(metrics: Iterable[_Metric]) -> str:
+    """Renders metrics as a Prometheus text format document.
+
+    Args:
+        metrics (Iterable[_Metric]): Metrics to render.
+
+    Returns:
+        str: The exposition document.
+    """
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
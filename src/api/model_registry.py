@@ -0,0 +1,264 @@
+"""
+Defines a registry that discovers, lazily loads and hot reloads the models served by the API.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+from src.constants import MODEL_REGISTRY_POLL_INTERVAL, MODELS_FORECASTING
+from src.logger_definition import get_logger
+from src.models.artifact_store import ArtifactStore
+from src.models.forecast_table import ForecastTable
+from src.models.serving_model import ServingModel
+
+logger = get_logger(__file__)
+
+
+def load_forecast_table(model: ServingModel, table_path: Path | None) -> ForecastTable | None:
+    """Loads the forecast table precomputed at train time with the serving model.
+
+    Args:
+        model (ServingModel): Model the table is expected to belong to.
+        table_path (Path | None): Path to the forecast table, None if the version has none.
+
+    Returns:
+        ForecastTable | None: The forecast table, or None if missing or from a different fit.
+    """
+    if table_path is None or not table_path.exists():
+        logger.warning(f"No forecast table found for {model.coin}, forecasts will be computed")
+        return None
+
+    table = ForecastTable.load(table_path)
+
+    if table.fit_timestamp != model.fit_timestamp:
+        logger.warning(f"Forecast table for {model.coin} is stale, forecasts will be computed")
+        return None
+
+    return table
+
+
+class LoadedModel:
+    """A model loaded from disk, together with its forecast table.
+
+    Instances are never mutated, a reload creates a new instance, so requests holding a reference
+    keep a consistent model and table while a newer model is swapped in.
+
+    Args:
+        model (ServingModel): The slim serving model.
+        forecast_table (ForecastTable | None): The precomputed forecasts, if available.
+        version (str): Id of the loaded model version.
+        path (Path): Path of the loaded serving model object.
+        load_seconds (float): Time it took to load the model and table.
+    """
+
+    def __init__(
+        self,
+        model: ServingModel,
+        forecast_table: ForecastTable | None,
+        version: str,
+        path: Path,
+        load_seconds: float,
+    ):
+        self.model = model
+        self.forecast_table = forecast_table
+        self.version = version
+        self.path = path
+        self.load_seconds = load_seconds
+
+    @classmethod
+    def load(cls, store: ArtifactStore, version: dict) -> "LoadedModel":
+        """Loads the serving model and forecast table of a stored model version.
+
+        Args:
+            store (ArtifactStore): Store holding the version artifacts.
+            version (dict): Version from the store manifest.
+
+        Returns:
+            LoadedModel: The loaded model.
+        """
+        start = time.perf_counter()
+        artifacts = version["artifacts"]
+        path = store.object_path(artifacts["serving_model"])
+
+        model = ServingModel.load(path)
+
+        table_digest = artifacts.get("forecast_table")
+        table_path = None if table_digest is None else store.object_path(table_digest)
+        forecast_table = load_forecast_table(model, table_path)
+        load_seconds = time.perf_counter() - start
+
+        logger.info(f"Loaded {model.coin} model version {version['version']} from {path}")
+
+        return cls(model, forecast_table, version["version"], path, load_seconds)
+
+
+class ModelRegistry:
+    """Registry of the models available under the models dir.
+
+    Coins are discovered from the latest versions in the artifact store manifest written by the
+    trainer, and each coin's model is loaded the first time it is requested. A background thread
+    watches the manifest and reloads models whose latest version changed, swapping them in
+    atomically.
+
+    Args:
+        models_dir (Path, optional): Root of the model artifact store. Defaults to
+            MODELS_FORECASTING.
+        poll_interval (float, optional): Seconds between checks for retrained models. Defaults to
+            MODEL_REGISTRY_POLL_INTERVAL.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path = MODELS_FORECASTING,
+        poll_interval: float = MODEL_REGISTRY_POLL_INTERVAL,
+    ):
+        self.models_dir = models_dir
+        self.poll_interval = poll_interval
+        self.store = ArtifactStore(models_dir)
+
+        self._versions: dict[str, dict] = {}
+        self._entries: dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._stop_watching = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+        self.discover()
+
+    def discover(self) -> list[str]:
+        """Reads the latest model version of every coin from the store manifest.
+
+        If a coin has more than one latest version, e.g. trained with different orders, the most
+        recently fitted one is used. The manifest is only parsed again when it changed.
+
+        Returns:
+            list[str]: The available coins.
+        """
+        versions = self.store.latest_by_coin()
+
+        with self._lock:
+            self._versions = versions
+
+        return sorted(versions)
+
+    def coins(self) -> list[str]:
+        """Lists the coins with an available model.
+
+        Returns:
+            list[str]: The available coins.
+        """
+        with self._lock:
+            return sorted(self._versions)
+
+    def loaded(self) -> dict[str, LoadedModel]:
+        """Returns the models loaded so far.
+
+        Returns:
+            dict[str, LoadedModel]: Loaded models by coin.
+        """
+        with self._lock:
+            return dict(self._entries)
+
+    def get_loaded(self, coin_id: str) -> LoadedModel | None:
+        """Gets the model for coin_id only if it is already loaded, never reading from disk.
+
+        Args:
+            coin_id (str): Coin to get the model for.
+
+        Returns:
+            LoadedModel | None: The current model for coin_id, or None if not loaded yet.
+        """
+        with self._lock:
+            return self._entries.get(coin_id)
+
+    def get(self, coin_id: str) -> LoadedModel:
+        """Gets the model for coin_id, loading it on first request.
+
+        Args:
+            coin_id (str): Coin to get the model for.
+
+        Raises:
+            KeyError: No model trained for coin_id.
+
+        Returns:
+            LoadedModel: The current model for coin_id.
+        """
+        with self._lock:
+            entry = self._entries.get(coin_id)
+            known = coin_id in self._versions
+
+        if entry is not None:
+            return entry
+
+        # The coin may have been trained after the last scan
+        if not known and coin_id not in self.discover():
+            raise KeyError(f"No model trained for {coin_id}")
+
+        return self._load(coin_id)
+
+    def refresh(self):
+        """Reloads every loaded model whose latest version changed.
+
+        Models whose coin disappeared from the manifest keep being served until a new version shows
+        up.
+        """
+        self.discover()
+
+        for coin_id, entry in self.loaded().items():
+            with self._lock:
+                version = self._versions.get(coin_id)
+
+            try:
+                if version is not None and version["version"] != entry.version:
+                    self._load(coin_id)
+            except Exception:
+                logger.exception(f"Failed to reload model for {coin_id}, keeping current one")
+
+    def start_watching(self):
+        """Starts the background thread that periodically refreshes the registry."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stops the background refresh thread."""
+        self._stop_watching.set()
+
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self):
+        while not self._stop_watching.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Model registry refresh failed")
+
+    def _load(self, coin_id: str) -> LoadedModel:
+        """Loads the model for coin_id unless its latest version is already loaded.
+
+        Loading happens outside the registry lock, so requests for other coins, and for the
+        previous model of this coin, are served while a model is being read from disk.
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(coin_id, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                version = self._versions[coin_id]
+                entry = self._entries.get(coin_id)
+
+            if entry is not None and entry.version == version["version"]:
+                return entry
+
+            entry = LoadedModel.load(self.store, version)
+
+            with self._lock:
+                self._entries[coin_id] = entry
+
+        return entry
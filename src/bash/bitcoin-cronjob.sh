@@ -1,2 +0,0 @@
-#! /bin/sh
-python src/crawler/crawl.py --coin_id bitcoin --start_date "$1" --db_store True
\ No newline at end of file
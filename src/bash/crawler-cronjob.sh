@@ -0,0 +1,3 @@
+#! /bin/sh
+# Crawls every coin already in the database
+python src/crawler/crawl.py --start_date "$1" --db_store True
\ No newline at end of file
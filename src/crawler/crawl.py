@@ -6,18 +6,23 @@ for usage help.
 """
 
 import argparse
+import datetime
+import sys
 
 from scrapy.crawler import CrawlerProcess
 
+from src.constants import COINGECKO_API_URL
 from src.crawler.settings import (
     CONCURRENT_REQUESTS,
+    CRAWL_RATE_LIMIT,
     DOWNLOAD_DELAY,
     DOWNLOADER_MIDDLEWARES,
     REQUEST_FINGERPRINTER_IMPLEMENTATION,
     ROBOTSTXT_OBEY,
     TWISTED_REACTOR,
 )
-from src.crawler.spiders.coingecko_spider import CoingeckoSpider
+from src.crawler.spiders.coingecko_spider import CoingeckoSpider, CrawlModes
+from src.crawler.stored_days import StoredSources, gap_days, missing_days
 from src.logger_definition import get_logger
 from src.utils import str2bool
 
@@ -31,20 +36,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser("crawler")
 
     parser.add_argument(
-        # TODO: incorporate list of strings as argument to crawl various coins in one run
         "-c",
+        "--coin_ids",
         "--coin_id",
-        required=True,
-        choices=["bitcoin", "ethereum", "cardano"],
-        help="Coin id to scrape",
+        nargs="+",
+        help="Coin ids to scrape in one crawl. Defaults to every coin in the database",
     )
 
     parser.add_argument(
         "-s",
         "--start_date",
-        required=True,
+        required=False,
         type=str,
-        help="Start of range of dates to scrape in iso format",
+        help="Start of range of dates to scrape in iso format, required unless repairing gaps",
     )
 
     parser.add_argument(
@@ -66,8 +70,88 @@ if __name__ == "__main__":
         help="Define wether to store in database or not",
     )
 
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=[mode.value for mode in CrawlModes],
+        default=CrawlModes.HISTORY.value,
+        help=(
+            "Crawl mode, history requests the full snapshot of every day, range requests the USD"
+            " price, market cap and volume of up to a year of days at once"
+        ),
+    )
+
+    parser.add_argument(
+        "--api_url",
+        default=COINGECKO_API_URL,
+        help="Base url of the coingecko API, e.g. of a local stub server",
+    )
+
+    parser.add_argument(
+        "--rate_limit",
+        type=float,
+        default=CRAWL_RATE_LIMIT,
+        help=(
+            "Requests per second allowed by the API key, e.g. 8.33 for 500 calls per minute."
+            f" Defaults to the public API quota, {CRAWL_RATE_LIMIT}"
+        ),
+    )
+
+    parser.add_argument(
+        "--missing_only",
+        action="store_true",
+        help=(
+            "Only scrape the days of the date range not stored yet, in the database if storing"
+            " in it, else in the raw json directory"
+        ),
+    )
+
+    parser.add_argument(
+        "--repair_gaps",
+        action="store_true",
+        help=(
+            "Scrape the days missing from every coin's stored history, from its first stored day"
+            " to the end date, by default yesterday. Implies --missing_only"
+        ),
+    )
+
     args = parser.parse_args()
 
+    coin_ids = args.coin_ids
+    if not coin_ids:
+        from src.db_scripts import db_connection
+
+        db = db_connection.PostgresDb()
+        coin_ids = db.coin_ids()
+        db.engine.dispose()
+
+        if not coin_ids:
+            parser.error("No coins in the database, list the coins to scrape with --coin_ids")
+
+    if not args.start_date and not args.repair_gaps:
+        parser.error("--start_date is required unless repairing gaps")
+
+    # Days to scrape by coin, None for the whole date range
+    target_days = None
+    source = StoredSources.DATABASE if args.db_store else StoredSources.JSON
+
+    if args.repair_gaps:
+        end_date = (
+            datetime.date.fromisoformat(args.end_date)
+            if args.end_date
+            else datetime.date.today() - datetime.timedelta(days=1)
+        )
+        target_days = gap_days(coin_ids, end_date, source)
+        coin_ids = list(target_days)
+    elif args.missing_only:
+        start_date = datetime.date.fromisoformat(args.start_date)
+        end_date = datetime.date.fromisoformat(args.end_date) if args.end_date else start_date
+        target_days = missing_days(coin_ids, start_date, end_date, source)
+
+    if target_days is not None and not any(target_days.values()):
+        logger.info("No missing days to scrape")
+        sys.exit(0)
+
     # Select only json pipeline or db and json pipeline based on comand line input
     if args.db_store:
         ITEM_PIPELINES = {
@@ -88,16 +172,30 @@ if __name__ == "__main__":
             "REQUEST_FINGERPRINTER_IMPLEMENTATION": REQUEST_FINGERPRINTER_IMPLEMENTATION,
             "TWISTED_REACTOR": TWISTED_REACTOR,
             "DOWNLOAD_DELAY": DOWNLOAD_DELAY,
+            "CRAWL_RATE_LIMIT": args.rate_limit,
             "DOWNLOADER_MIDDLEWARES": DOWNLOADER_MIDDLEWARES,
         }
     )
 
-    # Crawl API and store the data
+    # Crawl API and store the data, every coin in the same crawl
+    crawler = process.create_crawler(CoingeckoSpider)
     process.crawl(
-        CoingeckoSpider,
-        coin_id=args.coin_id,
+        crawler,
+        coin_ids=coin_ids,
         start_date=args.start_date,
         end_date=args.end_date,
+        mode=args.mode,
+        api_url=args.api_url,
+        target_days=target_days,
     )
-    logger.info(f"Launching crawl for {CoingeckoSpider.name} spiders")
+    logger.info(f"Launching crawl of {len(coin_ids)} coins for {CoingeckoSpider.name} spiders")
     process.start()
+
+    failed_coins = [
+        coin_id
+        for coin_id, progress in crawler.spider.coin_progress.items()
+        if progress["scraped"] < progress["days"]
+    ]
+    if failed_coins:
+        logger.error(f"Crawl incomplete for {', '.join(failed_coins)}")
+        sys.exit(1)
@@ -5,22 +5,261 @@ https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 """
 
 
-from time import sleep
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
 
 from scrapy import signals
-from scrapy.downloadermiddlewares.retry import RetryMiddleware
+from scrapy.downloadermiddlewares.retry import RetryMiddleware, get_retry_request
 from scrapy.utils.response import response_status_message
+from twisted.internet.task import deferLater
+
+from src.constants import (
+    CRAWL_BACKOFF_BASE_SECONDS,
+    CRAWL_BACKOFF_MAX_SECONDS,
+    CRAWL_LATENCY_BACKOFF_FACTOR,
+    CRAWL_LATENCY_TOLERANCE,
+    CRAWL_MAX_CONCURRENCY,
+    CRAWL_MIN_RATE,
+    CRAWL_RATE_BACKOFF_FACTOR,
+    CRAWL_RATE_LIMIT,
+    CRAWL_RATE_LOG_SECONDS,
+    CRAWL_RATE_STEP,
+    CRAWL_THROTTLE_MAX_RETRIES,
+    CRAWL_TOKEN_BUCKET_SIZE,
+)
+
+
+def wait(seconds: float):
+    """Deferred firing None after seconds, without blocking the reactor.
+
+    Returned from process_request, it holds that request only, then lets it continue through the
+    next middlewares.
+    """
+    # NOTE: Imported here, as importing the reactor installs it, see scrapy's reactor docs
+    from twisted.internet import reactor
+
+    return deferLater(reactor, seconds, lambda: None)
+
+
+def retry_after(response) -> float | None:
+    """Reads the Retry-After header of a response, given in seconds or as an HTTP date, if any.
+
+    Args:
+        response (http.Response): Throttled response.
+
+    Returns:
+        float | None: Seconds to wait, None if the header is missing or invalid.
+    """
+    header = response.headers.get("Retry-After")
+    if header is None:
+        return None
+
+    header = header.decode("latin-1").strip()
+    try:
+        return max(float(header), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(header).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
 
 
 # Custom middleware to handle 429 errors from coingecko.
 class CustomRetryMiddleware(RetryMiddleware):
+    """Retry middleware backing off asynchronously from HTTP 429 responses.
+
+    A throttled request is retried after the delay of its Retry-After header, or else after an
+    exponential backoff with jitter. The wait happens in process_request, as a reactor timer, so
+    only that request waits while other requests, pipelines and timers keep running. Slowing down
+    the rate of every other request is left to AdaptiveThrottleMiddleware.
+
+    Any other retryable response or exception is retried right away, as by scrapy's RetryMiddleware,
+    which this middleware replaces.
+    """
+
+    def process_request(self, request, spider):
+        # Throttled requests wait for their retry time without blocking the reactor
+        remaining = request.meta.get("retry_at", 0) - time.monotonic()
+        if remaining > 0:
+            return wait(remaining)
+
+        return None
+
+    def process_response(self, request, response, spider):
+        if response.status != 429:  # HTTP 429 Too Many Requests
+            return super().process_response(request, response, spider)
+
+        if request.meta.get("dont_retry", False):
+            return response
+
+        retry_request = get_retry_request(
+            request,
+            reason=response_status_message(response.status),
+            spider=spider,
+            max_retry_times=request.meta.get("max_retry_times", CRAWL_THROTTLE_MAX_RETRIES),
+            priority_adjust=request.meta.get("priority_adjust", self.priority_adjust),
+        )
+        if retry_request is None:
+            return response
+
+        delay = retry_after(response)
+        if delay is None:
+            delay = self._backoff(request.meta.get("retry_times", 0))
+
+        spider.logger.info(f"Throttled, retrying {request.url} in {delay:.1f} seconds")
+        retry_request.meta["retry_at"] = time.monotonic() + delay
+
+        return retry_request
+
+    @staticmethod
+    def _backoff(retry_times: int) -> float:
+        """Exponential backoff of the retry_times-th retry, half of it randomized so retries of
+        concurrent requests spread out."""
+        delay = min(CRAWL_BACKOFF_BASE_SECONDS * 2**retry_times, CRAWL_BACKOFF_MAX_SECONDS)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+class AdaptiveThrottleMiddleware:
+    """Downloader middleware pacing every request of the crawl with an adaptive token bucket.
+
+    Requests take a token from a bucket of CRAWL_TOKEN_BUCKET_SIZE tokens, refilled at the current
+    rate, and wait on a reactor timer when it is empty. Tokens are reserved in arrival order, so
+    waiting requests are released one by one at the bucket rate.
+
+    The rate starts at half of the CRAWL_RATE_LIMIT setting, the quota of the API key, and follows
+    an additive increase, multiplicative decrease scheme: healthy responses raise it by
+    CRAWL_RATE_STEP requests per second every second, up to the quota, while 429 and 5xx responses
+    multiply it by CRAWL_RATE_BACKOFF_FACTOR, and latencies over CRAWL_LATENCY_TOLERANCE times the
+    lowest one seen by CRAWL_LATENCY_BACKOFF_FACTOR, at most once per round trip. It thus converges
+    just under the quota or the limit observed from the API, whichever is lower. A Retry-After
+    header also pauses the bucket for that long.
+
+    The concurrency of the API download slot follows the rate times the response latency, the
+    number of requests that must be in flight to sustain the rate, up to CRAWL_MAX_CONCURRENCY.
+    Target and effective rates are logged every CRAWL_RATE_LOG_SECONDS and when the spider closes.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+        self.rate_limit = crawler.settings.getfloat("CRAWL_RATE_LIMIT", CRAWL_RATE_LIMIT)
+        self.rate = self.rate_limit / 2
+        self.tokens = float(CRAWL_TOKEN_BUCKET_SIZE)
+        self.refilled_at = time.monotonic()
+
+        self.latency: float | None = None  # Moving average of response latencies
+        self.min_latency = math.inf
+        self.decreased_at = -math.inf
+
+        self.started_at: float | None = None
+        self.logged_at = time.monotonic()
+        self.num_responses = 0
+        self.logged_responses = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def process_request(self, request, spider):
+        now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+
+        self._refill(now)
+
+        # Tokens go negative while reserved by waiting requests, each waiting for its own token
+        self.tokens -= 1
+        if self.tokens < 0:
+            return wait(-self.tokens / self.rate)
+
+        return None
+
     def process_response(self, request, response, spider):
-        if response.status == 429:  # HTTP 429 Too Many Requests
-            sleep(60)  # Wait for a minute
-            reason = response_status_message(response.status)
-            return self._retry(request, reason, spider) or response
+        now = time.monotonic()
+        self.num_responses += 1
+
+        throttled = response.status == 429 or 500 <= response.status < 600
+
+        # Error responses are usually answered right away, so only the others measure latency
+        latency = request.meta.get("download_latency")
+        if latency is not None and not throttled:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            # The baseline creeps up 1% per response, so a lasting latency shift is adopted
+            self.min_latency = min(self.min_latency * 1.01, latency)
+
+        if throttled:
+            self._decrease(now, CRAWL_RATE_BACKOFF_FACTOR)
+
+            pause = retry_after(response) if response.status == 429 else None
+            if pause:
+                # Every request waits until the API accepts requests again
+                self._refill(now)
+                self.tokens = min(self.tokens, -pause * self.rate)
+
+        elif self.latency is not None and self.latency > CRAWL_LATENCY_TOLERANCE * self.min_latency:
+            self._decrease(now, CRAWL_LATENCY_BACKOFF_FACTOR)
+
+        else:
+            # Adds CRAWL_RATE_STEP per second, at one response every 1 / rate seconds
+            self.rate = min(self.rate + CRAWL_RATE_STEP / self.rate, self.rate_limit)
+
+        self._update_concurrency(request)
+
+        if now - self.logged_at >= CRAWL_RATE_LOG_SECONDS:
+            spider.logger.info(
+                f"Throttle rate {self.rate:.2f} requests/s, effective"
+                f" {(self.num_responses - self.logged_responses) / (now - self.logged_at):.2f}"
+                " requests/s"
+            )
+            self.logged_at, self.logged_responses = now, self.num_responses
+
         return response
 
+    def spider_closed(self, spider):
+        elapsed = time.monotonic() - (self.started_at or time.monotonic())
+        effective_rate = self.num_responses / elapsed if elapsed > 0 else 0.0
+
+        self.crawler.stats.set_value("throttle/rate", round(self.rate, 3))
+        self.crawler.stats.set_value("throttle/effective_rate", round(effective_rate, 3))
+
+        spider.logger.info(
+            f"Throttle converged to {self.rate:.2f} requests/s, {self.num_responses} responses at"
+            f" an effective {effective_rate:.2f} requests/s"
+        )
+
+    def _refill(self, now: float):
+        """Adds the tokens earned since the last refill, at the current rate."""
+        self.tokens = min(
+            self.tokens + (now - self.refilled_at) * self.rate, float(CRAWL_TOKEN_BUCKET_SIZE)
+        )
+        self.refilled_at = now
+
+    def _decrease(self, now: float, factor: float):
+        """Multiplies the rate by factor, unless it was decreased less than a round trip ago, as
+        responses of requests sent before a decrease still reflect the previous rate."""
+        if now - self.decreased_at < max(self.latency or 0.0, 1 / self.rate):
+            return
+
+        self._refill(now)
+        self.rate = max(self.rate * factor, CRAWL_MIN_RATE)
+        self.decreased_at = now
+
+    def _update_concurrency(self, request):
+        """Sizes the request's download slot to the requests in flight at the current rate."""
+        slot = self.crawler.engine.downloader.slots.get(request.meta.get("download_slot"))
+        if slot is None or self.latency is None:
+            return
+
+        slot.concurrency = min(
+            max(math.ceil(self.rate * self.latency) + 1, 1), CRAWL_MAX_CONCURRENCY
+        )
+
 
 # Non used predefined scrapy middlewares
 class CrawlerSpiderMiddleware:
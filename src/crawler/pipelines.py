@@ -4,15 +4,37 @@ Every item that we yield in our spiders will be processed through this script. W
 processing pipelines here, one dumps the scraped item to local folder, the other dumps the json
 and also stores the item in a database.
 
+Items built from range API points only hold part of the history snapshot, so they are stored unless
+a full snapshot of the same coin and day is already stored.
+
 More info: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 """
 
 import json
-
-from src.constants import COIN_ID, DATA_COINGECKO, DATE
+from pathlib import Path
+
+from src.constants import (
+    COIN_ID,
+    COINGECKO_RANGE_SOURCE,
+    DATA_COINGECKO,
+    DATE,
+    FULL_SCRAPE_DATA,
+)
 from src.db_scripts import db_connection, db_mappings
 
 
+def is_range_response(full_response: dict | None) -> bool:
+    """Checks if a full response was built from range API points instead of a history snapshot.
+
+    Args:
+        full_response (dict | None): Full response of an item or stored row.
+
+    Returns:
+        bool: True for range responses.
+    """
+    return full_response is not None and full_response.get("source") == COINGECKO_RANGE_SOURCE
+
+
 class CoingeckoCrawlerDbPipeline:
     def __init__(self):
         self.db = db_connection.PostgresDb()
@@ -34,14 +56,22 @@ class CoingeckoCrawlerDbPipeline:
         coin = item_dict[COIN_ID]
 
         write_path = DATA_COINGECKO / f"{coin}_{date}.json"
+        range_item = is_range_response(item_dict[FULL_SCRAPE_DATA])
 
-        with open(str(write_path), "w") as f:
-            json.dump(item_dict, f)
+        if not (range_item and _stored_snapshot(write_path)):
+            with open(str(write_path), "w") as f:
+                json.dump(item_dict, f)
 
         # # DB STORAGE
         with self.db.Session() as my_session:
             # Db storage
             my_session.begin()
+
+            if range_item:
+                stored = my_session.get(db_mappings.CoingeckoScrapedData, (coin, item[DATE]))
+                if stored is not None and not is_range_response(stored.full_response):
+                    return
+
             # NOTE: Use of merge (instead of add) allows for update registry if crawled item is
             # repeated
             my_session.merge(db_mappings.CoingeckoScrapedData(**item_dict))
@@ -67,5 +97,17 @@ class CoingeckoCrawlerJsonPipeline:
 
         write_path = DATA_COINGECKO / f"{coin}_{date}.json"
 
+        if is_range_response(item_dict[FULL_SCRAPE_DATA]) and _stored_snapshot(write_path):
+            return
+
         with open(str(write_path), "w") as f:
             json.dump(item_dict, f)
+
+
+def _stored_snapshot(path: Path) -> bool:
+    """Checks if a json dump holds a full history snapshot."""
+    if not path.exists():
+        return False
+
+    with open(str(path)) as f:
+        return not is_range_response(json.load(f)[FULL_SCRAPE_DATA])
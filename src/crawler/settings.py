@@ -7,6 +7,9 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+from src.constants import CRAWL_MAX_CONCURRENCY
+from src.constants import CRAWL_RATE_LIMIT as DEFAULT_CRAWL_RATE_LIMIT
+
 BOT_NAME = "src_crawler"
 
 SPIDER_MODULES = ["src.crawler.spiders"]
@@ -24,12 +27,18 @@ TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-CONCURRENT_REQUESTS = 1
+# The request rate and the concurrency of the API slot, up to this maximum, are set by
+# AdaptiveThrottleMiddleware
+CONCURRENT_REQUESTS = CRAWL_MAX_CONCURRENCY
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
-# See also autothrottle settings and docs
-DOWNLOAD_DELAY = 2
+# Requests are paced by AdaptiveThrottleMiddleware instead
+DOWNLOAD_DELAY = 0
+
+# Requests per second allowed by the API key, the ceiling of the AdaptiveThrottleMiddleware rate.
+# Defaults to the public API quota, paid plans allow more
+CRAWL_RATE_LIMIT = DEFAULT_CRAWL_RATE_LIMIT
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
@@ -41,7 +50,11 @@ ITEM_PIPELINES = {
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
+    # Replaces the default retry middleware
+    "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
     "src.crawler.middlewares.CustomRetryMiddleware": 550,
+    # Sees responses before the retry middleware, and paces requests after their retry backoff
+    "src.crawler.middlewares.AdaptiveThrottleMiddleware": 560,
 }
 
 # The download delay setting will honor only one of:
@@ -5,26 +5,63 @@ https://docs.scrapy.org/en/latest/intro/tutorial.html
 """
 
 import json
-from collections.abc import Iterator
-from datetime import date, timedelta
+from collections.abc import Iterator, Mapping, Sequence
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from itertools import chain, zip_longest
 
 import scrapy
 
-from src.constants import API_DATE_FORMAT, COIN_ID, COIN_PRICE, DATE, FULL_SCRAPE_DATA
+from src.constants import (
+    API_DATE_FORMAT,
+    COIN_ID,
+    COIN_PRICE,
+    COINGECKO_API_URL,
+    COINGECKO_RANGE_CHUNK_DAYS,
+    COINGECKO_RANGE_SOURCE,
+    DATE,
+    FULL_SCRAPE_DATA,
+)
 from src.crawler.items import CoingeckoItem
 
+HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:48.0) Gecko/20100101 Firefox/48.0",
+}
+
+
+class CrawlModes(str, Enum):
+    HISTORY = "history"
+    RANGE = "range"
+
 
 class CoingeckoSpider(scrapy.Spider):
     """Spider class supporting main coingecko scraping logic.
 
+    In history mode, one request per coin and day fetches the full coin snapshot of that day. In
+    range mode, one request per coin and COINGECKO_RANGE_CHUNK_DAYS days fetches the USD price,
+    market cap and volume time series, which is split into one item per day. Days missing from the
+    time series are fetched from the history endpoint.
+
+    Requests of every coin are interleaved, one request of each coin in turn, and share the
+    downloader slot of the API domain, so all coins progress together under the same request rate.
+    The number of scraped and failed days of every coin is tracked in coin_progress, and logged as
+    each coin finishes.
+
     Args:
-        coin_id (str): coin id to scrape, ex. bitcoin
-        start_date (str): start of date range to scrape in iso format
-        end_date (str): end of date range to scrape in iso format
+        coin_ids (str | Sequence[str]): coin ids to scrape, ex. ["bitcoin", "ethereum"], or a comma
+            separated string, ex. "bitcoin,ethereum", as given by scrapy crawl -a
+        start_date (str | None): start of date range to scrape in iso format
+        end_date (str | None): end of date range to scrape in iso format
+        mode (str): crawl mode, "history" or "range". Defaults to "history".
+        api_url (str): base url of the coingecko API, e.g. to crawl a local stub. Defaults to
+            COINGECKO_API_URL.
+        target_days (Mapping[str, Sequence[date]] | None): days to scrape by coin, e.g. the days
+            missing from the database, instead of the whole date range. Defaults to None.
 
     Raises:
-        ValueError: coin_id parameter cant be null
-        ValueError: start_date parameter cant be null
+        ValueError: coin_ids parameter cant be empty
+        ValueError: start_date parameter cant be null without target_days
 
     Yields:
         CoingeckoItem: scrapy item for further processing, in particular scrapy will use this
@@ -34,21 +71,43 @@ class CoingeckoSpider(scrapy.Spider):
     # Spider attributes
     name = "coingecko_spider"
 
-    def __init__(self, coin_id: str, start_date: str, end_date: str | None = None):
-        if not coin_id:
-            raise ValueError("Coin ids parameter can't be null")
-        else:
-            self.coin_ids = [coin_id]  # TODO: add list of strings possibility
+    def __init__(
+        self,
+        coin_ids: str | Sequence[str],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        mode: str = CrawlModes.HISTORY.value,
+        api_url: str = COINGECKO_API_URL,
+        target_days: Mapping[str, Sequence[date]] | None = None,
+    ):
+        if isinstance(coin_ids, str):
+            coin_ids = coin_ids.split(",")
+
+        # Duplicates are dropped, keeping the given order
+        coin_ids = [coin_id.strip() for coin_id in coin_ids]
+        self.coin_ids = list(dict.fromkeys(coin_id for coin_id in coin_ids if coin_id))
+
+        if not self.coin_ids:
+            raise ValueError("Coin ids parameter can't be empty")
 
-        if not start_date:
+        if target_days is not None:
+            self.days = {coin_id: sorted(target_days.get(coin_id, [])) for coin_id in self.coin_ids}
+        elif not start_date:
             raise ValueError("Start date parameter can't be null")
         else:
-            self.start_date = date.fromisoformat(start_date)
+            start = date.fromisoformat(start_date)
+            end = date.fromisoformat(end_date) if end_date else start
+            date_range = [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
-        if not end_date:
-            self.end_date = date.fromisoformat(start_date)
-        else:
-            self.end_date = date.fromisoformat(end_date)
+            self.days = {coin_id: date_range for coin_id in self.coin_ids}
+
+        self.mode = CrawlModes(mode)
+        self.api_url = api_url.rstrip("/")
+
+        self.coin_progress = {
+            coin_id: {"days": len(self.days[coin_id]), "scraped": 0, "failed": 0}
+            for coin_id in self.coin_ids
+        }
 
         self.logger.logger.name = f"crawler.{CoingeckoSpider.name}"
 
@@ -57,43 +116,88 @@ class CoingeckoSpider(scrapy.Spider):
 
         This method is usually combined in scrapy with further requests for pagination or for
         further exploration of new urls found in initial scraping. In this case though, the initial
-        requests are all the requests we'll do.
+        requests are all the requests we'll do, besides history requests for days missing from
+        range responses.
 
         Yields:
             Iterator[scrapy.Request]: The initial request.
         """
-        # Build date list to crawl
-        delta_dates = (self.end_date - self.start_date).days
-        date_range = [self.start_date + timedelta(days=i) for i in range(delta_dates + 1)]
-
-        # Build url list to crawl
-        crawl_list = [
-            (
-                (
-                    f"https://api.coingecko.com/api/v3/coins/{coin_id}/"
-                    f"history?date={target_date.strftime(API_DATE_FORMAT) }"
-                ),
-                coin_id,
-                target_date,
-            )
-            for coin_id in self.coin_ids  # currently len(coin_ids) is always 1
-            for target_date in date_range
-        ]
-
-        self.logger.info(f"Preparing to scrape {len(crawl_list)} urls.")
-
-        for url, coin_id, target_date in crawl_list:
-            yield scrapy.Request(
-                url=url,
-                callback=self.parse,  # yielded requests are processed through the parse callback
-                headers={
-                    "Accept": "application/json",
-                    "User-Agent": (
-                        "Mozilla/5.0 (X11; Linux x86_64; rv:48.0) Gecko/20100101 Firefox/48.0"
-                    ),
-                },
-                meta={"coin_id": coin_id, "target_date": target_date},
-            )
+        if self.mode == CrawlModes.RANGE:
+            num_requests = sum(len(_chunk_days(days)) for days in self.days.values())
+        else:
+            num_requests = sum(map(len, self.days.values()))
+
+        self.logger.info(
+            f"Preparing to scrape {num_requests} urls for {sum(map(len, self.days.values()))} days."
+        )
+
+        # One request of each coin in turn, built lazily as the scheduler consumes them
+        coin_requests = [self.coin_requests(coin_id) for coin_id in self.coin_ids]
+        for request in chain.from_iterable(zip_longest(*coin_requests)):
+            if request is not None:
+                yield request
+
+    def coin_requests(self, coin_id: str) -> Iterator[scrapy.Request]:
+        """Builds the requests of the days to scrape for a coin, in date order.
+
+        Args:
+            coin_id (str): Coin to request.
+
+        Yields:
+            Iterator[scrapy.Request]: History requests, or range requests in range mode.
+        """
+        if self.mode == CrawlModes.RANGE:
+            for chunk_start, chunk_end in _chunk_days(self.days[coin_id]):
+                yield self.range_request(coin_id, chunk_start, chunk_end)
+        else:
+            for target_date in self.days[coin_id]:
+                yield self.history_request(coin_id, target_date)
+
+    def history_request(self, coin_id: str, target_date: date) -> scrapy.Request:
+        """Builds the request for the full snapshot of a coin on a day.
+
+        Args:
+            coin_id (str): Coin to request.
+            target_date (date): Day to request.
+
+        Returns:
+            scrapy.Request: The request, parsed by parse.
+        """
+        return scrapy.Request(
+            url=(
+                f"{self.api_url}/coins/{coin_id}/"
+                f"history?date={target_date.strftime(API_DATE_FORMAT)}"
+            ),
+            callback=self.parse,  # yielded requests are processed through the parse callback
+            errback=self.request_failed,
+            headers=HEADERS,
+            meta={"coin_id": coin_id, "target_date": target_date},
+        )
+
+    def range_request(self, coin_id: str, start_date: date, end_date: date) -> scrapy.Request:
+        """Builds the request for the USD time series of a coin over a range of days.
+
+        Args:
+            coin_id (str): Coin to request.
+            start_date (date): First day to request.
+            end_date (date): Last day to request, included.
+
+        Returns:
+            scrapy.Request: The request, parsed by parse_range.
+        """
+        start = datetime.combine(start_date, time(), tzinfo=timezone.utc)
+        end = datetime.combine(end_date + timedelta(days=1), time(), tzinfo=timezone.utc)
+
+        return scrapy.Request(
+            url=(
+                f"{self.api_url}/coins/{coin_id}/market_chart/range?vs_currency=usd"
+                f"&from={int(start.timestamp())}&to={int(end.timestamp()) - 1}"
+            ),
+            callback=self.parse_range,
+            errback=self.request_failed,
+            headers=HEADERS,
+            meta={"coin_id": coin_id, "start_date": start_date, "end_date": end_date},
+        )
 
     def parse(self, response) -> Iterator[CoingeckoItem]:
         """Processor for API request response.
@@ -122,5 +226,137 @@ class CoingeckoSpider(scrapy.Spider):
         item[COIN_PRICE] = usd_price
         item[FULL_SCRAPE_DATA] = json_response
 
+        self._update_progress(item[COIN_ID], scraped=1)
+
         # Yield item to be stored in database
         yield item
+
+    def parse_range(self, response) -> Iterator[CoingeckoItem | scrapy.Request]:
+        """Processor for range API responses, splitting them into daily items.
+
+        Each day takes the earliest point of the time series in that day, which is the midnight UTC
+        point for daily series, matching the history endpoint snapshots. The full response of each
+        item has the shape of a history snapshot holding only that day's USD price, market cap and
+        volume, as the range endpoint does not provide the rest of it, and is marked with
+        COINGECKO_RANGE_SOURCE so the pipelines do not replace stored full snapshots with it.
+
+        Args:
+            response (http.TextResponse): Response of a range_request.
+
+        Yields:
+            Iterator[CoingeckoItem | scrapy.Request]: One item per day in the series, and a
+                history request for every requested day missing from it.
+        """
+        json_response = json.loads(response.text)
+        coin_id = response.meta["coin_id"]
+        start_date, end_date = response.meta["start_date"], response.meta["end_date"]
+
+        days = {}
+        for field, series in [
+            ("current_price", "prices"),
+            ("market_cap", "market_caps"),
+            ("total_volume", "total_volumes"),
+        ]:
+            # Points are sorted by time, so the first point seen for a day is its earliest
+            for timestamp, value in json_response.get(series, []):
+                day = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).date()
+                days.setdefault(day, {}).setdefault(field, value)
+
+        missing_days = 0
+        scraped_days = 0
+        for i in range((end_date - start_date).days + 1):
+            target_date = start_date + timedelta(days=i)
+            day = days.get(target_date, {})
+
+            if day.get("current_price") is None:
+                missing_days += 1
+                yield self.history_request(coin_id, target_date)
+                continue
+
+            item = CoingeckoItem()
+
+            item[COIN_ID] = coin_id
+            item[DATE] = target_date
+            item[COIN_PRICE] = day["current_price"]
+            item[FULL_SCRAPE_DATA] = {
+                "source": COINGECKO_RANGE_SOURCE,
+                "market_data": {field: {"usd": value} for field, value in day.items()},
+            }
+
+            scraped_days += 1
+            yield item
+
+        self._update_progress(coin_id, scraped=scraped_days)
+
+        if missing_days:
+            self.logger.warning(
+                f"{missing_days} days missing from {coin_id} range {start_date} to {end_date},"
+                " requesting their history"
+            )
+
+    def request_failed(self, failure):
+        """Accounts the days of a request that failed after its retries.
+
+        Args:
+            failure (twisted.python.failure.Failure): Download or HTTP error of the request.
+        """
+        meta = failure.request.meta
+        coin_id = meta["coin_id"]
+
+        if "target_date" in meta:
+            days = 1
+            description = f"{coin_id} {meta['target_date']}"
+        else:
+            days = (meta["end_date"] - meta["start_date"]).days + 1
+            description = f"{coin_id} range {meta['start_date']} to {meta['end_date']}"
+
+        self.logger.error(f"Request failed for {description}: {failure.getErrorMessage()}")
+        self._update_progress(coin_id, failed=days)
+
+    def closed(self, reason: str):
+        """Logs the progress of every coin, and stores it in the crawl stats.
+
+        Args:
+            reason (str): Reason the spider closed.
+        """
+        for coin_id, progress in self.coin_progress.items():
+            for key, value in progress.items():
+                self.crawler.stats.set_value(f"coins/{coin_id}/{key}", value)
+
+            missing = progress["days"] - progress["scraped"] - progress["failed"]
+            log = self.logger.info if not progress["failed"] and not missing else self.logger.error
+            log(
+                f"{coin_id}: {progress['scraped']} of {progress['days']} days scraped,"
+                f" {progress['failed']} failed, {missing} not processed ({reason})"
+            )
+
+    def _update_progress(self, coin_id: str, scraped: int = 0, failed: int = 0):
+        """Adds scraped and failed days to the progress of coin_id, logging it once done."""
+        progress = self.coin_progress[coin_id]
+        progress["scraped"] += scraped
+        progress["failed"] += failed
+
+        if (scraped or failed) and progress["scraped"] + progress["failed"] == progress["days"]:
+            self.logger.info(
+                f"Finished {coin_id}: {progress['scraped']} days scraped,"
+                f" {progress['failed']} failed"
+            )
+
+
+def _chunk_days(days: Sequence[date]) -> list[tuple[date, date]]:
+    """Splits sorted days into ranges of consecutive days, of up to COINGECKO_RANGE_CHUNK_DAYS."""
+    chunks: list[tuple[date, date]] = []
+
+    for day in days:
+        if chunks:
+            chunk_start, chunk_end = chunks[-1]
+            if (
+                day == chunk_end + timedelta(days=1)
+                and (day - chunk_start).days < COINGECKO_RANGE_CHUNK_DAYS
+            ):
+                chunks[-1] = (chunk_start, day)
+                continue
+
+        chunks.append((day, day))
+
+    return chunks
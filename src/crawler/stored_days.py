@@ -0,0 +1,157 @@
+"""Finds the coin days already stored by the crawler, to only request the missing ones.
+
+Stored days are looked up once per crawl as a set of (coin_id, date) keys: with a single query
+selecting only the coin and date columns of coingecko_scraped_data, or a single scan of the raw
+json directory, whose files are named {coin_id}_{date}.json by the pipelines.
+"""
+
+import datetime
+import os
+from collections.abc import Sequence
+from enum import Enum
+from pathlib import Path
+
+from src.constants import COIN_ID, DATA_COINGECKO, DATE
+from src.logger_definition import get_logger
+
+logger = get_logger(__file__)
+
+
+class StoredSources(str, Enum):
+    DATABASE = "database"
+    JSON = "json"
+
+
+def stored_days(
+    coin_ids: Sequence[str],
+    source: StoredSources,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    json_dir: Path = DATA_COINGECKO,
+) -> set[tuple[str, datetime.date]]:
+    """Looks up the days stored for some coins.
+
+    Args:
+        coin_ids (Sequence[str]): Coins to look up.
+        source (StoredSources): Where the crawled days are stored, the database or the raw json
+            directory.
+        start_date (datetime.date | None, optional): First day to look up. Defaults to None.
+        end_date (datetime.date | None, optional): Last day to look up, included. Defaults to None.
+        json_dir (Path, optional): Raw json directory. Defaults to DATA_COINGECKO.
+
+    Returns:
+        set[tuple[str, datetime.date]]: Stored (coin_id, date) keys.
+    """
+    if source == StoredSources.DATABASE:
+        from src.db_scripts import db_connection, db_mappings
+
+        db = db_connection.PostgresDb()
+        stored = db.read_columns(
+            db_mappings.CoingeckoScrapedData,
+            [COIN_ID, DATE],
+            coin_ids=coin_ids,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        db.engine.dispose()
+
+        return set(zip(stored[COIN_ID], stored[DATE].values.astype("datetime64[D]").tolist()))
+
+    coins = set(coin_ids)
+    keys = set()
+    for entry in os.scandir(json_dir):
+        coin_id, _, day = entry.name.removesuffix(".json").rpartition("_")
+        if coin_id not in coins:
+            continue
+
+        try:
+            date = datetime.date.fromisoformat(day)
+        except ValueError:
+            continue
+
+        if (start_date is None or date >= start_date) and (end_date is None or date <= end_date):
+            keys.add((coin_id, date))
+
+    return keys
+
+
+def missing_days(
+    coin_ids: Sequence[str],
+    start_date: datetime.date,
+    end_date: datetime.date,
+    source: StoredSources,
+) -> dict[str, list[datetime.date]]:
+    """Lists the days of a date range not stored yet for every coin.
+
+    Args:
+        coin_ids (Sequence[str]): Coins to look up.
+        start_date (datetime.date): First day of the range.
+        end_date (datetime.date): Last day of the range, included.
+        source (StoredSources): Where the crawled days are stored.
+
+    Returns:
+        dict[str, list[datetime.date]]: Sorted missing days, by coin.
+    """
+    stored = stored_days(coin_ids, source, start_date, end_date)
+    date_range = [
+        start_date + datetime.timedelta(days=i) for i in range((end_date - start_date).days + 1)
+    ]
+
+    missing = {
+        coin_id: [date for date in date_range if (coin_id, date) not in stored]
+        for coin_id in coin_ids
+    }
+    _log_missing(missing)
+
+    return missing
+
+
+def gap_days(
+    coin_ids: Sequence[str], end_date: datetime.date, source: StoredSources
+) -> dict[str, list[datetime.date]]:
+    """Lists the days missing from every coin's history, from its first stored day to end_date.
+
+    These are the gaps and stale days reported by the training data quality stage. Coins without
+    any stored day have no history to repair and are skipped.
+
+    Args:
+        coin_ids (Sequence[str]): Coins to look up.
+        end_date (datetime.date): Last day histories should reach, included.
+        source (StoredSources): Where the crawled days are stored.
+
+    Returns:
+        dict[str, list[datetime.date]]: Sorted missing days, by coin with stored days.
+    """
+    stored = stored_days(coin_ids, source, end_date=end_date)
+
+    first_dates: dict[str, datetime.date] = {}
+    for coin_id, date in stored:
+        if coin_id not in first_dates or date < first_dates[coin_id]:
+            first_dates[coin_id] = date
+
+    for coin_id in set(coin_ids) - set(first_dates):
+        logger.warning(f"No stored days for {coin_id}, nothing to repair")
+
+    gaps = {}
+    for coin_id in coin_ids:
+        if coin_id not in first_dates:
+            continue
+
+        first_date = first_dates[coin_id]
+        gaps[coin_id] = [
+            first_date + datetime.timedelta(days=i)
+            for i in range((end_date - first_date).days + 1)
+            if (coin_id, first_date + datetime.timedelta(days=i)) not in stored
+        ]
+    _log_missing(gaps)
+
+    return gaps
+
+
+def _log_missing(missing: dict[str, list[datetime.date]]):
+    """Logs the number of missing days of every coin."""
+    for coin_id, days in missing.items():
+        if days:
+            logger.info(f"{len(days)} days missing for {coin_id}, from {days[0]} to {days[-1]}")
+        else:
+            logger.info(f"No days missing for {coin_id}")
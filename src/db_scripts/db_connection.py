@@ -2,11 +2,15 @@
 
 """
 
+import datetime
+from collections.abc import Sequence
+
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import Column, Date, Float, create_engine, select
 from sqlalchemy.orm import sessionmaker
 
-from src.constants import POSTGRESDB_CON_STRING
+from src.constants import COIN_ID, DATE, DB_CHUNK_SIZE, POSTGRESDB_CON_STRING
 from src.db_scripts import db_mappings
 
 
@@ -54,3 +58,88 @@ class PostgresDb:
             pd.DataFrame: output dataframe
         """
         return pd.read_sql(query_str, con=self.engine)
+
+    def coin_ids(
+        self, table: type[db_mappings.Base] = db_mappings.CoingeckoScrapedData
+    ) -> list[str]:
+        """Lists the coins stored in a table.
+
+        Args:
+            table (type[db_mappings.Base], optional): Sqlalchemy table, with a coin_id column.
+                Defaults to db_mappings.CoingeckoScrapedData.
+
+        Returns:
+            list[str]: Sorted coin ids.
+        """
+        query = select(table.__table__.c[COIN_ID]).distinct().order_by(table.__table__.c[COIN_ID])
+
+        with self.engine.connect() as connection:
+            return list(connection.execute(query).scalars())
+
+    def read_columns(
+        self,
+        table: type[db_mappings.Base],
+        columns: Sequence[str],
+        coin_ids: Sequence[str] | None = None,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        chunk_size: int = DB_CHUNK_SIZE,
+    ) -> pd.DataFrame:
+        """Reads some columns of a table, streaming rows through a server side cursor.
+
+        Only the given columns are selected, so large columns such as the full scraped responses
+        are never transferred. Rows are fetched chunk_size at a time and converted to typed column
+        arrays without building ORM objects, so at most one chunk of Python rows is held in memory.
+
+        Args:
+            table (type[db_mappings.Base]): Sqlalchemy table, with coin_id and date columns.
+            columns (Sequence[str]): Columns to read.
+            coin_ids (Sequence[str] | None, optional): Coins to read. Defaults to every coin.
+            start_date (datetime.date | None, optional): Only read rows from this date, included.
+                Defaults to None.
+            end_date (datetime.date | None, optional): Only read rows up to this date, included.
+                Defaults to None.
+            chunk_size (int, optional): Rows fetched per round trip. Defaults to DB_CHUNK_SIZE.
+
+        Returns:
+            pd.DataFrame: The read columns, sorted by coin and date.
+        """
+        table_columns = table.__table__.c
+
+        query = select(*[table_columns[column] for column in columns])
+        if coin_ids:
+            query = query.where(table_columns[COIN_ID].in_(coin_ids))
+        if start_date:
+            query = query.where(table_columns[DATE] >= start_date)
+        if end_date:
+            query = query.where(table_columns[DATE] <= end_date)
+        query = query.order_by(table_columns[COIN_ID], table_columns[DATE])
+
+        dtypes = [_column_dtype(table_columns[column]) for column in columns]
+        chunks: list[list[np.ndarray]] = [[] for _ in columns]
+
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, max_row_buffer=chunk_size
+            ).execute(query)
+
+            for rows in result.partitions(chunk_size):
+                for column_chunks, dtype, values in zip(chunks, dtypes, zip(*rows)):
+                    column_chunks.append(np.array(values, dtype=dtype))
+
+        return pd.DataFrame(
+            {
+                column: np.concatenate(column_chunks) if column_chunks else np.empty(0, dtype)
+                for column, dtype, column_chunks in zip(columns, dtypes, chunks)
+            }
+        )
+
+
+def _column_dtype(column: Column) -> str:
+    """NumPy dtype a column is read into, object for columns without a native one."""
+    if isinstance(column.type, Date):
+        return "datetime64[D]"
+    if isinstance(column.type, Float):
+        return "float64"
+
+    return "object"
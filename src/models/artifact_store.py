@@ -0,0 +1,389 @@
+"""
+Defines the content addressed store holding every trained model version and the manifest indexing
+them.
+
+Layout under the store root:
+
+    objects/<2 first hash chars>/<sha256>   Immutable artifacts, named by the hash of their content
+    manifest.json                           Versions by id and latest version of each model name
+    manifest.lock                           Lock serializing manifest updates across processes
+
+Identical payloads, e.g. the same training data snapshot fitted with different orders, are stored
+once. Promoting a version to latest is a single atomic manifest replacement, so readers always see
+a consistent set of artifacts.
+"""
+
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from src.constants import (
+    ARTIFACT_GC_GRACE_SECONDS,
+    ARTIFACT_KEEP_DAILY,
+    ARTIFACT_KEEP_LAST,
+    ARTIFACT_KEEP_WEEKLY,
+    FIT_TIMESTAMP_FORMAT,
+    MODELS_FORECASTING,
+)
+from src.logger_definition import get_logger
+
+logger = get_logger(__file__)
+
+
+class ArtifactStore:
+    """Content addressed model artifact store with a manifest index.
+
+    Versions are plain dicts stored in the manifest. Besides any metadata given by the trainer,
+    e.g. coin, order, fit time and fit metrics, each holds:
+
+    - `version`: Unique version id.
+    - `coin_id`: Coin the model was trained for.
+    - `model_name`: Name of the model, versions of the same name replace each other as latest.
+    - `fit_timestamp`: Fit timestamp of the model, as FIT_TIMESTAMP_FORMAT, e.g.
+      "2024-01-01 12-00-00.000000".
+    - `artifacts`: Content hash of every artifact of the version, by artifact name.
+
+    Args:
+        root (Path, optional): Store directory. Defaults to MODELS_FORECASTING.
+    """
+
+    def __init__(self, root: Path = MODELS_FORECASTING):
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.manifest_path = root / "manifest.json"
+        self._lock_path = root / "manifest.lock"
+
+        # Parsed manifest and the modification time it was read at
+        self._manifest_mtime: int | None = None
+        self._manifest: dict = {"versions": {}, "latest": {}}
+
+    def object_path(self, digest: str) -> Path:
+        """Path of the object with the given content hash."""
+        return self.objects_dir / digest[:2] / digest
+
+    def put_arrays(self, **arrays: np.ndarray) -> str:
+        """Stores arrays as a compressed .npz object.
+
+        The hash covers array names, dtypes, shapes and data, not the file bytes, which hold write
+        times, so identical arrays are always stored once.
+
+        Args:
+            **arrays (np.ndarray): Arrays to store, by name.
+
+        Returns:
+            str: Content hash of the object.
+        """
+        sha = hashlib.sha256()
+        for name in sorted(arrays):
+            array = np.ascontiguousarray(arrays[name])
+            sha.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+            sha.update(array.tobytes())
+        digest = sha.hexdigest()
+
+        def write(file):
+            np.savez_compressed(file, **arrays)
+
+        self._put(digest, write)
+
+        return digest
+
+    def put_file(self, path: Path) -> str:
+        """Moves a file into the store.
+
+        Args:
+            path (Path): File to store. It is moved, or deleted if the store already has it.
+
+        Returns:
+            str: Content hash of the object.
+        """
+        sha = hashlib.sha256()
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        object_path = self.object_path(digest)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if object_path.exists():
+            path.unlink()
+            # Refresh the modification time, so garbage collection grants it a new grace period
+            os.utime(object_path)
+        else:
+            path.replace(object_path)
+
+        return digest
+
+    def load_arrays(self, digest: str) -> dict[str, np.ndarray]:
+        """Loads an object stored with put_arrays.
+
+        Args:
+            digest (str): Content hash of the object.
+
+        Returns:
+            dict[str, np.ndarray]: The stored arrays, by name.
+        """
+        with np.load(self.object_path(digest), allow_pickle=False) as artifact:
+            return {name: artifact[name] for name in artifact.files}
+
+    def temporary_path(self, suffix: str = "") -> Path:
+        """Creates an empty temporary file in the store, to write an artifact before put_file.
+
+        Args:
+            suffix (str, optional): File name suffix. Defaults to "".
+
+        Returns:
+            Path: Path of the temporary file.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        handle, path = tempfile.mkstemp(suffix=suffix, dir=self.root, prefix=".tmp-")
+        os.close(handle)
+
+        return Path(path)
+
+    def add_version(self, version: dict, promote: bool = True):
+        """Adds a version whose artifacts are already stored to the manifest.
+
+        Args:
+            version (dict): Version metadata, see the class docstring for required keys.
+            promote (bool, optional): If True, the version becomes the latest of its model name.
+                Defaults to True.
+
+        Raises:
+            ValueError: A version with the same id is already stored.
+        """
+        with self._locked():
+            manifest = self._read_manifest()
+
+            if version["version"] in manifest["versions"]:
+                raise ValueError(f"Model version {version['version']} is already stored")
+
+            manifest["versions"][version["version"]] = version
+            if promote:
+                manifest["latest"][version["model_name"]] = version["version"]
+
+            self._write_manifest(manifest)
+
+        logger.info(f"Stored model version {version['version']}")
+
+    def versions(self, coin_id: str | None = None, model_name: str | None = None) -> list[dict]:
+        """Lists stored versions, oldest fit first.
+
+        Args:
+            coin_id (str | None, optional): Only list versions of this coin. Defaults to None.
+            model_name (str | None, optional): Only list versions of this model name. Defaults to
+                None.
+
+        Returns:
+            list[dict]: Matching versions.
+        """
+        versions = [
+            version
+            for version in self.manifest()["versions"].values()
+            if (coin_id is None or version["coin_id"] == coin_id)
+            and (model_name is None or version["model_name"] == model_name)
+        ]
+
+        return sorted(versions, key=lambda version: version["fit_timestamp"])
+
+    def latest(self, model_name: str) -> dict | None:
+        """Gets the latest version of a model name.
+
+        Args:
+            model_name (str): Name of the model.
+
+        Returns:
+            dict | None: The latest version, or None if none was stored.
+        """
+        manifest = self.manifest()
+        version_id = manifest["latest"].get(model_name)
+
+        return None if version_id is None else manifest["versions"][version_id]
+
+    def latest_by_coin(self) -> dict[str, dict]:
+        """Gets the latest version of every coin.
+
+        If a coin has more than one latest version, e.g. trained with different orders, the most
+        recently fitted one is used.
+
+        Returns:
+            dict[str, dict]: Latest version by coin.
+        """
+        manifest = self.manifest()
+        latest = {}
+
+        for version_id in manifest["latest"].values():
+            version = manifest["versions"][version_id]
+            current = latest.get(version["coin_id"])
+
+            if current is None or version["fit_timestamp"] > current["fit_timestamp"]:
+                latest[version["coin_id"]] = version
+
+        return latest
+
+    def manifest(self) -> dict:
+        """Reads the manifest, parsing it again only if it changed since the last read.
+
+        Returns:
+            dict: Versions by id under "versions" and latest version id by model name under
+                "latest".
+        """
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {"versions": {}, "latest": {}}
+
+        if mtime != self._manifest_mtime:
+            self._manifest = json.loads(self.manifest_path.read_text())
+            self._manifest_mtime = mtime
+
+        return self._manifest
+
+    def apply_retention(
+        self,
+        keep_last: int = ARTIFACT_KEEP_LAST,
+        keep_daily: int = ARTIFACT_KEEP_DAILY,
+        keep_weekly: int = ARTIFACT_KEEP_WEEKLY,
+    ) -> list[str]:
+        """Drops old versions from the manifest, thinning them out over time.
+
+        For each model name, keeps the latest version, the keep_last most recent versions, the
+        most recent version of each of the keep_daily most recent days and the most recent version
+        of each of the keep_weekly most recent weeks. Artifacts of dropped versions are deleted by
+        collect_garbage.
+
+        Args:
+            keep_last (int, optional): Number of most recent versions to keep. Defaults to
+                ARTIFACT_KEEP_LAST.
+            keep_daily (int, optional): Number of days to keep a version for. Defaults to
+                ARTIFACT_KEEP_DAILY.
+            keep_weekly (int, optional): Number of weeks to keep a version for. Defaults to
+                ARTIFACT_KEEP_WEEKLY.
+
+        Returns:
+            list[str]: Ids of the dropped versions.
+        """
+        with self._locked():
+            manifest = self._read_manifest()
+
+            by_model_name: dict[str, list[dict]] = {}
+            for version in manifest["versions"].values():
+                by_model_name.setdefault(version["model_name"], []).append(version)
+
+            dropped = []
+            for model_name, versions in by_model_name.items():
+                versions.sort(key=lambda version: version["fit_timestamp"], reverse=True)
+
+                keep = {manifest["latest"].get(model_name)}
+                keep.update(version["version"] for version in versions[:keep_last])
+
+                days, weeks = {}, {}
+                for version in versions:
+                    fit_time = datetime.datetime.strptime(
+                        version["fit_timestamp"], FIT_TIMESTAMP_FORMAT
+                    )
+                    # Versions are newest first, so the first one seen per period is kept
+                    days.setdefault(fit_time.date(), version["version"])
+                    weeks.setdefault(fit_time.isocalendar()[:2], version["version"])
+
+                keep.update(list(days.values())[:keep_daily])
+                keep.update(list(weeks.values())[:keep_weekly])
+
+                for version in versions:
+                    if version["version"] not in keep:
+                        del manifest["versions"][version["version"]]
+                        dropped.append(version["version"])
+
+            if dropped:
+                self._write_manifest(manifest)
+
+        logger.info(f"Retention dropped {len(dropped)} model versions")
+
+        return dropped
+
+    def collect_garbage(self, grace_seconds: float = ARTIFACT_GC_GRACE_SECONDS) -> int:
+        """Deletes objects no version references anymore.
+
+        Objects modified in the last grace_seconds are kept, as they may belong to a version being
+        written by a trainer, not yet in the manifest.
+
+        Args:
+            grace_seconds (float, optional): Minimum age of deleted objects. Defaults to
+                ARTIFACT_GC_GRACE_SECONDS.
+
+        Returns:
+            int: Number of deleted objects.
+        """
+        deadline = time.time() - grace_seconds
+
+        with self._locked():
+            referenced = {
+                digest
+                for version in self._read_manifest()["versions"].values()
+                for digest in version["artifacts"].values()
+            }
+
+            deleted = 0
+            for object_path in self.objects_dir.glob("*/*"):
+                if object_path.name not in referenced and object_path.stat().st_mtime < deadline:
+                    object_path.unlink()
+                    deleted += 1
+
+            # Temporary files left behind by interrupted writes
+            for tmp_path in self.root.glob(".tmp-*"):
+                if tmp_path.stat().st_mtime < deadline:
+                    tmp_path.unlink()
+
+        logger.info(f"Garbage collection deleted {deleted} objects")
+
+        return deleted
+
+    def _put(self, digest: str, write):
+        """Writes an object through a temporary file, unless the store already has it."""
+        object_path = self.object_path(digest)
+
+        if object_path.exists():
+            # Refresh the modification time, so garbage collection grants it a new grace period
+            os.utime(object_path)
+            return
+
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.temporary_path()
+
+        with tmp_path.open("wb") as file:
+            write(file)
+        tmp_path.replace(object_path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Holds an exclusive lock on the manifest, shared by every process using the store."""
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        with self._lock_path.open("w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> dict:
+        """Reads the manifest from disk, bypassing the cache. Call while holding the lock."""
+        if not self.manifest_path.exists():
+            return {"versions": {}, "latest": {}}
+
+        return json.loads(self.manifest_path.read_text())
+
+    def _write_manifest(self, manifest: dict):
+        """Atomically replaces the manifest. Call while holding the lock."""
+        tmp_path = self.temporary_path(suffix=".json")
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        tmp_path.replace(self.manifest_path)
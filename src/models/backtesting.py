@@ -0,0 +1,133 @@
+"""
+Defines rolling origin backtests of the forecasting models: forecasts from many origins at once and
+their error matrices.
+"""
+
+import datetime
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.serving_model import ServingModel
+
+
+def forecast_from_states(
+    model: ServingModel, states: np.ndarray, num_forecast_days: int
+) -> np.ndarray:
+    """Forecasts prices from several filtered states at once, with the parameters of model.
+
+    Runs the same recursion as ServingModel.forecast_mean, vectorized over origins. Can run inside
+    a worker process.
+
+    Args:
+        model (ServingModel): Model providing the system matrices.
+        states (np.ndarray): Predicted states for the day after each origin, of shape
+            (num_origins, k_states).
+        num_forecast_days (int): Number of days to forecast from each origin.
+
+    Returns:
+        np.ndarray: Forecasted prices, of shape (num_origins, num_forecast_days).
+    """
+    obs_intercept = model.obs_intercept
+
+    forecasted_prices = np.empty((len(states), num_forecast_days))
+
+    for step in range(num_forecast_days):
+        forecasted_prices[:, step] = states @ model.design + obs_intercept
+        states = states @ model.transition.T + model.state_intercept
+
+    return forecasted_prices
+
+
+class BacktestResults:
+    """Forecasts of a rolling origin backtest and their errors.
+
+    Error matrices have one row per origin and one column per horizon. The entry for horizon h is
+    computed over the first h forecasted days from the origin, ignoring days past the end of the
+    data.
+
+    Args:
+        coin_id (str): Coin the backtested model was trained for.
+        origin_dates (Sequence[datetime.date]): Last observed date of each origin.
+        horizons (Sequence[int]): Evaluated horizons, in days.
+        forecasts (np.ndarray): Forecasts of shape (num_origins, max(horizons)).
+        actuals (np.ndarray): Observed prices matching forecasts, NaN past the end of the data.
+    """
+
+    def __init__(
+        self,
+        coin_id: str,
+        origin_dates: Sequence[datetime.date],
+        horizons: Sequence[int],
+        forecasts: np.ndarray,
+        actuals: np.ndarray,
+    ):
+        self.coin = coin_id
+        self.origin_dates = list(origin_dates)
+        self.horizons = list(horizons)
+        self.forecasts = forecasts
+        self.actuals = actuals
+
+        errors = forecasts - actuals
+        observed = ~np.isnan(errors)
+
+        # Cumulative sums over forecasted days give the metrics of every horizon in one pass
+        counts = np.cumsum(observed, axis=1)
+        squared_errors = np.cumsum(np.where(observed, errors**2, 0.0), axis=1)
+        pct_errors = np.cumsum(np.where(observed, np.abs(errors / actuals), 0.0), axis=1)
+
+        columns = np.array(self.horizons) - 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.rmse = np.sqrt(squared_errors[:, columns] / counts[:, columns])
+            self.mape = pct_errors[:, columns] / counts[:, columns]
+
+    def rmse_by_horizon(self) -> np.ndarray:
+        """Averages the RMSE of every horizon over origins, weighting origins equally."""
+        return np.nanmean(self.rmse, axis=0)
+
+    def mape_by_horizon(self) -> np.ndarray:
+        """Averages the MAPE of every horizon over origins, weighting origins equally."""
+        return np.nanmean(self.mape, axis=0)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Builds a long table with one row per origin and horizon.
+
+        Returns:
+            pd.DataFrame: Coin, origin date, horizon, RMSE and MAPE columns.
+        """
+        return pd.DataFrame(
+            {
+                "coin_id": self.coin,
+                "origin_date": np.repeat(self.origin_dates, len(self.horizons)),
+                "horizon": np.tile(self.horizons, len(self.origin_dates)),
+                "rmse": self.rmse.ravel(),
+                "mape": self.mape.ravel(),
+            }
+        )
+
+    def save(self, path: Path):
+        """Writes the error matrices to a Parquet file if path ends with .parquet, else to .npz.
+
+        Parquet files hold the to_frame table and need a Parquet engine such as pyarrow. The .npz
+        file holds the arrays as they are.
+
+        Args:
+            path (Path): Destination path.
+        """
+        if path.suffix == ".parquet":
+            self.to_frame().to_parquet(path, index=False)
+            return
+
+        with path.open("wb") as file:
+            np.savez(
+                file,
+                coin_id=np.array(self.coin),
+                origin_dates=np.array([date.isoformat() for date in self.origin_dates]),
+                horizons=np.array(self.horizons),
+                forecasts=self.forecasts,
+                actuals=self.actuals,
+                rmse=self.rmse,
+                mape=self.mape,
+            )
@@ -0,0 +1,134 @@
+"""
+Compares the speed and accuracy of the ARIMA parameter estimators. Run
+
+    python src/models/benchmark_estimators.py --help
+
+for usage help.
+
+Each estimator fits every order on the same prices, except for a holdout used to compute the
+forecast RMSE. Results are logged and written as JSON.
+"""
+
+import argparse
+import datetime
+import json
+import time
+import warnings
+from math import sqrt
+from pathlib import Path
+
+import numpy as np
+from statsmodels.tsa.arima_process import arma_generate_sample
+
+from src.constants import COIN_PRICE, LOGS
+from src.logger_definition import get_logger
+from src.models.estimators import ARIMAEstimators, estimate_sarimax
+from src.models.serving_model import constant_exog
+
+logger = get_logger(__file__)
+
+
+def synthetic_prices(length: int, seed: int = 0) -> np.ndarray:
+    """Simulates an integrated ARMA(2, 1) price series.
+
+    Args:
+        length (int): Number of days.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        np.ndarray: Simulated prices.
+    """
+    np.random.seed(seed)
+    returns = arma_generate_sample([1, -0.5, 0.2], [1, 0.4], length, scale=1.0)
+
+    return 1000 + np.cumsum(returns)
+
+
+def compare_estimators(
+    X: np.ndarray, orders: list[tuple[int, int, int]], holdout_size: int
+) -> list[dict]:
+    """Fits every order with every estimator and scores the fits.
+
+    Args:
+        X (np.ndarray): Prices, the last holdout_size ones are only used to score forecasts.
+        orders (list[tuple[int, int, int]]): ARIMA orders to fit.
+        holdout_size (int): Number of prices held out.
+
+    Returns:
+        list[dict]: Order, estimator, fit seconds, log likelihood, AIC and holdout RMSE of every
+            fit.
+    """
+    X_train, X_test = X[:-holdout_size], X[-holdout_size:]
+    results = []
+
+    for order in orders:
+        for estimator in ARIMAEstimators:
+            start = time.perf_counter()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model_fit = estimate_sarimax(
+                    X_train, constant_exog(len(X_train)), order, (0, 0, 0, 0), estimator
+                )
+            fit_seconds = time.perf_counter() - start
+
+            predictions = model_fit.forecast(holdout_size, exog=constant_exog(holdout_size))
+
+            results.append(
+                {
+                    "order": list(order),
+                    "estimator": estimator.value,
+                    "fit_seconds": fit_seconds,
+                    "llf": float(model_fit.llf),
+                    "aic": float(model_fit.aic),
+                    "holdout_rmse": sqrt(np.mean((X_test - np.asarray(predictions)) ** 2)),
+                }
+            )
+            logger.info(
+                f"{order} {estimator.value}: {fit_seconds:.2f}s, llf {model_fit.llf:.1f},"
+                f" holdout RMSE {results[-1]['holdout_rmse']:.3f}"
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("benchmark_estimators")
+
+    parser.add_argument(
+        "-c", "--coin", help="Coin to load prices for. Defaults to simulated prices"
+    )
+    parser.add_argument(
+        "--length", type=int, default=1500, help="Number of days of simulated prices"
+    )
+    parser.add_argument(
+        "--orders",
+        nargs="+",
+        default=["2.1.1", "5.1.5", "10.1.10", "30.1.30"],
+        help="ARIMA orders to compare, as p.d.q",
+    )
+    parser.add_argument("--holdout", type=int, default=30, help="Number of days held out")
+    parser.add_argument("-o", "--output", type=Path, help="Path of the JSON results file")
+
+    args = parser.parse_args()
+
+    if args.coin:
+        from src.models.forecasters import ARIMAModel
+
+        prices = ARIMAModel(coin_id=args.coin).load_train_data()[COIN_PRICE].values
+    else:
+        prices = synthetic_prices(args.length)
+
+    orders = [tuple(int(o) for o in order.split(".")) for order in args.orders]
+    results = compare_estimators(prices, orders, args.holdout)
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "coin": args.coin or "simulated",
+        "num_prices": len(prices),
+        "holdout": args.holdout,
+        "results": results,
+    }
+
+    output = args.output or LOGS / f"benchmark_estimators_{int(time.time())}.json"
+    output.write_text(json.dumps(report, indent=2))
+    logger.info(f"Results saved to {output}")
@@ -0,0 +1,204 @@
+"""
+Defines the compact, read only representation of the training prices of several coins, shared
+between the trainer and its worker processes.
+"""
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.typing import DTypeLike
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+
+
+class CoinPrices:
+    """Prices of several coins in a ragged array layout.
+
+    Dates and prices of every coin are stored back to back in two contiguous arrays, sorted by coin
+    and date, and the i-th coin spans offsets[i]:offsets[i + 1]. Per coin accessors return views,
+    never copies.
+
+    Saved instances are memory mapped read only, and pickle as their directory, so worker processes
+    read the saved arrays through the shared page cache instead of receiving copies.
+
+    Args:
+        coins (Sequence[str]): Coin ids, in storage order.
+        offsets (np.ndarray): Start of every coin in dates and prices, followed by their length.
+        dates (np.ndarray): Dates, as datetime64[D].
+        prices (np.ndarray): Prices, as float64 or float32.
+        path (Path | None, optional): Directory the arrays are memory mapped from, if saved.
+            Defaults to None.
+    """
+
+    def __init__(
+        self,
+        coins: Sequence[str],
+        offsets: np.ndarray,
+        dates: np.ndarray,
+        prices: np.ndarray,
+        path: Path | None = None,
+    ):
+        self.coins = list(coins)
+        self.offsets = offsets
+        self.dates = dates
+        self.prices = prices
+        self.path = path
+
+        self._positions = {coin_id: position for position, coin_id in enumerate(self.coins)}
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, dtype: DTypeLike = np.float64) -> "CoinPrices":
+        """Builds the ragged layout from a frame with coin, date and price columns.
+
+        Args:
+            data (pd.DataFrame): Prices of any number of coins, as loaded by ForecastingModel.
+            dtype (DTypeLike, optional): Price dtype, float32 halves the memory used. Defaults to
+                np.float64.
+
+        Returns:
+            CoinPrices: The prices of every coin in data.
+        """
+        coins = pd.Categorical(data[COIN_ID])
+        codes = coins.codes
+        dates = data[DATE].values.astype("datetime64[D]")
+        prices = data[COIN_PRICE].values.astype(dtype)
+
+        # Data loaded by ForecastingModel is already sorted, which skips the reordering copies
+        order = np.lexsort((dates, codes))
+        if (order[1:] < order[:-1]).any():
+            codes, dates, prices = codes[order], dates[order], prices[order]
+
+        counts = np.bincount(codes, minlength=len(coins.categories))
+        present = counts > 0
+
+        return cls(
+            coins=coins.categories[present],
+            offsets=np.r_[0, np.cumsum(counts[present])],
+            dates=dates,
+            prices=prices,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "CoinPrices":
+        """Memory maps prices saved with save, read only.
+
+        Args:
+            path (Path): Directory the prices were saved to.
+
+        Returns:
+            CoinPrices: The saved prices.
+        """
+        return cls(
+            coins=json.loads((path / "coins.json").read_text()),
+            offsets=np.load(path / "offsets.npy"),
+            dates=np.load(path / "dates.npy", mmap_mode="r"),
+            prices=np.load(path / "prices.npy", mmap_mode="r"),
+            path=path,
+        )
+
+    def save(self, path: Path) -> "CoinPrices":
+        """Writes the arrays to a directory.
+
+        Args:
+            path (Path): Directory to write to, created if missing.
+
+        Returns:
+            CoinPrices: The saved prices, memory mapped from path.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+
+        (path / "coins.json").write_text(json.dumps(self.coins))
+        np.save(path / "offsets.npy", self.offsets)
+        np.save(path / "dates.npy", self.dates)
+        np.save(path / "prices.npy", self.prices)
+
+        return CoinPrices.load(path)
+
+    def __reduce__(self):
+        if self.path is not None:
+            return CoinPrices.load, (self.path,)
+
+        return CoinPrices, (self.coins, self.offsets, self.dates, self.prices)
+
+    def __contains__(self, coin_id: str) -> bool:
+        return coin_id in self._positions
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the dates and prices, in bytes."""
+        return self.dates.nbytes + self.prices.nbytes
+
+    def coin_slice(self, coin_id: str) -> slice:
+        """Position of coin_id in dates and prices.
+
+        Args:
+            coin_id (str): Coin to locate.
+
+        Raises:
+            KeyError: No prices for coin_id.
+
+        Returns:
+            slice: The coin's slice.
+        """
+        if coin_id not in self._positions:
+            raise KeyError(f"No prices for {coin_id}")
+
+        position = self._positions[coin_id]
+
+        return slice(self.offsets[position], self.offsets[position + 1])
+
+    def coin_dates(self, coin_id: str) -> np.ndarray:
+        """View of the dates of coin_id."""
+        return self.dates[self.coin_slice(coin_id)]
+
+    def coin_prices(self, coin_id: str) -> np.ndarray:
+        """View of the prices of coin_id."""
+        return self.prices[self.coin_slice(coin_id)]
+
+    def frame(self, coin_id: str, dtype: DTypeLike | None = None) -> pd.DataFrame:
+        """Builds the train data frame of a single coin.
+
+        The price column is a view of the stored prices, unless dtype differs from theirs, e.g. to
+        fit float32 prices in float64. Dates are converted to the nanoseconds pandas uses.
+
+        Args:
+            coin_id (str): Coin to build the frame for.
+            dtype (DTypeLike | None, optional): Price dtype. Defaults to the stored one.
+
+        Returns:
+            pd.DataFrame: Coin, date and price columns.
+        """
+        prices = self.coin_prices(coin_id)
+
+        return pd.DataFrame(
+            {
+                COIN_ID: coin_id,
+                DATE: pd.to_datetime(self.coin_dates(coin_id)),
+                COIN_PRICE: prices if dtype is None else prices.astype(dtype, copy=False),
+            },
+            copy=False,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Builds a frame with the prices of every coin and a categorical coin column.
+
+        Returns:
+            pd.DataFrame: Coin, date and price columns.
+        """
+        counts = np.diff(self.offsets)
+
+        return pd.DataFrame(
+            {
+                COIN_ID: pd.Categorical.from_codes(
+                    np.repeat(np.arange(len(self.coins)), counts), self.coins
+                ),
+                DATE: pd.to_datetime(self.dates),
+                COIN_PRICE: self.prices,
+            }
+        )
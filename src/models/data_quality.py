@@ -0,0 +1,183 @@
+"""
+Defines the data quality stage run on training data: a per coin report of gaps, duplicates,
+staleness and outliers, and the optional reindexing of every coin to a complete daily calendar.
+
+Every step works on the whole multi coin frame at once, with grouped operations, so its cost grows
+linearly with the number of rows.
+"""
+
+import datetime
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+from src.constants import COIN_ID, COIN_PRICE, DATA_OUTLIER_MAD_THRESHOLD, DATE
+from src.logger_definition import get_logger
+
+logger = get_logger(__file__)
+
+
+class ImputationMethods(str, Enum):
+    FFILL = "ffill"
+    LINEAR = "linear"
+
+
+def drop_duplicate_dates(data: pd.DataFrame) -> pd.DataFrame:
+    """Keeps the last row of every coin and date, with data sorted by coin and date.
+
+    Args:
+        data (pd.DataFrame): Prices with coin, date and price columns.
+
+    Returns:
+        pd.DataFrame: Prices without duplicated dates.
+    """
+    return data.drop_duplicates([COIN_ID, DATE], keep="last")
+
+
+def data_quality_report(
+    data: pd.DataFrame,
+    reference_date: datetime.date | None = None,
+    outlier_threshold: float = DATA_OUTLIER_MAD_THRESHOLD,
+) -> pd.DataFrame:
+    """Checks the prices of every coin.
+
+    Outliers are daily log returns further than outlier_threshold median absolute deviations from
+    the coin's median log return. They are reported, not removed, as crypto prices do jump.
+
+    Args:
+        data (pd.DataFrame): Prices with coin, date and price columns, sorted by coin and date.
+        reference_date (datetime.date | None, optional): Date prices are expected up to. Defaults
+            to yesterday.
+        outlier_threshold (float, optional): Outlier threshold, in median absolute deviations.
+            Defaults to DATA_OUTLIER_MAD_THRESHOLD.
+
+    Returns:
+        pd.DataFrame: One row per coin with columns:
+            - num_rows: Number of rows.
+            - first_date, last_date: Date range.
+            - num_duplicates: Rows repeating the previous row's date.
+            - num_gaps: Number of holes in the daily calendar.
+            - missing_days: Number of days missing inside the date range.
+            - max_gap_days: Longest hole, in days.
+            - missing_prices: Number of null prices.
+            - num_outliers: Number of outlier returns.
+            - stale_days: Days between last_date and reference_date.
+    """
+    if reference_date is None:
+        reference_date = datetime.date.today() - datetime.timedelta(days=1)
+
+    coins = data[COIN_ID]
+    same_coin = coins.eq(coins.shift())
+
+    # Days since the previous row of the same coin, NaN on each coin's first row
+    delta_days = data[DATE].diff().dt.days.where(same_coin)
+    missing_days = (delta_days - 1).clip(lower=0)
+
+    returns = np.log(data[COIN_PRICE].where(data[COIN_PRICE] > 0)).diff().where(same_coin)
+    deviations = (returns - returns.groupby(coins).transform("median")).abs()
+    mad = deviations.groupby(coins).transform("median")
+
+    checks = pd.DataFrame(
+        {
+            COIN_ID: coins,
+            DATE: data[DATE],
+            "duplicate": delta_days.eq(0),
+            "gap": delta_days.gt(1),
+            "missing_days": missing_days,
+            "missing_price": data[COIN_PRICE].isna(),
+            "outlier": deviations.gt(outlier_threshold * mad) & mad.gt(0),
+        }
+    )
+
+    report = checks.groupby(COIN_ID, observed=True).agg(
+        num_rows=(DATE, "size"),
+        first_date=(DATE, "min"),
+        last_date=(DATE, "max"),
+        num_duplicates=("duplicate", "sum"),
+        num_gaps=("gap", "sum"),
+        missing_days=("missing_days", "sum"),
+        max_gap_days=("missing_days", "max"),
+        missing_prices=("missing_price", "sum"),
+        num_outliers=("outlier", "sum"),
+    )
+    report["missing_days"] = report["missing_days"].fillna(0).astype(int)
+    report["max_gap_days"] = report["max_gap_days"].fillna(0).astype(int)
+    report["stale_days"] = (pd.Timestamp(reference_date) - report["last_date"]).dt.days.clip(0)
+
+    return report
+
+
+def log_data_quality(report: pd.DataFrame):
+    """Logs a warning for every issue found in a data_quality_report.
+
+    Missing and stale days can be scraped with src/crawler/crawl.py --repair_gaps.
+
+    Args:
+        report (pd.DataFrame): Report returned by data_quality_report.
+    """
+    repair = False
+    for coin, checks in report.iterrows():
+        if checks["num_duplicates"]:
+            logger.warning(f"{checks['num_duplicates']} duplicated dates for {coin}")
+        if checks["missing_days"]:
+            repair = True
+            logger.warning(
+                f"{checks['missing_days']} data points missing for {coin}, in"
+                f" {checks['num_gaps']} gaps of up to {checks['max_gap_days']} days"
+            )
+        if checks["missing_prices"]:
+            logger.warning(f"{checks['missing_prices']} null prices for {coin}")
+        if checks["num_outliers"]:
+            logger.warning(f"{checks['num_outliers']} outlier daily returns for {coin}")
+        if checks["stale_days"]:
+            repair = True
+            logger.warning(
+                f"Scraping is outdated for {coin}, latest scraped date is {checks['last_date']}"
+            )
+
+    if repair:
+        logger.warning("Scrape the missing days with src/crawler/crawl.py --repair_gaps --db_store")
+
+
+def fill_daily_gaps(data: pd.DataFrame, method: ImputationMethods) -> pd.DataFrame:
+    """Reindexes every coin to a complete daily calendar between its first and last dates.
+
+    Prices of added days, and null prices, are imputed by method within each coin, never from
+    another coin's prices.
+
+    Args:
+        data (pd.DataFrame): Prices with coin, date and price columns, sorted by coin and date and
+            without duplicated dates.
+        method (ImputationMethods): Imputation method, carrying the last price forward or
+            interpolating linearly between the surrounding prices.
+
+    Returns:
+        pd.DataFrame: Coin, date and price columns, with one row per coin and day.
+    """
+    bounds = data.groupby(COIN_ID, sort=False, observed=True)[DATE].agg(["min", "max"])
+    lengths = ((bounds["max"] - bounds["min"]).dt.days + 1).values
+
+    # Every coin's calendar at once: each coin's first date plus 0, 1, ... length - 1 days
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    calendar = pd.MultiIndex.from_arrays(
+        [
+            np.repeat(bounds.index.values, lengths),
+            np.repeat(bounds["min"].values, lengths) + pd.to_timedelta(offsets, unit="D"),
+        ],
+        names=[COIN_ID, DATE],
+    )
+
+    prices = data.set_index([COIN_ID, DATE])[COIN_PRICE].reindex(calendar)
+
+    if method == ImputationMethods.FFILL:
+        prices = prices.groupby(level=COIN_ID, sort=False).ffill()
+    elif method == ImputationMethods.LINEAR:
+        prices = prices.groupby(level=COIN_ID, sort=False).transform(
+            lambda coin_prices: coin_prices.interpolate(limit_area="inside")
+        )
+
+    filled = prices.reset_index()
+    filled[COIN_ID] = filled[COIN_ID].astype(data[COIN_ID].dtype)
+
+    return filled
@@ -0,0 +1,121 @@
+"""
+Defines the parameter estimators available to fit ARIMA models.
+
+Exact maximum likelihood is statsmodels' default for SARIMAX. The Hannan-Rissanen estimator
+approximates it with two least squares regressions, a long autoregression estimating the
+innovations and an ARMA regression on them, which is orders of magnitude faster for high orders.
+"""
+
+from enum import Enum
+
+import numpy as np
+from numpy.typing import ArrayLike
+from statsmodels.tsa.arima.estimators.hannan_rissanen import hannan_rissanen
+from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResultsWrapper
+
+
+class ARIMAEstimators(str, Enum):
+    MLE = "mle"
+    HANNAN_RISSANEN = "hannan_rissanen"
+
+
+def reflect_roots(lag_polynomial: np.ndarray, min_modulus: float = 1.001) -> np.ndarray:
+    """Makes a lag polynomial stationary (or invertible) by reflecting its roots.
+
+    Roots inside the unit circle are replaced by their inverse conjugates, and roots too close to
+    it are pushed to min_modulus. Least squares estimates often are slightly non stationary, and
+    the state space model needs stationary AR and invertible MA polynomials to be initialized.
+
+    Args:
+        lag_polynomial (np.ndarray): Coefficients of 1 + c_1 L + ... + c_n L^n, in increasing
+            order of the lag operator.
+        min_modulus (float, optional): Minimum modulus of the reflected roots. Defaults to 1.001.
+
+    Returns:
+        np.ndarray: Coefficients of the reflected polynomial, with constant term 1.
+    """
+    if len(lag_polynomial) == 1:
+        return lag_polynomial
+
+    roots = np.roots(lag_polynomial[::-1])
+
+    inside = np.abs(roots) < 1
+    roots[inside] = 1 / np.conj(roots[inside])
+
+    close = np.abs(roots) < min_modulus
+    roots[close] = roots[close] / np.abs(roots[close]) * min_modulus
+
+    polynomial = np.poly(roots)[::-1]
+
+    return np.real(polynomial / polynomial[0])
+
+
+def hannan_rissanen_params(
+    X: np.ndarray,
+    order: tuple[int, int, int],
+    seasonal_order: tuple[int, int, int, int] = (0, 0, 0, 0),
+) -> np.ndarray:
+    """Estimates SARIMAX parameters with the Hannan-Rissanen method.
+
+    The ARMA parameters are estimated on the differenced prices, then reflected to be stationary
+    and invertible. Parameters are ordered as SARIMAX expects them for a constant exog: exog
+    coefficient, AR, MA and innovations variance.
+
+    Args:
+        X (np.ndarray): Prices to fit.
+        order (tuple[int, int, int]): Order for the ARIMA model.
+        seasonal_order (tuple[int, int, int, int], optional): Seasonal order for the ARIMA model,
+            which must be empty. Defaults to (0, 0, 0, 0).
+
+    Raises:
+        ValueError: Seasonal orders are not supported.
+
+    Returns:
+        np.ndarray: Parameters for SARIMAX(X, constant_exog(len(X)), order=order).
+    """
+    if any(seasonal_order[:3]):
+        raise ValueError("Hannan-Rissanen estimation does not support seasonal orders")
+
+    p, d, q = order
+    diff = np.diff(X, n=d)
+
+    # The coefficient of the constant exog is the series mean without differencing, with
+    # differencing it does not affect forecasts
+    estimates, _ = hannan_rissanen(diff, ar_order=p, ma_order=q, demean=d == 0)
+
+    ar_params = -reflect_roots(np.r_[1, -estimates.ar_params])[1:]
+    ma_params = reflect_roots(np.r_[1, estimates.ma_params])[1:]
+
+    return np.r_[X.mean(), ar_params, ma_params, estimates.sigma2]
+
+
+def estimate_sarimax(
+    X: np.ndarray,
+    exog: ArrayLike,
+    order: tuple[int, int, int],
+    seasonal_order: tuple[int, int, int, int],
+    estimator: ARIMAEstimators = ARIMAEstimators.MLE,
+    start_params: ArrayLike | None = None,
+) -> SARIMAXResultsWrapper:
+    """Estimates a SARIMAX model with the given estimator.
+
+    Args:
+        X (np.ndarray): Prices to fit.
+        exog (ArrayLike): Exogenous variables.
+        order (tuple[int, int, int]): Order for the ARIMA model.
+        seasonal_order (tuple[int, int, int, int]): Seasonal order for the ARIMA model.
+        estimator (ARIMAEstimators, optional): Parameter estimator. Defaults to
+            ARIMAEstimators.MLE.
+        start_params (ArrayLike | None, optional): Starting values for maximum likelihood.
+            Defaults to None.
+
+    Returns:
+        SARIMAXResultsWrapper: Results of the model, the same for every estimator.
+    """
+    model = SARIMAX(X, exog, order=order, seasonal_order=seasonal_order)
+
+    if estimator == ARIMAEstimators.HANNAN_RISSANEN:
+        # Parameters come from least squares, the filter pass only builds the results
+        return model.filter(hannan_rissanen_params(X, order, seasonal_order))
+
+    return model.fit(start_params=start_params)
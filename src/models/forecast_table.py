@@ -0,0 +1,137 @@
+"""
+Defines the precomputed forecast table artifact written at train time and served by the API.
+"""
+
+import datetime
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+
+class ForecastTable:
+    """Forecasts and confidence intervals precomputed up to a maximum horizon.
+
+    Forecasting with a fitted state space model is a multi-millisecond computation, while serving
+    from this table is a slice of a NumPy array. Position i of every array holds the forecast for
+    start_date plus i + 1 days.
+
+    Args:
+        coin_id (str): Coin the forecasts belong to.
+        fit_timestamp (str): Fit timestamp of the model that produced the forecasts.
+        start_date (datetime.date): Last date in the model train data.
+        mean (np.ndarray): Forecasted prices.
+        lower (np.ndarray): Lower bound of the forecast confidence interval.
+        upper (np.ndarray): Upper bound of the forecast confidence interval.
+        alpha (float): Alpha of the confidence interval.
+        var (np.ndarray | None, optional): Forecast variances, used to compute quantiles. Tables
+            written before variances were stored don't have them. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        coin_id: str,
+        fit_timestamp: str,
+        start_date: datetime.date,
+        mean: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        alpha: float,
+        var: np.ndarray | None = None,
+    ):
+        if not len(mean) == len(lower) == len(upper):
+            raise ValueError("Forecast mean and confidence interval lengths must match")
+
+        self.coin = coin_id
+        self.fit_timestamp = fit_timestamp
+        self.start_date = start_date
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.alpha = alpha
+        self.var = None if var is None else np.asarray(var, dtype=np.float64)
+
+    @property
+    def max_horizon(self) -> int:
+        """Number of days covered by the table."""
+        return len(self.mean)
+
+    def covers(self, target_date: datetime.date) -> bool:
+        """Checks whether target_date can be served from the table.
+
+        Args:
+            target_date (datetime.date): Target date to predict.
+
+        Returns:
+            bool: True if target_date is within the precomputed horizon.
+        """
+        return 0 < (target_date - self.start_date).days <= self.max_horizon
+
+    def forecast(self, target_date: datetime.date) -> Mapping[datetime.date, float]:
+        """Looks up coin price forecasts for every date until given target_date.
+
+        Args:
+            target_date (datetime.date): Target date to predict.
+
+        Raises:
+            ValueError: Target date must be greater than train date.
+            ValueError: Target date must be within the precomputed horizon.
+
+        Returns:
+            Mapping[datetime.date, float]: A Mapping from date to price prediction for range of
+                dates from fitted day plus one to target date.
+        """
+        num_forecast_days = (target_date - self.start_date).days
+
+        if num_forecast_days <= 0:
+            raise ValueError("Target date must be greater than fit date")
+        if num_forecast_days > self.max_horizon:
+            raise ValueError(
+                f"Target date is beyond the {self.max_horizon} days precomputed for {self.coin}"
+            )
+
+        return {
+            self.start_date + datetime.timedelta(days=i + 1): forecast
+            for i, forecast in enumerate(self.mean[:num_forecast_days].tolist())
+        }
+
+    def save(self, path: Path):
+        """Writes the table to an uncompressed .npz file.
+
+        Args:
+            path (Path): Destination path.
+        """
+        with path.open("wb") as file:
+            np.savez(
+                file,
+                coin_id=np.array(self.coin),
+                fit_timestamp=np.array(self.fit_timestamp),
+                start_date=np.array(self.start_date.isoformat()),
+                mean=self.mean,
+                lower=self.lower,
+                upper=self.upper,
+                alpha=np.array(self.alpha),
+                **({} if self.var is None else {"var": self.var}),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ForecastTable":
+        """Reads a table written by ForecastTable.save.
+
+        Args:
+            path (Path): Path to the .npz file.
+
+        Returns:
+            ForecastTable: The loaded table.
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                coin_id=str(artifact["coin_id"]),
+                fit_timestamp=str(artifact["fit_timestamp"]),
+                start_date=datetime.date.fromisoformat(str(artifact["start_date"])),
+                mean=artifact["mean"],
+                lower=artifact["lower"],
+                upper=artifact["upper"],
+                alpha=float(artifact["alpha"]),
+                var=artifact["var"] if "var" in artifact.files else None,
+            )
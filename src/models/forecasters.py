@@ -3,44 +3,85 @@ Defines classes for coin forecasting
 """
 
 import datetime
-import pickle
-from collections.abc import Mapping
+import multiprocessing
+import queue
+import time
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from math import sqrt
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 from numpy.typing import ArrayLike
-from sklearn.metrics import mean_squared_error
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResultsWrapper
 from statsmodels.tsa.stattools import adfuller
 
 from src.constants import (
     ARIMA_DEAFULT_ORDER,
+    ARIMA_FULL_REFIT_DAYS,
+    ARIMA_REFIT_LLF_TOLERANCE,
+    ARIMA_SEARCH_MAX_P,
+    ARIMA_SEARCH_MAX_Q,
+    ARIMA_SEARCH_PATIENCE,
+    ARIMA_SEARCH_SEASONAL_ORDERS,
+    ARIMA_SEARCH_TIME_BUDGET,
+    BACKTEST_HORIZONS,
+    BACKTEST_NUM_ORIGINS,
+    BACKTEST_ORIGIN_STEP,
     COIN_ID,
     COIN_PRICE,
     DATE,
-    MODELS_FORECASTING,
-    MODELS_FORECASTING_HISTORY,
+    FIT_TIMESTAMP_FORMAT,
+    FORECAST_MAX_HORIZON,
+    FORECAST_QUANTILES,
+    TRAIN_MAX_WORKERS,
 )
-from src.db_scripts import db_connection, db_mappings
 from src.logger_definition import get_logger
+from src.models.artifact_store import ArtifactStore
+from src.models.backtesting import BacktestResults, forecast_from_states
+from src.models.data_quality import (
+    ImputationMethods,
+    data_quality_report,
+    drop_duplicate_dates,
+    fill_daily_gaps,
+    log_data_quality,
+)
+from src.models.estimators import ARIMAEstimators, estimate_sarimax
+from src.models.forecast_table import ForecastTable
+from src.models.order_search import OrderCriteria, evaluate_order, save_order
+from src.models.price_cache import PriceCache
+from src.models.serving_model import ServingModel, constant_exog, normal_quantiles
+
+# NOTE: Plotting (src.models.plots) and database (src.db_scripts) modules are imported lazily,
+# where needed. Unpickling a model imports this module, and the plotting and ORM stacks are heavy
+# and unneeded to train or forecast.
+if TYPE_CHECKING:
+    from src.db_scripts import db_mappings
 
 logger = get_logger(__file__)
 
 
+def _model_name(coin_id: str, order: Sequence[int], seasonal_order: Sequence[int]) -> str:
+    """Builds the name model artifacts are saved under, before the timestamp or latest suffix."""
+    return (
+        f"{coin_id}_ARIMA_{'.'.join(list([str(o) for o in order]))}_"
+        f"{'.'.join(list([str(o) for o in seasonal_order]))}"
+    )
+
+
 class DataSources(str, Enum):
     FILE = "file"
     DATABASE = "database"
+    CACHE = "cache"
 
 
 class ForecastingModel:
     def __init__(self, data=None):
         self.train_data = data
+        self.quality_report: pd.DataFrame | None = None
 
     def fit(self):
         """
@@ -61,12 +102,107 @@ class ForecastingModel:
         """
         raise NotImplementedError("Subclasses must implement forecast() method.")
 
-    def load_train_data(self, source: DataSources = DataSources.DATABASE, **kwargs):
+    def forecast_from_origins(
+        self, origins: Sequence[int], num_forecast_days: int, max_workers: int = 1
+    ) -> np.ndarray:
+        """
+        Forecast from several origins in the training data, with the trained model parameters.
+
+        Parameters:
+        origins (Sequence[int]): Positions in the training data of the last observation of each
+            origin.
+        num_forecast_days (int): Number of days to forecast from each origin.
+        max_workers (int): Number of worker processes.
+
+        Returns:
+        np.ndarray: Forecasts of shape (len(origins), num_forecast_days).
+        """
+        raise NotImplementedError("Subclasses must implement forecast_from_origins() method.")
+
+    def backtest(
+        self,
+        horizons: Sequence[int] = BACKTEST_HORIZONS,
+        num_origins: int = BACKTEST_NUM_ORIGINS,
+        origin_step: int = BACKTEST_ORIGIN_STEP,
+        max_workers: int = 1,
+        output_path: Path | None = None,
+    ) -> BacktestResults:
+        """Evaluates the trained model with a rolling origin backtest over the training data.
+
+        Origins are spaced origin_step days apart, the latest one max(horizons) days before the
+        end of the data, so every horizon is fully observed. Forecasts from every origin reuse the
+        trained parameters, see forecast_from_origins, so evaluations are in sample unless the
+        model was trained on a prefix of the current training data. Fit such a model with
+        fit(save=False), so the stale model is not promoted to latest and served.
+
+        Args:
+            horizons (Sequence[int], optional): Horizons to evaluate, in days. Defaults to
+                BACKTEST_HORIZONS.
+            num_origins (int, optional): Maximum number of origins. Defaults to
+                BACKTEST_NUM_ORIGINS.
+            origin_step (int, optional): Days between origins. Defaults to BACKTEST_ORIGIN_STEP.
+            max_workers (int, optional): Number of worker processes. Defaults to 1.
+            output_path (Path | None, optional): If given, the results are saved there, as
+                Parquet for .parquet paths and .npz otherwise. Defaults to None.
+
+        Raises:
+            ValueError: Training data must hold a single coin.
+            ValueError: Training data must be long enough for one origin.
+
+        Returns:
+            BacktestResults: Forecasts and RMSE and MAPE matrices by origin and horizon.
+        """
+        if self.train_data[COIN_ID].nunique() != 1:
+            raise ValueError("Backtests need training data for a single coin")
+
+        prices = self.train_data[COIN_PRICE].values
+        dates = self.train_data[DATE].dt.date.values
+        max_horizon = max(horizons)
+
+        last_origin = len(prices) - 1 - max_horizon
+        origins = [last_origin - origin_step * k for k in range(num_origins)]
+        origins = sorted(origin for origin in origins if origin >= 0)
+
+        if not origins:
+            raise ValueError(f"Not enough data to backtest {max_horizon} day horizons")
+
+        logger.info(f"Backtesting {len(origins)} origins, from {dates[origins[0]]} onwards")
+        forecasts = self.forecast_from_origins(origins, max_horizon, max_workers=max_workers)
+
+        # Observed prices for the days forecasted from each origin
+        actuals = prices[np.array(origins)[:, np.newaxis] + np.arange(1, max_horizon + 1)]
+
+        results = BacktestResults(
+            coin_id=self.train_data[COIN_ID].iloc[0],
+            origin_dates=[dates[origin] for origin in origins],
+            horizons=horizons,
+            forecasts=forecasts,
+            actuals=actuals,
+        )
+
+        if output_path is not None:
+            results.save(output_path)
+            logger.info(f"Backtest results saved to {output_path}")
+
+        return results
+
+    def load_train_data(
+        self,
+        source: DataSources = DataSources.CACHE,
+        imputation: ImputationMethods | None = None,
+        **kwargs,
+    ):
         """
         Load historical data for the forecasting model.
 
+        Data quality is checked for every coin, see data_quality_report, and the report is kept
+        in self.quality_report. Duplicated dates are dropped, keeping the last row.
+
         Parameters:
-        source (str): The data source. Options: 'file', 'database'.
+        source (str): The data source. Options: 'file', 'database', 'cache'. The cache is a local
+            snapshot of the database, refreshed with the rows changed since the last load.
+        imputation (ImputationMethods | None): If given, every coin is reindexed to a complete
+            daily calendar and missing prices are imputed with this method. Defaults to None.
         **kwargs: Additional keyword arguments specific to the data source.
 
         Keyword Arguments:
@@ -74,10 +210,21 @@ class ForecastingModel:
             - file_path (pathlib.Path): The file path to the historical data file.
             - start_date (datetime.date | None, Optional): Starting date for the historic data.
                 Defaults to None.
+            - coin_ids (Sequence[str] | None, Optional): Coins to load. Defaults to every coin.
         - For 'database' source:
             - table (str): The name of the table in the PostgreSQL database.
             - start_date (datetime.date | None, Optional): Starting date for the historic data.
                 Defaults to None.
+            - coin_ids (Sequence[str] | None, Optional): Coins to load. Defaults to every coin.
+            - end_date (datetime.date | None, Optional): Last date for the historic data.
+                Defaults to None.
+            - columns (Sequence[str], Optional): Columns to load. Defaults to coin, date and
+                price.
+        - For 'cache' source:
+            - start_date (datetime.date | None, Optional): Starting date for the historic data.
+                Defaults to None.
+            - coin_ids (Sequence[str] | None, Optional): Coins to load. Defaults to every coin.
+            - refresh (bool, Optional): If False, the database is not queried. Defaults to True.
         """
         sources = [source.value for source in DataSources]
 
@@ -89,32 +236,33 @@ class ForecastingModel:
                 data = self._load_from_file(**kwargs)
             elif source == DataSources.DATABASE:
                 data = self._load_from_database(**kwargs)
+            elif source == DataSources.CACHE:
+                data = PriceCache().load(**kwargs)
 
             # Format data
             data[DATE] = pd.to_datetime(data[DATE])
-            data = data.sort_values([COIN_ID, DATE])
+            # Coins are held as categorical codes instead of one string object per row
+            data[COIN_ID] = data[COIN_ID].astype("category")
+            data = data.sort_values([COIN_ID, DATE], ignore_index=True)
 
             # Sanity checks
-            yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
-            yesterday = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            for coin in data[COIN_ID].unique():
-                coin_data = data[data[COIN_ID] == coin]
-                coin_data["delta_days"] = coin_data[DATE].diff() / datetime.timedelta(days=1)
-                if (missing_dates := coin_data["delta_days"].fillna(1.0) != 1.0).sum() > 0:
-                    num_missing_dates = coin_data.loc[missing_dates, "delta_days"].sum()
-                    logger.warning(f"{int(num_missing_dates)} data points missing for {coin}")
-                if (latest_scrape_date := coin_data[DATE].max()) < yesterday:
-                    logger.warning(
-                        f"Scraping is outdated for {coin}, latest scraped date is"
-                        f" {latest_scrape_date}"
-                    )
+            self.quality_report = data_quality_report(data)
+            log_data_quality(self.quality_report)
+
+            data = drop_duplicate_dates(data)
+            if imputation is not None:
+                data = fill_daily_gaps(data, imputation)
 
             self.train_data = data
 
         return data
 
-    def _load_from_file(self, file_path: Path, start_date: datetime.date | None = None):
+    def _load_from_file(
+        self,
+        file_path: Path,
+        start_date: datetime.date | None = None,
+        coin_ids: Sequence[str] | None = None,
+    ):
         """
         Load historical data from a file.
 
@@ -122,6 +270,7 @@ class ForecastingModel:
         file_path (Path): The file path to the historical data file.
         start_date (datetime.date | None, Optional): Starting date for the historic data.
             Defaults to None.
+        coin_ids (Sequence[str] | None, Optional): Coins to load. Defaults to every coin.
         """
         # Read data from CSV file
         data = pd.read_csv(file_path)
@@ -130,41 +279,45 @@ class ForecastingModel:
         if start_date:
             data = data[data[DATE] >= start_date]
 
+        if coin_ids:
+            data = data[data[COIN_ID].isin(coin_ids)]
+
         return data
 
     def _load_from_database(
         self,
-        table: db_mappings.Base = db_mappings.CoingeckoScrapedData,
+        table: "db_mappings.Base | None" = None,
         start_date: datetime.date | None = None,
+        coin_ids: Sequence[str] | None = None,
+        end_date: datetime.date | None = None,
+        columns: Sequence[str] = (COIN_ID, DATE, COIN_PRICE),
     ):
         """
         Load historical data from a database.
 
+        Only the requested columns are read, streamed in chunks, see PostgresDb.read_columns.
+
         Parameters:
-        table (db_mappings.Base): Sqlalchemy declarative base.
-        start_date (datetime.date | None, Optional): Starting date for the historic data.
+        table (db_mappings.Base | None, Optional): Sqlalchemy declarative base. Defaults to
+            db_mappings.CoingeckoScrapedData.
+        start_date (datetime.date | None, Optional): Starting date for the historic data, included.
+            Defaults to None.
+        coin_ids (Sequence[str] | None, Optional): Coins to load. Defaults to every coin.
+        end_date (datetime.date | None, Optional): Last date for the historic data, included.
             Defaults to None.
+        columns (Sequence[str], Optional): Columns to load. Defaults to coin, date and price.
         """
-        # Create a SQLAlchemy connection
-        db = db_connection.PostgresDb()
-
-        # Create a session
-        with db.Session() as my_session:
-            # Query the data from the specified table
-            if start_date:
-                date_col = getattr(table, DATE)
+        from src.db_scripts import db_connection, db_mappings
 
-                data = my_session.query(table).filter(date_col > start_date).all()
-            else:
-                data = my_session.query(table).all()
+        if table is None:
+            table = db_mappings.CoingeckoScrapedData
 
-            # Convert data to pandas DataFrame
-            df = pd.DataFrame([row.__dict__ for row in data]).drop(columns=["_sa_instance_state"])
-
-            # Close the session
-            my_session.close()
+        # Create a SQLAlchemy connection
+        db = db_connection.PostgresDb()
 
-        return df
+        return db.read_columns(
+            table, columns, coin_ids=coin_ids, start_date=start_date, end_date=end_date
+        )
 
     def plot_time_series(
         self,
@@ -187,10 +340,9 @@ class ForecastingModel:
         if self.train_data is None:
             self.load_train_data()
 
-        data = self.train_data
+        from src.models import plots
 
-        # Set the Seaborn style
-        sns.set_theme(style="darkgrid")
+        data = self.train_data
 
         # Get coin types
         if coin_ids:
@@ -198,27 +350,7 @@ class ForecastingModel:
         else:
             coins = data[coin_col].unique()
 
-        # Plot one line plot for every coin type
-        _, ax = plt.subplots(figsize=(10, 6))
-
-        for coin in coins:
-            # Get data for the coin
-            coin_data = data[data[COIN_ID] == coin]
-
-            # Plot the time series
-            sns.lineplot(data=coin_data, x=date_col, y=price_col, label=coin, ax=ax)
-
-        # Format the plot
-        ax.set_title("Coin Price Over Time")
-        ax.set_xlabel(f"{' '.join(date_col.title().split('_'))}")
-        ax.set_ylabel(f"{' '.join(price_col.title().split('_'))}")
-        plt.xticks(rotation=45)
-
-        # Show legend
-        ax.legend()
-
-        # Show the plot
-        plt.show()
+        plots.plot_time_series(data, coins, date_col=date_col, price_col=price_col)
 
     def parallel_year_plot(self, coin_id: str, date_col: str = DATE, price_col: str = COIN_PRICE):
         """Plots coin value against time for each available year for a specific coin.
@@ -235,39 +367,14 @@ class ForecastingModel:
         if self.train_data is None:
             self.load_train_data()
 
+        from src.models import plots
+
         data = self.train_data
 
         # Extract coin data
         coin_data = data[data[COIN_ID] == coin_id]
 
-        # Get available years
-        years = coin_data[DATE].dt.year.unique()
-
-        # Set the Seaborn style
-        sns.set_theme(style="darkgrid")
-
-        # Plot one line plot for every year
-        _, ax = plt.subplots(figsize=(10, 6))
-
-        for year in years:
-            ax.plot(
-                coin_data.loc[coin_data["date"].dt.year == year, COIN_PRICE]
-                .squeeze()
-                .reset_index(drop=True),
-                label=year,
-            )
-
-        # Format the plot
-        ax.set_title(f"{coin_id.title()} Comparative Yearly Price")
-        ax.set_xlabel(f"{' '.join(date_col.title().split('_'))}")
-        ax.set_ylabel(f"{' '.join(price_col.title().split('_'))}")
-        plt.xticks(rotation=45)
-
-        # Show legend
-        ax.legend()
-
-        # Show the plot
-        plt.show()
+        plots.parallel_year_plot(coin_data, coin_id, date_col=date_col, price_col=price_col)
 
 
 class ARIMAModel(ForecastingModel):
@@ -276,19 +383,27 @@ class ARIMAModel(ForecastingModel):
         self.coin = coin_id
         self.fit_timestamp = None
         self.model = None
+        # Timestamp and number of observations of the last parameter estimation. Incremental
+        # updates only extend the model state, so they can differ from fit_timestamp and nobs
+        self.estimation_timestamp = None
+        self.estimation_nobs = None
+        self.estimator = ARIMAEstimators.MLE
 
-    def load_train_data(self, source: DataSources = DataSources.DATABASE, **kwargs):
+    def load_train_data(self, source: DataSources = DataSources.CACHE, **kwargs):
         """Load historical data for the forecasting model.
 
-        Passes arguments to parent class, then subsets data to the specific coin the child class
-        is initialized with.
+        Passes arguments to parent class, loading only the coin the child class is initialized
+        with unless other coin_ids are given, then subsets data to that coin.
 
         Args:
             source (DataSources, optional): Passed to the parent class load_train_data method.
         """
+        kwargs.setdefault("coin_ids", [self.coin])
         data = super().load_train_data(source, **kwargs)
 
-        coin_data = data[data[COIN_ID] == self.coin]
+        # Usually only this coin was loaded, and the data is kept without copying it
+        in_coin = data[COIN_ID] == self.coin
+        coin_data = data if in_coin.all() else data[in_coin]
 
         self.train_data = coin_data
 
@@ -305,16 +420,23 @@ class ARIMAModel(ForecastingModel):
         """
         super().parallel_year_plot(coin_id=self.coin, date_col=date_col, price_col=price_col)
 
-    def visualize_arima_params(self, lags: int = 90, diffs: int = 7, price_col: str = COIN_PRICE):
-        """Creates ACF, PACF and integration visualizations to help set ARIMA parameters.
+    def optimal_diff(self, diffs: int = 7, price_col: str = COIN_PRICE) -> int:
+        """Finds the differencing order making the price series most stationary.
+
+        Runs an augmented Dickey-Fuller test on the original series and its differences, and
+        picks the one with the lowest p-value.
 
         Args:
-            lags (int, optional): Number of lags to plot.
-            diffs (int, optional): Number of diff time series to plot.
+            diffs (int, optional): Number of diff time series to test.
             price_col (str, optional): The name of the column representing the price.
+
+        Returns:
+            int: Differencing order with the lowest ADF p-value.
         """
-        # # Find parameters for ARIMA model
-        # Find optimal diff for ARIMA
+        # Use train data, if not defined yet load from db
+        if self.train_data is None:
+            self.load_train_data()
+
         dfuller_results = []
 
         # Run dfuller for the original time series
@@ -326,28 +448,156 @@ class ARIMAModel(ForecastingModel):
             dfuller_p = adfuller(diff)[1]
             dfuller_results.append(dfuller_p)
 
-        optimal_diff = dfuller_results.index(min(dfuller_results))
+        return dfuller_results.index(min(dfuller_results))
+
+    def visualize_arima_params(self, lags: int = 90, diffs: int = 7, price_col: str = COIN_PRICE):
+        """Creates ACF, PACF and integration visualizations to help set ARIMA parameters.
+
+        Args:
+            lags (int, optional): Number of lags to plot.
+            diffs (int, optional): Number of diff time series to plot.
+            price_col (str, optional): The name of the column representing the price.
+        """
+        from src.models import plots
+
+        # # Find parameters for ARIMA model
+        # Find optimal diff for ARIMA
+        optimal_diff = self.optimal_diff(diffs=diffs, price_col=price_col)
 
         if optimal_diff == 0:
             diff = self.train_data[price_col]
         else:
             diff = self.train_data[price_col].diff(periods=optimal_diff).iloc[optimal_diff:]
 
-        _, ax = plt.subplots(1, 1, figsize=(10, 6))
-        plt.plot(diff)
-        ax.set_title(f"{optimal_diff} order differences for coin price series")
+        plots.plot_arima_params(diff, optimal_diff, lags=lags)
 
-        # Plot ACF and PACF
-        # Find the number of observations by taking the length of the returns DataFrame
-        nobs = len(diff)
+    def search_order(
+        self,
+        max_p: int = ARIMA_SEARCH_MAX_P,
+        max_q: int = ARIMA_SEARCH_MAX_Q,
+        seasonal_orders: Sequence[tuple[int, int, int, int]] = ARIMA_SEARCH_SEASONAL_ORDERS,
+        criterion: OrderCriteria = OrderCriteria.AIC,
+        train_test_split: float = 0.2,
+        max_diff: int = 2,
+        max_workers: int = TRAIN_MAX_WORKERS,
+        time_budget: float = ARIMA_SEARCH_TIME_BUDGET,
+        patience: int = ARIMA_SEARCH_PATIENCE,
+        save: bool = True,
+    ) -> pd.DataFrame:
+        """Selects the ARIMA order for the coin by fitting candidate orders in parallel.
+
+        The differencing order is the one found by `optimal_diff`. Candidate AR and MA orders and
+        seasonal orders are fitted in worker processes, simplest first, and ranked by criterion.
+        The search stops early once patience candidates in a row did not improve the best score,
+        or once time_budget seconds passed. Workers are terminated when the search stops, dropping
+        the candidates still running or not started yet, so no worker outlives the search.
 
-        # Compute the approximate confidence interval
-        conf = 1.96 / sqrt(nobs)
-        print("The approximate confidence interval is +/- %4.2f" % (conf))
+        Args:
+            max_p (int, optional): Maximum AR order. Defaults to ARIMA_SEARCH_MAX_P.
+            max_q (int, optional): Maximum MA order. Defaults to ARIMA_SEARCH_MAX_Q.
+            seasonal_orders (Sequence[tuple[int, int, int, int]], optional): Candidate seasonal
+                orders. Defaults to ARIMA_SEARCH_SEASONAL_ORDERS.
+            criterion (OrderCriteria, optional): Ranking criterion, AIC, BIC or RMSE over a
+                holdout. Defaults to OrderCriteria.AIC.
+            train_test_split (float, optional): Fraction of data held out for the RMSE
+                criterion. Defaults to 0.2.
+            max_diff (int, optional): Maximum differencing order. Defaults to 2.
+            max_workers (int, optional): Number of worker processes. Defaults to
+                TRAIN_MAX_WORKERS.
+            time_budget (float, optional): Seconds the candidate fits of the search may take,
+                including the worker startup. Fits still running then are terminated. Defaults to
+                ARIMA_SEARCH_TIME_BUDGET.
+            patience (int, optional): Number of candidates in a row without improvement after
+                which the search stops. Defaults to ARIMA_SEARCH_PATIENCE.
+            save (bool, optional): If True, saves the best order to ARIMA_ORDERS_FILE, where
+                train_forecasters.py reads it from. Defaults to True.
+
+        Raises:
+            ValueError: No candidate was fitted, either all failed or none finished in time.
+
+        Returns:
+            pd.DataFrame: Evaluated candidates sorted by score, best first.
+        """
+        if self.train_data is None:
+            self.load_train_data()
+
+        X = self.train_data[COIN_PRICE].values
+        holdout_size = int(len(X) * train_test_split)
+        d = min(self.optimal_diff(), max_diff)
+
+        # Simplest candidates first, so early stopping drops the slowest fits
+        candidates = sorted(
+            (
+                ((p, d, q), tuple(seasonal_order))
+                for p in range(max_p + 1)
+                for q in range(max_q + 1)
+                for seasonal_order in seasonal_orders
+            ),
+            key=lambda candidate: sum(candidate[0]) + sum(candidate[1][:3]),
+        )
+        logger.info(
+            f"Searching {len(candidates)} ARIMA orders for {self.coin} with d={d}, ranked by"
+            f" {criterion.value}"
+        )
+
+        deadline = time.monotonic() + time_budget
+        results = []
+        best_score = np.inf
+        without_improvement = 0
+
+        # Results and errors of the candidates, in completion order
+        finished: queue.SimpleQueue = queue.SimpleQueue()
+
+        # Spawn instead of fork, as in the trainer, so workers do not inherit the parent threads.
+        # Unlike an executor shutdown, leaving the pool terminates the fits still running
+        with multiprocessing.get_context("spawn").Pool(max_workers) as pool:
+            for order, seasonal_order in candidates:
+                pool.apply_async(
+                    evaluate_order,
+                    (X, order, seasonal_order, criterion, holdout_size),
+                    callback=finished.put,
+                    error_callback=finished.put,
+                )
+
+            for _ in candidates:
+                try:
+                    result = finished.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    logger.info(f"Time budget of {time_budget} seconds exhausted")
+                    break
+
+                if isinstance(result, BaseException):
+                    # evaluate_order reports fit errors itself, these are task errors
+                    logger.error(f"Order candidate failed for {self.coin}: {result!r}")
+                    continue
+
+                results.append(result)
+
+                if result["score"] < best_score:
+                    best_score = result["score"]
+                    without_improvement = 0
+                else:
+                    without_improvement += 1
+
+                if without_improvement >= patience:
+                    logger.info(f"No improvement in the last {patience} candidates, stopping")
+                    break
+
+        if not np.isfinite(best_score):
+            raise ValueError(f"No ARIMA order candidate was fitted for {self.coin}")
+
+        ranking = pd.DataFrame(results).sort_values("score", ignore_index=True)
+
+        best = ranking.iloc[0]
+        logger.info(
+            f"Best ARIMA order for {self.coin} out of {len(ranking)} candidates is"
+            f" {best['order']}x{best['seasonal_order']}, {criterion.value}={best['score']:.4f}"
+        )
+
+        if save:
+            save_order(self.coin, best["order"], best["seasonal_order"], criterion, best["score"])
 
-        # Plot the acf and pacf functions with 95% confidence intervals
-        plot_acf(diff, alpha=0.05, lags=lags)
-        plot_pacf(diff, alpha=0.05, lags=lags)
+        return ranking
 
     def fit(
         self,
@@ -357,6 +607,10 @@ class ARIMAModel(ForecastingModel):
         evaluate: bool = False,
         train_test_split: float = 0.2,
         alpha: float = 0.05,
+        max_horizon: int = FORECAST_MAX_HORIZON,
+        start_params: ArrayLike | None = None,
+        estimator: ARIMAEstimators = ARIMAEstimators.MLE,
+        save: bool = True,
     ) -> SARIMAXResultsWrapper:
         """Fits an ARIMA model for the coin_id with the current train data.
 
@@ -364,12 +618,28 @@ class ARIMAModel(ForecastingModel):
             order (tuple[int, int, int], Optional): Order for the ARIMA model.
             seasonal_order (tuple[int, int, int, int], optional): Seasonal order for the ARIMA
                 model. Defaults to (0, 0, 0, 0).
-            exog (ArrayLike | None, optional): Exogenous variables. Defaults to None.
+            exog (ArrayLike | None, optional): Exogenous variables, only None is supported, for
+                the constant exog of every model, see constant_exog. Defaults to None.
             evaluate (bool, optional): If True a train test split is performed and results over this
                 split are plotted. Otherwise the model is trained on the whole dataset. Defaults to
                 False.
             train_test_split (float, optional): Fraction of data to keep for test. Defaults to 0.2.
-            alpha (float, optional): Alpha for confidence interval plotting. Defaults to 0.05.
+            alpha (float, optional): Alpha for confidence interval plotting and for the
+                precomputed forecast table. Defaults to 0.05.
+            max_horizon (int, optional): Number of days to precompute forecasts for. The forecast
+                table is stored with the model. Defaults to FORECAST_MAX_HORIZON.
+            start_params (ArrayLike | None, optional): Starting values for the parameter
+                estimation, e.g. the parameters of a previous fit. Defaults to None, letting
+                statsmodels compute them.
+            estimator (ARIMAEstimators, optional): Parameter estimator. Exact maximum likelihood,
+                or the much faster Hannan-Rissanen approximation for non seasonal orders, which
+                ignores start_params. Defaults to ARIMAEstimators.MLE.
+            save (bool, optional): If True, the model is stored as a new version and promoted to
+                latest, so the API serves it and incremental trainings build on it. Pass False for
+                evaluation fits, e.g. on a prefix of the data before a backtest. Defaults to True.
+
+        Raises:
+            ValueError: exog must be None.
 
         Returns:
             SARIMAXResultsWrapper: A statsmodels trained ARIMA model.
@@ -380,9 +650,11 @@ class ARIMAModel(ForecastingModel):
 
         X = self.train_data[COIN_PRICE].values
 
-        # Set exogenous training variables to constant if no exog variables
-        if not exog:
-            exog = np.ones(len(X))
+        # Rebuild, update and forecast paths all assume the constant exog, so fitting another
+        # would silently be served as if it were constant
+        if exog is not None:
+            raise ValueError("Only the constant exog is supported, exog must be None")
+        exog = constant_exog(len(X))
 
         if evaluate:
             # Split train test
@@ -393,15 +665,14 @@ class ARIMAModel(ForecastingModel):
             exog_train, exog_test = exog[:size], exog[size:]
 
             # Train and forecast test
-            model = SARIMAX(X_train, exog_train, order=order, seasonal_order=seasonal_order)
-            model_fit = model.fit()
+            model_fit = estimate_sarimax(X_train, exog_train, order, seasonal_order, estimator)
             model_fit.summary()
 
             fcast_test = model_fit.get_forecast(test_size, exog=exog_test)
             predictions_test = list(fcast_test.predicted_mean)
 
             # Evaluate
-            rmse = sqrt(mean_squared_error(X_test, predictions_test))
+            rmse = sqrt(np.mean((X_test - np.asarray(predictions_test)) ** 2))
             pct_error = rmse / (X_test.mean())
             print(
                 "RMSE for test data:", rmse, "Average pct error for test data:", pct_error, sep="\n"
@@ -413,77 +684,330 @@ class ARIMAModel(ForecastingModel):
             upper_conf_test = list(pred_conf_int_test[:, 1])
 
             # Plot predictions
-            # Create x-axis values
-            x_train_ax = np.arange(len(X_train))
-            x_test_ax = np.arange(len(X_train), len(X_train) + len(X_test))
-
-            _, ax = plt.subplots(1, 1, figsize=(10, 6))
-            ax.plot(
-                x_train_ax,
-                X_train,
-                color="black",
-                linewidth=3,
-                marker=".",
-                markersize=5,
-                label="Train",
-            )
-            ax.plot(
-                x_test_ax,
-                X_test,
-                color="green",
-                linewidth=3,
-                marker=".",
-                markersize=5,
-                label="Test",
-            )
-            ax.plot(
-                x_test_ax,
-                predictions_test,
-                color="blue",
-                linewidth=3,
-                marker=".",
-                markersize=5,
-                label="Predict",
-            )
-            ax.plot(
-                x_test_ax,
-                lower_conf_test,
-                color="blue",
-                linestyle="dashed",
-                label=f"{(1-alpha)*100}% confidence interval",
+            from src.models import plots
+
+            plots.plot_test_forecast(
+                X_train, X_test, predictions_test, lower_conf_test, upper_conf_test, alpha=alpha
             )
-            ax.plot(x_test_ax, upper_conf_test, color="blue", linestyle="dashed")
-            ax.legend()
-            plt.ylim(0, 1.3 * max(upper_conf_test))
-            plt.show()
 
         # Re train with full data
-        model = SARIMAX(X, exog, order=order, seasonal_order=seasonal_order)
-        model_fit = model.fit()
+        model_fit = estimate_sarimax(
+            X, exog, order, seasonal_order, estimator, start_params=start_params
+        )
 
-        self.fit_timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+        self.fit_timestamp = datetime.datetime.now().strftime(FIT_TIMESTAMP_FORMAT)
         self.model = model_fit
+        self.estimator = estimator
+        self.estimation_timestamp = self.fit_timestamp
+        self.estimation_nobs = len(X)
+
+        if save:
+            self._save(order, seasonal_order, alpha=alpha, max_horizon=max_horizon)
+
+        return model_fit
+
+    def _save(
+        self,
+        order: tuple[int, int, int],
+        seasonal_order: tuple[int, int, int, int],
+        alpha: float = 0.05,
+        max_horizon: int = FORECAST_MAX_HORIZON,
+        store: ArtifactStore | None = None,
+    ):
+        """Stores the model artifacts as a new version, then promotes it to latest.
+
+        Artifacts are the fitted parameters and train data snapshot, both compressed, from which
+        the model is rebuilt by from_version, and the forecast table and serving model loaded by
+        the API. The version is indexed in the store manifest with its orders, fit times and fit
+        metrics.
 
-        # Save instance of class with trained model in historic models dir
-        model_name = (
-            f"{self.coin}_ARIMA_{'.'.join(list([str(o) for o in order]))}_"
-            f"{'.'.join(list([str(o) for o in seasonal_order]))}"
+        Args:
+            order (tuple[int, int, int]): Order of the fitted ARIMA model.
+            seasonal_order (tuple[int, int, int, int]): Seasonal order of the fitted ARIMA model.
+            alpha (float, optional): Alpha for the forecast table confidence intervals.
+            max_horizon (int, optional): Number of days to precompute forecasts for.
+            store (ArtifactStore | None, optional): Store to save to. Defaults to the store in
+                MODELS_FORECASTING.
+        """
+        store = store or ArtifactStore()
+        model_name = _model_name(self.coin, order, seasonal_order)
+        dates = self.train_data[DATE].values.astype("datetime64[D]")
+
+        artifacts = {
+            "params": store.put_arrays(params=np.asarray(self.model.params)),
+            # Shared by every version fitted on the same data, e.g. with other orders
+            "train_data": store.put_arrays(dates=dates, prices=self.train_data[COIN_PRICE].values),
+        }
+
+        # Precompute forecasts so they can be served as lookups
+        table_path = store.temporary_path()
+        self.forecast_table(max_horizon=max_horizon, alpha=alpha).save(table_path)
+        artifacts["forecast_table"] = store.put_file(table_path)
+
+        # Save the slim artifact loaded by the API
+        serving_path = store.temporary_path()
+        self.serving_model().save(serving_path)
+        artifacts["serving_model"] = store.put_file(serving_path)
+
+        store.add_version(
+            {
+                "version": f"{model_name}_{self.fit_timestamp}",
+                "coin_id": self.coin,
+                "model_name": model_name,
+                "model_type": "ARIMA",
+                "order": list(order),
+                "seasonal_order": list(seasonal_order),
+                "estimator": self.estimator.value,
+                "fit_timestamp": self.fit_timestamp,
+                "estimation_timestamp": self.estimation_timestamp,
+                "estimation_nobs": self.estimation_nobs,
+                "train_start_date": str(dates[0]),
+                "train_end_date": str(dates[-1]),
+                "metrics": {
+                    "nobs": int(self.model.nobs),
+                    "llf": float(self.model.llf),
+                    "aic": float(self.model.aic),
+                    "bic": float(self.model.bic),
+                },
+                "artifacts": artifacts,
+            }
+        )
+
+    @classmethod
+    def from_version(cls, version: dict, store: ArtifactStore | None = None) -> "ARIMAModel":
+        """Rebuilds a model stored by fit or update.
+
+        Args:
+            version (dict): Version from the store manifest.
+            store (ArtifactStore | None, optional): Store holding the version. Defaults to the
+                store in MODELS_FORECASTING.
+
+        Returns:
+            ARIMAModel: The fitted model.
+        """
+        store = store or ArtifactStore()
+        train_data = store.load_arrays(version["artifacts"]["train_data"])
+        params = store.load_arrays(version["artifacts"]["params"])["params"]
+
+        model = cls(coin_id=version["coin_id"])
+        model.train_data = pd.DataFrame(
+            {
+                COIN_ID: version["coin_id"],
+                DATE: pd.to_datetime(train_data["dates"]),
+                COIN_PRICE: train_data["prices"],
+            }
         )
-        history_path = MODELS_FORECASTING_HISTORY / (model_name + f"_{self.fit_timestamp}.pickle")
-        logger.info(f"Model saved to {history_path}")
 
-        with history_path.open("wb") as file:
-            pickle.dump(self, file)
+        # A filter pass with the stored parameters rebuilds the fitted results
+        X = train_data["prices"]
+        model.model = SARIMAX(
+            X,
+            constant_exog(len(X)),
+            order=tuple(version["order"]),
+            seasonal_order=tuple(version["seasonal_order"]),
+        ).filter(params)
+
+        model.fit_timestamp = version["fit_timestamp"]
+        model.estimation_timestamp = version["estimation_timestamp"]
+        model.estimation_nobs = version["estimation_nobs"]
+        model.estimator = ARIMAEstimators(version["estimator"])
+
+        return model
+
+    @classmethod
+    def load_latest(
+        cls,
+        coin_id: str,
+        order: tuple[int, int, int] = ARIMA_DEAFULT_ORDER,
+        seasonal_order: tuple[int, int, int, int] = (0, 0, 0, 0),
+        store: ArtifactStore | None = None,
+    ) -> "ARIMAModel | None":
+        """Loads the latest stored model for coin_id with the given orders.
+
+        Args:
+            coin_id (str): Coin the model was trained for.
+            order (tuple[int, int, int], optional): Order of the ARIMA model.
+            seasonal_order (tuple[int, int, int, int], optional): Seasonal order of the ARIMA
+                model. Defaults to (0, 0, 0, 0).
+            store (ArtifactStore | None, optional): Store to load from. Defaults to the store in
+                MODELS_FORECASTING.
 
-        # Symlink to current model dir
-        current_path = MODELS_FORECASTING / (model_name + "_latest.pickle")
-        current_path.unlink(missing_ok=True)
-        current_path.symlink_to(history_path)
+        Returns:
+            ARIMAModel | None: The latest model, None if no model was stored yet.
+        """
+        store = store or ArtifactStore()
+        version = store.latest(_model_name(coin_id, order, seasonal_order))
+
+        if version is None:
+            return None
+
+        return cls.from_version(version, store)
+
+    def update(
+        self,
+        previous: "ARIMAModel",
+        full_refit_days: int = ARIMA_FULL_REFIT_DAYS,
+        llf_tolerance: float = ARIMA_REFIT_LLF_TOLERANCE,
+        alpha: float = 0.05,
+        max_horizon: int = FORECAST_MAX_HORIZON,
+        estimator: ARIMAEstimators | None = None,
+    ) -> SARIMAXResultsWrapper:
+        """Updates a previously fitted model with the current train data.
+
+        New observations are appended to the previous results, extending the model state without
+        estimating the parameters again, which only costs one Kalman filter pass. Parameters are
+        estimated again, starting from the previous ones, when:
+
+        - the previous parameters were estimated more than full_refit_days ago,
+        - the current train data does not extend the previous one, e.g. past prices were
+          corrected,
+        - or the average log likelihood of the observations added since the last estimation is
+          worse than the one of the estimation sample by more than llf_tolerance.
+
+        Args:
+            previous (ARIMAModel): Previously fitted model for the same coin.
+            full_refit_days (int, optional): Maximum days between parameter estimations. Defaults
+                to ARIMA_FULL_REFIT_DAYS.
+            llf_tolerance (float, optional): Allowed drop of the average log likelihood per
+                observation. Defaults to ARIMA_REFIT_LLF_TOLERANCE.
+            alpha (float, optional): Alpha for the forecast table. Defaults to 0.05.
+            max_horizon (int, optional): Number of days to precompute forecasts for. Defaults to
+                FORECAST_MAX_HORIZON.
+            estimator (ARIMAEstimators | None, optional): Estimator used when parameters are
+                estimated again. Defaults to None, using the estimator of the previous model.
+
+        Returns:
+            SARIMAXResultsWrapper: The updated statsmodels ARIMA model.
+        """
+        if self.train_data is None:
+            self.load_train_data()
+
+        order = previous.model.model.order
+        seasonal_order = previous.model.model.seasonal_order
+        if estimator is None:
+            estimator = getattr(previous, "estimator", ARIMAEstimators.MLE)
+
+        def refit(reason: str) -> SARIMAXResultsWrapper:
+            logger.info(f"Estimating {self.coin} model parameters again, {reason}")
+            return self.fit(
+                order=order,
+                seasonal_order=seasonal_order,
+                alpha=alpha,
+                max_horizon=max_horizon,
+                start_params=previous.model.params,
+                estimator=estimator,
+            )
+
+        estimation_age = datetime.datetime.now() - datetime.datetime.strptime(
+            previous.estimation_timestamp, FIT_TIMESTAMP_FORMAT
+        )
+        if estimation_age > datetime.timedelta(days=full_refit_days):
+            return refit(f"last estimation is {estimation_age.days} days old")
+
+        # Check the previous data is unchanged and new data only adds later dates
+        previous_prices = previous.train_data[COIN_PRICE].values
+        current_prices = self.train_data[COIN_PRICE].values
+        previous_end_date = previous.train_data[DATE].max()
+
+        if (
+            len(current_prices) < len(previous_prices)
+            or self.train_data[DATE].iloc[len(previous_prices) - 1] != previous_end_date
+            or not np.allclose(current_prices[: len(previous_prices)], previous_prices)
+        ):
+            return refit("train data does not extend the previous train data")
+
+        new_prices = current_prices[len(previous_prices) :]
+        if len(new_prices) == 0:
+            logger.info(f"No new data for {self.coin} since {previous_end_date}, keeping model")
+            self.fit_timestamp = previous.fit_timestamp
+            self.model = previous.model
+            self.estimation_timestamp = previous.estimation_timestamp
+            self.estimation_nobs = previous.estimation_nobs
+            self.estimator = getattr(previous, "estimator", ARIMAEstimators.MLE)
+            return self.model
+
+        model_fit = previous.model.append(new_prices, exog=constant_exog(len(new_prices)))
+
+        # Compare the fit of observations added since the last estimation to the estimation ones
+        llf_obs = model_fit.llf_obs
+        estimation_llf = llf_obs[model_fit.loglikelihood_burn : previous.estimation_nobs].mean()
+        appended_llf = llf_obs[previous.estimation_nobs :].mean()
+
+        if appended_llf < estimation_llf - llf_tolerance:
+            return refit(
+                f"average log likelihood dropped from {estimation_llf:.3f} to {appended_llf:.3f}"
+            )
+
+        logger.info(f"Appended {len(new_prices)} observations to {self.coin} model")
+
+        self.fit_timestamp = datetime.datetime.now().strftime(FIT_TIMESTAMP_FORMAT)
+        self.model = model_fit
+        self.estimation_timestamp = previous.estimation_timestamp
+        self.estimation_nobs = previous.estimation_nobs
+        self.estimator = getattr(previous, "estimator", ARIMAEstimators.MLE)
+
+        self._save(order, seasonal_order, alpha=alpha, max_horizon=max_horizon)
 
         return model_fit
 
-    def forecast(self, target_date: datetime.date) -> Mapping[datetime.date, float]:
-        """Generates coin price forecasts for every date until given target_date.
+    def forecast_from_origins(
+        self, origins: Sequence[int], num_forecast_days: int, max_workers: int = 1
+    ) -> np.ndarray:
+        """Forecasts from several origins in the train data, with the fitted parameters.
+
+        The filtered states at every origin come from the Kalman filter pass of the fit, so no
+        origin is fitted again. Train data added after the fit is appended to the results, which
+        advances the filter over the new observations with the same parameters. Forecasts are
+        then vectorized over origins, split in chunks across worker processes if max_workers is
+        greater than one.
+
+        Args:
+            origins (Sequence[int]): Positions in the train data of the last observation of each
+                origin.
+            num_forecast_days (int): Number of days to forecast from each origin.
+            max_workers (int, optional): Number of worker processes. Defaults to 1.
+
+        Raises:
+            ValueError: Model must be trained prior to forecast.
+
+        Returns:
+            np.ndarray: Forecasts of shape (len(origins), num_forecast_days).
+        """
+        if not self.model:
+            raise ValueError("Model needs to be fitted before forecasting.")
+
+        model_fit = self.model
+        new_prices = self.train_data[COIN_PRICE].values[int(model_fit.nobs) :]
+        if len(new_prices):
+            model_fit = model_fit.append(new_prices, exog=constant_exog(len(new_prices)))
+
+        # Predicted state for the day after each origin
+        states = model_fit.filter_results.predicted_state[:, np.asarray(origins) + 1].T
+        serving_model = ServingModel.from_results(
+            coin_id=self.coin,
+            fit_timestamp=self.fit_timestamp,
+            start_date=self.train_data[DATE].max().date(),
+            results=model_fit,
+        )
+
+        if max_workers <= 1:
+            return forecast_from_states(serving_model, states, num_forecast_days)
+
+        # Spawn instead of fork, as in the trainer, so workers do not inherit the parent threads
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            chunks = executor.map(
+                forecast_from_states,
+                [serving_model] * max_workers,
+                np.array_split(states, max_workers),
+                [num_forecast_days] * max_workers,
+            )
+
+            return np.concatenate(list(chunks))
+
+    def forecast_horizon(self, target_date: datetime.date) -> int:
+        """Computes the number of days between the last train date and the given target_date.
 
         Args:
             target_date (datetime.date): Target date to predict.
@@ -493,8 +1017,7 @@ class ARIMAModel(ForecastingModel):
             ValueError: Target date must be greater than train date.
 
         Returns:
-            Mapping[datetime.date, float]: A Mapping from date to price prediction for range of
-                dates from fitted day plus one to target date.
+            int: Number of days to forecast in order to reach target_date.
         """
         # Use latest date in the train data as starting point for forecast
         if self.model:
@@ -507,16 +1030,136 @@ class ARIMAModel(ForecastingModel):
         if target_date <= start_date:
             raise ValueError("Target date must be greater than fit date")
 
+        return (target_date - start_date).days
+
+    def forecast_dates(self, num_forecast_days: int) -> list[datetime.date]:
+        """Builds the list of forecasted dates, from the last train date plus one onwards.
+
+        Args:
+            num_forecast_days (int): Number of days to forecast.
+
+        Returns:
+            list[datetime.date]: Dates matching each forecasted step.
+        """
+        start_date = self.train_data[DATE].max().date()
+
+        return [start_date + datetime.timedelta(days=i) for i in range(1, num_forecast_days + 1)]
+
+    def forecast_mean(self, num_forecast_days: int) -> np.ndarray:
+        """Forecasts coin prices for the given number of days after the last train date.
+
+        Args:
+            num_forecast_days (int): Number of days to forecast.
+
+        Returns:
+            np.ndarray: Forecasted prices, one per forecasted day.
+        """
+        return np.asarray(
+            self.model.get_forecast(
+                num_forecast_days,
+                exog=constant_exog(num_forecast_days),
+            ).predicted_mean
+        )
+
+    def forecast_quantiles(
+        self, target_date: datetime.date, quantiles: Sequence[float] = FORECAST_QUANTILES
+    ) -> pd.DataFrame:
+        """Forecasts several price quantiles for every date until target_date in one pass.
+
+        Quantiles are computed from the forecast means and variances all at once, instead of
+        calling `conf_int` once per alpha.
+
+        Args:
+            target_date (datetime.date): Target date to predict.
+            quantiles (Sequence[float], optional): Quantiles to compute, each between 0 and 1.
+                Defaults to FORECAST_QUANTILES.
+
+        Returns:
+            pd.DataFrame: Forecasted quantiles, indexed by date with one column per quantile.
+        """
+        num_forecast_days = self.forecast_horizon(target_date)
+
+        fcast = self.model.get_forecast(num_forecast_days, exog=constant_exog(num_forecast_days))
+        forecasted_quantiles = normal_quantiles(
+            np.asarray(fcast.predicted_mean), np.asarray(fcast.var_pred_mean), quantiles
+        )
+
+        return pd.DataFrame(
+            forecasted_quantiles,
+            index=self.forecast_dates(num_forecast_days),
+            columns=list(quantiles),
+        )
+
+    def forecast_table(
+        self, max_horizon: int = FORECAST_MAX_HORIZON, alpha: float = 0.05
+    ) -> ForecastTable:
+        """Precomputes forecasts and confidence intervals up to max_horizon days.
+
+        Args:
+            max_horizon (int, optional): Number of days to forecast. Defaults to
+                FORECAST_MAX_HORIZON.
+            alpha (float, optional): Alpha for the confidence intervals. Defaults to 0.05.
+
+        Raises:
+            ValueError: Model must be trained prior to forecast.
+
+        Returns:
+            ForecastTable: Forecasts for every day from the last train date plus one onwards.
+        """
+        if not self.model:
+            raise ValueError("Model needs to be fitted before forecasting.")
+
+        fcast = self.model.get_forecast(max_horizon, exog=constant_exog(max_horizon))
+        conf_int = np.asarray(fcast.conf_int(alpha=alpha))
+
+        return ForecastTable(
+            coin_id=self.coin,
+            fit_timestamp=self.fit_timestamp,
+            start_date=self.train_data[DATE].max().date(),
+            mean=np.asarray(fcast.predicted_mean),
+            lower=conf_int[:, 0],
+            upper=conf_int[:, 1],
+            alpha=alpha,
+            var=np.asarray(fcast.var_pred_mean),
+        )
+
+    def serving_model(self) -> ServingModel:
+        """Extracts the slim serving artifact of the fitted model.
+
+        Raises:
+            ValueError: Model must be trained prior to extraction.
+
+        Returns:
+            ServingModel: Model holding only what is needed to forecast.
+        """
+        if not self.model:
+            raise ValueError("Model needs to be fitted before extracting a serving model.")
+
+        return ServingModel.from_results(
+            coin_id=self.coin,
+            fit_timestamp=self.fit_timestamp,
+            start_date=self.train_data[DATE].max().date(),
+            results=self.model,
+        )
+
+    def forecast(self, target_date: datetime.date) -> Mapping[datetime.date, float]:
+        """Generates coin price forecasts for every date until given target_date.
+
+        Args:
+            target_date (datetime.date): Target date to predict.
+
+        Raises:
+            ValueError: Model must be trained prior to forecast.
+            ValueError: Target date must be greater than train date.
+
+        Returns:
+            Mapping[datetime.date, float]: A Mapping from date to price prediction for range of
+                dates from fitted day plus one to target date.
+        """
         # Forecast coin prices for dates from start_date to target_date
-        num_forecast_days = (target_date - start_date).days
-        date_range = [
-            start_date + datetime.timedelta(days=i) for i in range(1, num_forecast_days + 1)
-        ]
-
-        forecasted_prices = self.model.get_forecast(
-            # TODO: Add logic for exog management
-            num_forecast_days,
-            exog=[1] * num_forecast_days,
-        ).predicted_mean
+        num_forecast_days = self.forecast_horizon(target_date)
+        date_range = self.forecast_dates(num_forecast_days)
+
+        forecasted_prices = self.forecast_mean(num_forecast_days)
 
         return {date: forecast for date, forecast in zip(date_range, forecasted_prices)}
@@ -0,0 +1,127 @@
+"""
+Defines helpers of the automatic ARIMA order search: candidate evaluation, run in worker processes,
+and persistence of the selected orders read by train_forecasters.py.
+"""
+
+import datetime
+import json
+import time
+import warnings
+from enum import Enum
+from math import sqrt
+from pathlib import Path
+
+import numpy as np
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from src.constants import ARIMA_ORDERS_FILE
+from src.models.serving_model import constant_exog
+
+
+class OrderCriteria(str, Enum):
+    AIC = "aic"
+    BIC = "bic"
+    RMSE = "rmse"
+
+
+def evaluate_order(
+    X: np.ndarray,
+    order: tuple[int, int, int],
+    seasonal_order: tuple[int, int, int, int],
+    criterion: OrderCriteria,
+    holdout_size: int,
+    maxiter: int = 50,
+) -> dict:
+    """Fits one candidate order and scores it. Runs inside a worker process.
+
+    Args:
+        X (np.ndarray): Prices to fit.
+        order (tuple[int, int, int]): Candidate order.
+        seasonal_order (tuple[int, int, int, int]): Candidate seasonal order.
+        criterion (OrderCriteria): Score to compute. AIC and BIC are computed on the whole
+            series, RMSE on the last holdout_size prices, forecasted by a fit on the others.
+        holdout_size (int): Number of prices held out for the RMSE.
+        maxiter (int, optional): Maximum optimizer iterations. Defaults to 50.
+
+    Returns:
+        dict: Candidate orders, score (lower is better), fit seconds and error, if any.
+    """
+    result = {"order": order, "seasonal_order": seasonal_order, "score": np.inf, "error": None}
+    start = time.perf_counter()
+
+    if criterion == OrderCriteria.RMSE:
+        X_train, X_test = X[:-holdout_size], X[-holdout_size:]
+    else:
+        X_train, X_test = X, None
+
+    try:
+        with warnings.catch_warnings():
+            # Convergence warnings are expected for poor candidates, which score badly anyway
+            warnings.simplefilter("ignore")
+
+            model = SARIMAX(
+                X_train, constant_exog(len(X_train)), order=order, seasonal_order=seasonal_order
+            )
+            model_fit = model.fit(disp=False, maxiter=maxiter)
+
+        if criterion == OrderCriteria.RMSE:
+            predictions = model_fit.forecast(holdout_size, exog=constant_exog(holdout_size))
+            result["score"] = sqrt(np.mean((X_test - np.asarray(predictions)) ** 2))
+        else:
+            result["score"] = float(getattr(model_fit, criterion.value))
+    except Exception as error:
+        result["error"] = repr(error)
+
+    result["fit_seconds"] = time.perf_counter() - start
+
+    return result
+
+
+def load_orders(path: Path = ARIMA_ORDERS_FILE) -> dict[str, dict]:
+    """Reads the orders selected for every coin.
+
+    Args:
+        path (Path, optional): Orders file. Defaults to ARIMA_ORDERS_FILE.
+
+    Returns:
+        dict[str, dict]: Selected order, seasonal order and search details by coin. Empty if no
+            search was saved yet.
+    """
+    if not path.exists():
+        return {}
+
+    return json.loads(path.read_text())
+
+
+def save_order(
+    coin_id: str,
+    order: tuple[int, int, int],
+    seasonal_order: tuple[int, int, int, int],
+    criterion: OrderCriteria,
+    score: float,
+    path: Path = ARIMA_ORDERS_FILE,
+):
+    """Stores the order selected for coin_id, keeping the ones of other coins.
+
+    The file is replaced atomically, so trainers never read it half written.
+
+    Args:
+        coin_id (str): Coin the order was selected for.
+        order (tuple[int, int, int]): Selected order.
+        seasonal_order (tuple[int, int, int, int]): Selected seasonal order.
+        criterion (OrderCriteria): Criterion the order was selected by.
+        score (float): Score of the selected order.
+        path (Path, optional): Orders file. Defaults to ARIMA_ORDERS_FILE.
+    """
+    orders = load_orders(path)
+    orders[coin_id] = {
+        "order": list(order),
+        "seasonal_order": list(seasonal_order),
+        "criterion": criterion.value,
+        "score": score,
+        "searched_at": datetime.datetime.now().isoformat(),
+    }
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(orders, indent=2))
+    tmp_path.replace(path)
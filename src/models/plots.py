@@ -0,0 +1,186 @@
+"""
+Defines the plots used to explore and evaluate the forecasting models.
+
+Plotting libraries are heavy to import and unneeded to train or serve models, so this module is
+only imported lazily by the plotting methods in src.models.forecasters.
+"""
+
+from math import sqrt
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from numpy.typing import ArrayLike
+from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+
+
+def plot_time_series(
+    data: pd.DataFrame,
+    coins: ArrayLike,
+    date_col: str = DATE,
+    price_col: str = COIN_PRICE,
+):
+    """Plots one price time series per coin.
+
+    Args:
+        data (pd.DataFrame): Data for every coin to plot.
+        coins (ArrayLike): Name of the coins to plot.
+        date_col (str, Optional): The name of the column representing the date.
+        price_col (str, Optional): The name of the column representing the price.
+    """
+    # Set the Seaborn style
+    sns.set_theme(style="darkgrid")
+
+    # Plot one line plot for every coin type
+    _, ax = plt.subplots(figsize=(10, 6))
+
+    for coin in coins:
+        # Get data for the coin
+        coin_data = data[data[COIN_ID] == coin]
+
+        # Plot the time series
+        sns.lineplot(data=coin_data, x=date_col, y=price_col, label=coin, ax=ax)
+
+    # Format the plot
+    ax.set_title("Coin Price Over Time")
+    ax.set_xlabel(f"{' '.join(date_col.title().split('_'))}")
+    ax.set_ylabel(f"{' '.join(price_col.title().split('_'))}")
+    plt.xticks(rotation=45)
+
+    # Show legend
+    ax.legend()
+
+    # Show the plot
+    plt.show()
+
+
+def parallel_year_plot(
+    coin_data: pd.DataFrame, coin_id: str, date_col: str = DATE, price_col: str = COIN_PRICE
+):
+    """Plots coin value against time for each available year for a specific coin.
+
+    Args:
+        coin_data (pd.DataFrame): Data for the coin to plot.
+        coin_id (str): Name of the coin to analyze
+        date_col (str, optional): The name of the column representing the date.
+        price_col (str, optional): The name of the column representing the price.
+    """
+    # Get available years
+    years = coin_data[DATE].dt.year.unique()
+
+    # Set the Seaborn style
+    sns.set_theme(style="darkgrid")
+
+    # Plot one line plot for every year
+    _, ax = plt.subplots(figsize=(10, 6))
+
+    for year in years:
+        ax.plot(
+            coin_data.loc[coin_data["date"].dt.year == year, COIN_PRICE]
+            .squeeze()
+            .reset_index(drop=True),
+            label=year,
+        )
+
+    # Format the plot
+    ax.set_title(f"{coin_id.title()} Comparative Yearly Price")
+    ax.set_xlabel(f"{' '.join(date_col.title().split('_'))}")
+    ax.set_ylabel(f"{' '.join(price_col.title().split('_'))}")
+    plt.xticks(rotation=45)
+
+    # Show legend
+    ax.legend()
+
+    # Show the plot
+    plt.show()
+
+
+def plot_arima_params(diff: pd.Series, optimal_diff: int, lags: int = 90):
+    """Plots the differenced price series with its ACF and PACF.
+
+    Args:
+        diff (pd.Series): Price series differenced optimal_diff times.
+        optimal_diff (int): Order of the differences.
+        lags (int, optional): Number of lags to plot.
+    """
+    _, ax = plt.subplots(1, 1, figsize=(10, 6))
+    plt.plot(diff)
+    ax.set_title(f"{optimal_diff} order differences for coin price series")
+
+    # Plot ACF and PACF
+    # Find the number of observations by taking the length of the returns DataFrame
+    nobs = len(diff)
+
+    # Compute the approximate confidence interval
+    conf = 1.96 / sqrt(nobs)
+    print("The approximate confidence interval is +/- %4.2f" % (conf))
+
+    # Plot the acf and pacf functions with 95% confidence intervals
+    plot_acf(diff, alpha=0.05, lags=lags)
+    plot_pacf(diff, alpha=0.05, lags=lags)
+
+
+def plot_test_forecast(
+    X_train: ArrayLike,
+    X_test: ArrayLike,
+    predictions_test: ArrayLike,
+    lower_conf_test: ArrayLike,
+    upper_conf_test: ArrayLike,
+    alpha: float = 0.05,
+):
+    """Plots train and test data against test forecasts and their confidence interval.
+
+    Args:
+        X_train (ArrayLike): Train prices.
+        X_test (ArrayLike): Test prices.
+        predictions_test (ArrayLike): Forecasted test prices.
+        lower_conf_test (ArrayLike): Lower bound of the forecast confidence interval.
+        upper_conf_test (ArrayLike): Upper bound of the forecast confidence interval.
+        alpha (float, optional): Alpha of the confidence interval. Defaults to 0.05.
+    """
+    # Create x-axis values
+    x_train_ax = np.arange(len(X_train))
+    x_test_ax = np.arange(len(X_train), len(X_train) + len(X_test))
+
+    _, ax = plt.subplots(1, 1, figsize=(10, 6))
+    ax.plot(
+        x_train_ax,
+        X_train,
+        color="black",
+        linewidth=3,
+        marker=".",
+        markersize=5,
+        label="Train",
+    )
+    ax.plot(
+        x_test_ax,
+        X_test,
+        color="green",
+        linewidth=3,
+        marker=".",
+        markersize=5,
+        label="Test",
+    )
+    ax.plot(
+        x_test_ax,
+        predictions_test,
+        color="blue",
+        linewidth=3,
+        marker=".",
+        markersize=5,
+        label="Predict",
+    )
+    ax.plot(
+        x_test_ax,
+        lower_conf_test,
+        color="blue",
+        linestyle="dashed",
+        label=f"{(1-alpha)*100}% confidence interval",
+    )
+    ax.plot(x_test_ax, upper_conf_test, color="blue", linestyle="dashed")
+    ax.legend()
+    plt.ylim(0, 1.3 * max(upper_conf_test))
+    plt.show()
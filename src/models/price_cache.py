@@ -0,0 +1,277 @@
+"""
+Defines the local snapshot of the scraped price history used to load training data.
+
+Each coin's history is a single .npy file of (date, price) records sorted by date, which is memory
+mapped on load, so only the requested date range is read from disk. Refreshing the snapshot asks
+the database for per coin aggregates, then only fetches the days past the cached ones plus a
+correction window, so late corrections to recent prices are applied. Coins whose merged history
+still does not match the database aggregates, e.g. corrected further back, are fetched again in
+full.
+"""
+
+import datetime
+import os
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (
+    COIN_ID,
+    COIN_PRICE,
+    DATE,
+    PRICE_CACHE,
+    PRICE_CACHE_CORRECTION_DAYS,
+)
+from src.logger_definition import get_logger
+
+# NOTE: The database modules are imported lazily, so cached data can be read without the ORM stack
+if TYPE_CHECKING:
+    from src.db_scripts import db_connection
+
+logger = get_logger(__file__)
+
+# Record layout of the cache files
+PRICE_RECORD = np.dtype([("date", "datetime64[D]"), ("price", "float64")])
+
+
+class PriceCache:
+    """Per coin snapshot of the coingecko_scraped_data prices, refreshed incrementally.
+
+    Args:
+        root (Path, optional): Directory holding the cache files. Defaults to PRICE_CACHE.
+        correction_days (int, optional): Number of cached days fetched again on every refresh,
+            to pick up late corrections. Defaults to PRICE_CACHE_CORRECTION_DAYS.
+    """
+
+    def __init__(
+        self, root: Path = PRICE_CACHE, correction_days: int = PRICE_CACHE_CORRECTION_DAYS
+    ):
+        self.root = root
+        self.correction_days = correction_days
+
+    def coin_path(self, coin_id: str) -> Path:
+        """Path of the cache file of coin_id."""
+        return self.root / f"{coin_id}.npy"
+
+    def coins(self) -> list[str]:
+        """Lists the cached coins."""
+        return sorted(path.stem for path in self.root.glob("*.npy"))
+
+    def read(self, coin_id: str) -> np.ndarray | None:
+        """Memory maps the cached records of coin_id.
+
+        Args:
+            coin_id (str): Coin to read.
+
+        Returns:
+            np.ndarray | None: Read only records sorted by date, None if the coin is not cached.
+        """
+        path = self.coin_path(coin_id)
+
+        if not path.exists():
+            return None
+
+        return np.load(path, mmap_mode="r")
+
+    def write(self, coin_id: str, records: np.ndarray):
+        """Atomically replaces the cached records of coin_id.
+
+        Readers holding a memory map of the previous file keep reading it until they are done.
+
+        Args:
+            coin_id (str): Coin to write.
+            records (np.ndarray): Records sorted by date, with PRICE_RECORD dtype.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+
+        with os.fdopen(handle, "wb") as file:
+            np.save(file, records)
+        os.replace(tmp_path, self.coin_path(coin_id))
+
+    def load(
+        self,
+        coin_ids: Sequence[str] | None = None,
+        start_date: datetime.date | None = None,
+        refresh: bool = True,
+    ) -> pd.DataFrame:
+        """Loads prices from the cache, refreshing it from the database first.
+
+        Args:
+            coin_ids (Sequence[str] | None, optional): Coins to load. Defaults to every coin.
+            start_date (datetime.date | None, optional): Only load prices from this date, included.
+                Defaults to None.
+            refresh (bool, optional): If False, the database is not queried and the cache is read
+                as it is. Defaults to True.
+
+        Returns:
+            pd.DataFrame: Coin, date and price columns, sorted by date within each coin.
+        """
+        if refresh:
+            self.refresh(coin_ids)
+
+        frames = []
+        for coin_id in coin_ids or self.coins():
+            records = self.read(coin_id)
+
+            if records is None:
+                continue
+
+            if start_date:
+                # Records are sorted by date, so the range is found without scanning the file
+                start = np.searchsorted(records["date"], np.datetime64(start_date, "D"), "left")
+                records = records[start:]
+
+            frames.append(
+                pd.DataFrame(
+                    {
+                        COIN_ID: coin_id,
+                        DATE: pd.to_datetime(records["date"]),
+                        COIN_PRICE: records["price"],
+                    }
+                )
+            )
+
+        if not frames:
+            return pd.DataFrame(columns=[COIN_ID, DATE, COIN_PRICE])
+
+        return pd.concat(frames, ignore_index=True)
+
+    def refresh(self, coin_ids: Sequence[str] | None = None) -> dict[str, str]:
+        """Brings the cache up to date with the database.
+
+        Args:
+            coin_ids (Sequence[str] | None, optional): Coins to refresh. Defaults to every coin.
+
+        Returns:
+            dict[str, str]: Refresh status by coin: "unchanged", "updated" with the new and
+                corrected days, "reloaded" from scratch or "removed" from the database.
+        """
+        from src.db_scripts import db_connection
+
+        db = db_connection.PostgresDb()
+        stats = self._fetch_stats(db, coin_ids)
+        status = {}
+
+        for coin_id in set(coin_ids or self.coins()) - set(stats):
+            if self.coin_path(coin_id).exists():
+                self.coin_path(coin_id).unlink()
+                status[coin_id] = "removed"
+
+        # Coins sharing their last cached day, usually all of them, are fetched in one query
+        starts: dict[datetime.date | None, list[str]] = {}
+        for coin_id, coin_stats in stats.items():
+            cached = self.read(coin_id)
+
+            if cached is not None and _matches(cached, coin_stats):
+                status[coin_id] = "unchanged"
+                continue
+
+            start = None
+            if cached is not None and len(cached):
+                # First day fetched again
+                start = (cached["date"][-1] - self.correction_days + 1).astype(datetime.date)
+            starts.setdefault(start, []).append(coin_id)
+
+        reload = []
+        for start, coins in starts.items():
+            fetched = _to_records(self._fetch_prices(db, coins, start))
+
+            for coin_id in coins:
+                records = fetched.get(coin_id, np.empty(0, dtype=PRICE_RECORD))
+
+                if start is not None:
+                    cached = self.read(coin_id)
+                    keep = np.searchsorted(cached["date"], np.datetime64(start, "D"), "left")
+                    records = np.concatenate([cached[:keep], records])
+
+                    if not _matches(records, stats[coin_id]):
+                        # Corrected or deleted before the correction window
+                        reload.append(coin_id)
+                        continue
+
+                self.write(coin_id, records)
+                status[coin_id] = "reloaded" if start is None else "updated"
+
+        if reload:
+            for coin_id, records in _to_records(self._fetch_prices(db, reload, None)).items():
+                self.write(coin_id, records)
+                status[coin_id] = "reloaded"
+
+        for coin_id, coin_status in sorted(status.items()):
+            logger.info(f"Price cache {coin_status} for {coin_id}")
+
+        return status
+
+    def _fetch_stats(
+        self, db: "db_connection.PostgresDb", coin_ids: Sequence[str] | None
+    ) -> dict[str, tuple[int, float, datetime.date]]:
+        """Aggregates the number of rows, sum of prices and last date of every coin on the
+        database, which is all that is transferred for unchanged coins."""
+        from sqlalchemy import func
+
+        from src.db_scripts import db_mappings
+
+        table = db_mappings.CoingeckoScrapedData
+
+        with db.Session() as session:
+            query = session.query(
+                table.coin_id, func.count(), func.sum(table.usd_price), func.max(table.date)
+            ).group_by(table.coin_id)
+
+            if coin_ids:
+                query = query.filter(table.coin_id.in_(coin_ids))
+
+            return {
+                coin_id: (count, price_sum or 0.0, last_date)
+                for coin_id, count, price_sum, last_date in query.all()
+            }
+
+    def _fetch_prices(
+        self,
+        db: "db_connection.PostgresDb",
+        coin_ids: Sequence[str],
+        start_date: datetime.date | None,
+    ) -> pd.DataFrame:
+        """Fetches the prices of coin_ids from start_date, included, or all of them if None."""
+        from src.db_scripts import db_mappings
+
+        return db.read_columns(
+            db_mappings.CoingeckoScrapedData,
+            [COIN_ID, DATE, COIN_PRICE],
+            coin_ids=coin_ids,
+            start_date=start_date,
+        )
+
+
+def _to_records(data: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Splits fetched prices by coin into cache records sorted by date."""
+    records = {}
+
+    for coin_id, coin_data in data.groupby(COIN_ID):
+        coin_records = np.empty(len(coin_data), dtype=PRICE_RECORD)
+        coin_records["date"] = pd.to_datetime(coin_data[DATE]).values.astype("datetime64[D]")
+        coin_records["price"] = coin_data[COIN_PRICE].astype("float64").values
+        records[coin_id] = np.sort(coin_records, order="date")
+
+    return records
+
+
+def _matches(records: np.ndarray, stats: tuple[int, float, datetime.date]) -> bool:
+    """Checks cached records against the database aggregates of their coin."""
+    count, price_sum, last_date = stats
+
+    if len(records) != count:
+        return False
+    if count == 0:
+        return True
+
+    # Sums are accumulated in a different order on the database, so they are compared up to
+    # rounding errors, well below any price correction
+    return records["date"][-1] == np.datetime64(last_date, "D") and np.isclose(
+        np.nansum(records["price"]), price_sum, rtol=1e-11, atol=0.0
+    )
@@ -0,0 +1,289 @@
+"""
+Defines the slim serving artifact of fitted ARIMA models, forecasting with NumPy only.
+"""
+
+import datetime
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+
+def constant_exog(num_obs: int) -> np.ndarray:
+    """Exogenous variables of the models, for num_obs days.
+
+    Models are fitted, extended and forecasted with a single exogenous regressor equal to one, so
+    its coefficient is the intercept of the price equation. Other exogenous variables, e.g. traded
+    volumes, are not supported: every model and forecast path assumes this constant exog.
+
+    Args:
+        num_obs (int): Number of days.
+
+    Returns:
+        np.ndarray: Array of ones, of length num_obs.
+    """
+    return np.ones(num_obs)
+
+
+def normal_quantiles(mean: np.ndarray, var: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Computes quantiles of Gaussian forecasts for every forecasted day at once.
+
+    Args:
+        mean (np.ndarray): Forecast means, one per forecasted day.
+        var (np.ndarray): Forecast variances, one per forecasted day.
+        quantiles (Sequence[float]): Quantiles to compute, each between 0 and 1.
+
+    Raises:
+        ValueError: Quantiles must be strictly between 0 and 1.
+
+    Returns:
+        np.ndarray: Array of shape (len(mean), len(quantiles)).
+    """
+    if any(not 0 < q < 1 for q in quantiles):
+        raise ValueError("Quantiles must be strictly between 0 and 1")
+
+    z_scores = np.array([NormalDist().inv_cdf(q) for q in quantiles])
+
+    return mean[:, np.newaxis] + np.sqrt(var)[:, np.newaxis] * z_scores[np.newaxis, :]
+
+
+class ServingModel:
+    """Compact forecaster built from a fitted SARIMAX model.
+
+    Holds only what is needed to forecast: the state space system matrices implied by the fitted
+    parameters, the exogenous coefficients, the filtered state and covariance after the last
+    observation, and the last observation date. Forecasts are the usual Kalman prediction
+    recursions, so they match statsmodels' `get_forecast` without loading statsmodels, the train
+    data or the filter output.
+
+    Args:
+        coin_id (str): Coin the model was trained for.
+        fit_timestamp (str): Fit timestamp of the model.
+        start_date (datetime.date): Last date in the model train data.
+        params (np.ndarray): Fitted parameters, kept for reference.
+        exog_params (np.ndarray): Coefficients of the exogenous variables.
+        design (np.ndarray): Observation design vector, of shape (k_states,).
+        obs_cov (float): Observation noise variance.
+        transition (np.ndarray): State transition matrix, of shape (k_states, k_states).
+        state_intercept (np.ndarray): State intercept, of shape (k_states,).
+        selected_state_cov (np.ndarray): State noise covariance, R Q R', of shape
+            (k_states, k_states).
+        state (np.ndarray): Predicted state for the day after start_date.
+        state_cov (np.ndarray): Covariance of the predicted state.
+    """
+
+    def __init__(
+        self,
+        coin_id: str,
+        fit_timestamp: str,
+        start_date: datetime.date,
+        params: np.ndarray,
+        exog_params: np.ndarray,
+        design: np.ndarray,
+        obs_cov: float,
+        transition: np.ndarray,
+        state_intercept: np.ndarray,
+        selected_state_cov: np.ndarray,
+        state: np.ndarray,
+        state_cov: np.ndarray,
+    ):
+        self.coin = coin_id
+        self.fit_timestamp = fit_timestamp
+        self.start_date = start_date
+        self.params = np.asarray(params, dtype=np.float64)
+        self.exog_params = np.asarray(exog_params, dtype=np.float64)
+        self.design = np.asarray(design, dtype=np.float64)
+        self.obs_cov = float(obs_cov)
+        self.transition = np.asarray(transition, dtype=np.float64)
+        self.state_intercept = np.asarray(state_intercept, dtype=np.float64)
+        self.selected_state_cov = np.asarray(selected_state_cov, dtype=np.float64)
+        self.state = np.asarray(state, dtype=np.float64)
+        self.state_cov = np.asarray(state_cov, dtype=np.float64)
+
+    @classmethod
+    def from_results(
+        cls, coin_id: str, fit_timestamp: str, start_date: datetime.date, results
+    ) -> "ServingModel":
+        """Extracts a serving model from fitted statsmodels SARIMAX results.
+
+        Args:
+            coin_id (str): Coin the model was trained for.
+            fit_timestamp (str): Fit timestamp of the model.
+            start_date (datetime.date): Last date in the model train data.
+            results (SARIMAXResultsWrapper): Fitted statsmodels results.
+
+        Returns:
+            ServingModel: The slim model.
+        """
+        filter_results = results.filter_results
+
+        # System matrices are time invariant, except for the exog driven observation intercept
+        selection = filter_results.selection[:, :, -1]
+        state_cov = filter_results.state_cov[:, :, -1]
+
+        params = dict(zip(results.model.param_names, np.asarray(results.params)))
+        exog_names = results.model.exog_names or []
+
+        return cls(
+            coin_id=coin_id,
+            fit_timestamp=fit_timestamp,
+            start_date=start_date,
+            params=np.asarray(results.params),
+            exog_params=np.array([params[name] for name in exog_names]),
+            design=filter_results.design[0, :, -1],
+            obs_cov=filter_results.obs_cov[0, 0, -1],
+            transition=filter_results.transition[:, :, -1],
+            state_intercept=filter_results.state_intercept[:, -1],
+            selected_state_cov=selection @ state_cov @ selection.T,
+            state=filter_results.predicted_state[:, -1],
+            state_cov=filter_results.predicted_state_cov[:, :, -1],
+        )
+
+    @property
+    def obs_intercept(self) -> float:
+        """Intercept of the price equation: the exog coefficients times the constant exog."""
+        return float(self.exog_params @ constant_exog(len(self.exog_params)))
+
+    def forecast_horizon(self, target_date: datetime.date) -> int:
+        """Computes the number of days between the last train date and the given target_date.
+
+        Args:
+            target_date (datetime.date): Target date to predict.
+
+        Raises:
+            ValueError: Target date must be greater than train date.
+
+        Returns:
+            int: Number of days to forecast in order to reach target_date.
+        """
+        if target_date <= self.start_date:
+            raise ValueError("Target date must be greater than fit date")
+
+        return (target_date - self.start_date).days
+
+    def forecast_dates(self, num_forecast_days: int) -> list[datetime.date]:
+        """Builds the list of forecasted dates, from the last train date plus one onwards.
+
+        Args:
+            num_forecast_days (int): Number of days to forecast.
+
+        Returns:
+            list[datetime.date]: Dates matching each forecasted step.
+        """
+        return [
+            self.start_date + datetime.timedelta(days=i) for i in range(1, num_forecast_days + 1)
+        ]
+
+    def forecast_mean(self, num_forecast_days: int) -> np.ndarray:
+        """Forecasts coin prices for the given number of days after the last train date.
+
+        Args:
+            num_forecast_days (int): Number of days to forecast.
+
+        Returns:
+            np.ndarray: Forecasted prices, one per forecasted day.
+        """
+        obs_intercept = self.obs_intercept
+
+        state = self.state
+        forecasted_prices = np.empty(num_forecast_days)
+
+        for step in range(num_forecast_days):
+            forecasted_prices[step] = self.design @ state + obs_intercept
+            state = self.transition @ state + self.state_intercept
+
+        return forecasted_prices
+
+    def forecast_mean_var(self, num_forecast_days: int) -> tuple[np.ndarray, np.ndarray]:
+        """Forecasts coin prices and their variances for the given number of days.
+
+        Args:
+            num_forecast_days (int): Number of days to forecast.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Forecasted prices and their variances, one per
+                forecasted day.
+        """
+        obs_intercept = self.obs_intercept
+
+        state, state_cov = self.state, self.state_cov
+        forecasted_prices = np.empty(num_forecast_days)
+        forecasted_vars = np.empty(num_forecast_days)
+
+        for step in range(num_forecast_days):
+            forecasted_prices[step] = self.design @ state + obs_intercept
+            forecasted_vars[step] = self.design @ state_cov @ self.design + self.obs_cov
+            state = self.transition @ state + self.state_intercept
+            state_cov = self.transition @ state_cov @ self.transition.T + self.selected_state_cov
+
+        return forecasted_prices, forecasted_vars
+
+    def forecast(self, target_date: datetime.date) -> Mapping[datetime.date, float]:
+        """Generates coin price forecasts for every date until given target_date.
+
+        Args:
+            target_date (datetime.date): Target date to predict.
+
+        Raises:
+            ValueError: Target date must be greater than train date.
+
+        Returns:
+            Mapping[datetime.date, float]: A Mapping from date to price prediction for range of
+                dates from fitted day plus one to target date.
+        """
+        num_forecast_days = self.forecast_horizon(target_date)
+        date_range = self.forecast_dates(num_forecast_days)
+
+        forecasted_prices = self.forecast_mean(num_forecast_days)
+
+        return {date: forecast for date, forecast in zip(date_range, forecasted_prices.tolist())}
+
+    def save(self, path: Path):
+        """Writes the model to an uncompressed .npz file.
+
+        Args:
+            path (Path): Destination path.
+        """
+        with path.open("wb") as file:
+            np.savez(
+                file,
+                coin_id=np.array(self.coin),
+                fit_timestamp=np.array(self.fit_timestamp),
+                start_date=np.array(self.start_date.isoformat()),
+                params=self.params,
+                exog_params=self.exog_params,
+                design=self.design,
+                obs_cov=np.array(self.obs_cov),
+                transition=self.transition,
+                state_intercept=self.state_intercept,
+                selected_state_cov=self.selected_state_cov,
+                state=self.state,
+                state_cov=self.state_cov,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ServingModel":
+        """Reads a model written by ServingModel.save.
+
+        Args:
+            path (Path): Path to the .npz file.
+
+        Returns:
+            ServingModel: The loaded model.
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                coin_id=str(artifact["coin_id"]),
+                fit_timestamp=str(artifact["fit_timestamp"]),
+                start_date=datetime.date.fromisoformat(str(artifact["start_date"])),
+                params=artifact["params"],
+                exog_params=artifact["exog_params"],
+                design=artifact["design"],
+                obs_cov=float(artifact["obs_cov"]),
+                transition=artifact["transition"],
+                state_intercept=artifact["state_intercept"],
+                selected_state_cov=artifact["selected_state_cov"],
+                state=artifact["state"],
+                state_cov=artifact["state_cov"],
+            )
@@ -7,9 +7,178 @@ for usage help.
 """
 
 import argparse
+import multiprocessing
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from src.constants import ARIMA_DEAFULT_ORDER, COIN_ID, TRAIN_MAX_WORKERS
+from src.logger_definition import get_logger
+from src.models.artifact_store import ArtifactStore
+from src.models.coin_prices import CoinPrices
+from src.models.data_quality import ImputationMethods
+from src.models.estimators import ARIMAEstimators
+from src.models.forecasters import ARIMAModel, ForecastingModel
+from src.models.order_search import OrderCriteria, load_orders
+
+logger = get_logger(__file__)
+
+
+def train_arima(
+    coin_id: str,
+    prices: CoinPrices,
+    order: tuple[int, int, int],
+    seasonal_order: tuple[int, int, int, int] = (0, 0, 0, 0),
+    incremental: bool = False,
+    estimator: ARIMAEstimators = ARIMAEstimators.MLE,
+) -> str:
+    """Fits and saves an ARIMA model for a single coin. Runs inside a worker process.
+
+    Args:
+        coin_id (str): Coin to train the model for.
+        prices (CoinPrices): Train data of every coin, only coin_id's prices are read.
+        order (tuple[int, int, int]): Order for the ARIMA model.
+        seasonal_order (tuple[int, int, int, int], optional): Seasonal order for the ARIMA
+            model. Defaults to (0, 0, 0, 0).
+        incremental (bool, optional): If True and a model was saved before, updates it with the
+            new data instead of fitting from scratch. See ARIMAModel.update. Defaults to False.
+        estimator (ARIMAEstimators, optional): Parameter estimator. Defaults to
+            ARIMAEstimators.MLE.
+
+    Returns:
+        str: Fit timestamp of the saved model.
+    """
+    model = ARIMAModel(coin_id=coin_id)
+    model.train_data = prices.frame(coin_id, dtype=np.float64)
+
+    previous = (
+        ARIMAModel.load_latest(coin_id, order=order, seasonal_order=seasonal_order)
+        if incremental
+        else None
+    )
+
+    if previous is not None:
+        model.update(previous, estimator=estimator)
+    else:
+        model.fit(order=order, seasonal_order=seasonal_order, estimator=estimator)
+
+    return model.fit_timestamp
+
+
+def train_arima_models(
+    prices: CoinPrices,
+    coin_ids: list[str],
+    order: tuple[int, int, int] = ARIMA_DEAFULT_ORDER,
+    max_workers: int = TRAIN_MAX_WORKERS,
+    incremental: bool = False,
+    estimator: ARIMAEstimators = ARIMAEstimators.MLE,
+) -> dict[str, str]:
+    """Fits ARIMA models for several coins in parallel from already loaded data.
+
+    Each coin is fitted in a worker process, which only reads that coin's data. Saved prices are
+    shared with the workers through memory maps, unsaved ones are copied to each worker. A failing
+    coin is logged and reported without stopping the others. Coins with an order selected by
+    ARIMAModel.search_order are fitted with it, the others with the given order.
+
+    Args:
+        prices (CoinPrices): Train data for every coin.
+        coin_ids (list[str]): Coins to train models for.
+        order (tuple[int, int, int], optional): Order for the ARIMA models without a selected
+            order. Defaults to ARIMA_DEAFULT_ORDER.
+        max_workers (int, optional): Number of worker processes. Defaults to TRAIN_MAX_WORKERS.
+        incremental (bool, optional): If True, updates previously saved models instead of fitting
+            from scratch. Defaults to False.
+        estimator (ARIMAEstimators, optional): Parameter estimator. Defaults to
+            ARIMAEstimators.MLE.
+
+    Returns:
+        dict[str, str]: Error message of every coin that failed to train.
+    """
+    failures = {}
+    selected_orders = load_orders()
+
+    for coin_id in set(coin_ids) - set(prices.coins):
+        logger.error(f"No train data for {coin_id}")
+        failures[coin_id] = "No train data"
+
+    # Spawn instead of fork, so workers do not inherit the parent memory and threads
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {}
+        for coin_id in sorted(set(coin_ids) & set(prices.coins)):
+            if coin_id in selected_orders:
+                coin_order = tuple(selected_orders[coin_id]["order"])
+                coin_seasonal_order = tuple(selected_orders[coin_id]["seasonal_order"])
+            else:
+                coin_order, coin_seasonal_order = order, (0, 0, 0, 0)
+
+            future = executor.submit(
+                train_arima,
+                coin_id,
+                prices,
+                coin_order,
+                coin_seasonal_order,
+                incremental,
+                estimator,
+            )
+            futures[future] = coin_id
+
+        for future in as_completed(futures):
+            coin_id = futures[future]
+            try:
+                fit_timestamp = future.result()
+                logger.info(f"Trained {coin_id} model fitted at {fit_timestamp}")
+            except Exception as error:
+                # Includes errors in the worker and workers dying, e.g. out of memory
+                logger.exception(f"Training failed for {coin_id}")
+                failures[coin_id] = repr(error)
+
+    logger.info(f"Trained {len(set(coin_ids)) - len(failures)} of {len(set(coin_ids))} coins")
+
+    return failures
+
+
+def search_arima_orders(
+    prices: CoinPrices,
+    coin_ids: list[str],
+    criterion: OrderCriteria = OrderCriteria.AIC,
+    max_workers: int = TRAIN_MAX_WORKERS,
+) -> dict[str, str]:
+    """Selects and saves the ARIMA order of several coins, one coin at a time.
+
+    Candidate orders of each coin are fitted in parallel, see ARIMAModel.search_order. The workers
+    of a coin are terminated before the next coin starts, so at most max_workers fits run at once.
+    A failing coin is logged and reported without stopping the others.
+
+    Args:
+        prices (CoinPrices): Train data for every coin.
+        coin_ids (list[str]): Coins to search orders for.
+        criterion (OrderCriteria, optional): Ranking criterion. Defaults to OrderCriteria.AIC.
+        max_workers (int, optional): Number of worker processes. Defaults to TRAIN_MAX_WORKERS.
+
+    Returns:
+        dict[str, str]: Error message of every coin whose search failed.
+    """
+    failures = {}
+
+    for coin_id in coin_ids:
+        model = ARIMAModel(coin_id=coin_id)
+
+        try:
+            if coin_id not in prices:
+                raise ValueError("No train data")
+            model.train_data = prices.frame(coin_id, dtype=np.float64)
+            model.search_order(criterion=criterion, max_workers=max_workers)
+        except Exception as error:
+            logger.exception(f"Order search failed for {coin_id}")
+            failures[coin_id] = repr(error)
+
+    return failures
 
-from src.constants import ARIMA_DEAFULT_ORDER
-from src.models.forecasters import ARIMAModel
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser("train_forecasters")
@@ -17,7 +186,8 @@ if __name__ == "__main__":
     parser.add_argument(
         "-c",
         "--coin",
-        help="Coin to train forecaster for",
+        nargs="*",
+        help="Coins to train forecasters for. Defaults to every coin in the database",
     )
 
     parser.add_argument(
@@ -27,16 +197,101 @@ if __name__ == "__main__":
         help="Model to train",
     )
 
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=TRAIN_MAX_WORKERS,
+        help="Number of coins trained in parallel",
+    )
+
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Update the latest models with new data, estimating parameters only when needed",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--estimator",
+        choices=[estimator.value for estimator in ARIMAEstimators],
+        default=ARIMAEstimators.MLE.value,
+        help="ARIMA parameter estimator, hannan_rissanen is much faster than exact mle",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--search-order",
+        action="store_true",
+        help="Select and save the ARIMA order of each coin before training",
+    )
+
+    parser.add_argument(
+        "--criterion",
+        choices=[criterion.value for criterion in OrderCriteria],
+        default=OrderCriteria.AIC.value,
+        help="Criterion to rank ARIMA orders by when searching them",
+    )
+
+    parser.add_argument(
+        "--impute",
+        choices=[method.value for method in ImputationMethods],
+        help="Fill missing days of every coin before training. Defaults to no imputation",
+    )
+
+    parser.add_argument(
+        "--float32",
+        action="store_true",
+        help=(
+            "Hold prices in single precision, halving train data memory. Models are still fitted"
+            " in double precision"
+        ),
+    )
+
     args = parser.parse_args()
 
     if args.model == "ARIMA":
-        model = ARIMAModel(coin_id=args.coin)
+        # Load data for every coin at once
+        data = ForecastingModel().load_train_data(
+            coin_ids=args.coin, imputation=args.impute and ImputationMethods(args.impute)
+        )
+        coin_ids = args.coin or list(data[COIN_ID].unique())
+
+        with tempfile.TemporaryDirectory(prefix="train-prices-") as prices_dir:
+            # Built once and memory mapped by every worker
+            prices = CoinPrices.from_frame(
+                data, dtype=np.float32 if args.float32 else np.float64
+            ).save(Path(prices_dir))
+            del data
+
+            failures = {}
+            if args.search_order:
+                failures = search_arima_orders(
+                    prices,
+                    coin_ids,
+                    criterion=OrderCriteria(args.criterion),
+                    max_workers=args.workers,
+                )
+
+            # Train models with best identified params
+            failures |= train_arima_models(
+                prices,
+                coin_ids,
+                order=ARIMA_DEAFULT_ORDER,
+                max_workers=args.workers,
+                incremental=args.incremental,
+                estimator=ARIMAEstimators(args.estimator),
+            )
 
-        # Load data
-        model.load_train_data()
+        # Thin out old model versions and delete the artifacts no version uses anymore
+        store = ArtifactStore()
+        store.apply_retention()
+        store.collect_garbage()
 
-        # Train model with best identified params
-        model.fit(order=(ARIMA_DEAFULT_ORDER))
+        if failures:
+            logger.error(f"Training failed for: {', '.join(sorted(failures))}")
+            sys.exit(1)
     else:
         # For now only ARIMA
         raise ValueError("Model not implemented")
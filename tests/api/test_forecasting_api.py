@@ -0,0 +1,105 @@
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import forecasting_api
+from src.api.model_registry import ModelRegistry
+from src.constants import BATCH_PREDICTIONS_MAX_SIZE, COIN_ID
+from src.models.artifact_store import ArtifactStore
+from src.models.forecasters import ARIMAModel
+from tests.models.conftest import random_walk_prices
+
+TABLE_HORIZON = 30
+
+
+@pytest.fixture
+def forecasted_coins(tmp_path, monkeypatch) -> list[tuple[str, int]]:
+    """Serves a model per coin from a temporary store, recording every forecast started."""
+    store = ArtifactStore(tmp_path / "forecasting")
+    prices = random_walk_prices(coin_ids=("bitcoin", "ethereum"))
+
+    for coin_id, coin_prices in prices.groupby(COIN_ID):
+        model = ARIMAModel(coin_id=coin_id)
+        model.train_data = coin_prices.reset_index(drop=True)
+        model.fit(order=(1, 1, 0), save=False)
+        model._save((1, 1, 0), (0, 0, 0, 0), max_horizon=TABLE_HORIZON, store=store)
+
+    monkeypatch.setattr(forecasting_api, "model_registry", ModelRegistry(store.root))
+
+    forecasted = []
+    get_forecast_mean = forecasting_api.get_forecast_mean
+
+    async def record_forecast_mean(loaded_model, num_forecast_days):
+        forecasted.append((loaded_model.model.coin, num_forecast_days))
+        return await get_forecast_mean(loaded_model, num_forecast_days)
+
+    monkeypatch.setattr(forecasting_api, "get_forecast_mean", record_forecast_mean)
+
+    return forecasted
+
+
+def batch(*pairs: tuple[str, datetime.date]) -> list[dict]:
+    return [{"coin_id": coin_id, "target_date": str(date)} for coin_id, date in pairs]
+
+
+def test_batch_predictions_forecast_each_coin_once(forecasted_coins):
+    response = TestClient(forecasting_api.app).post(
+        "/predictions",
+        json=batch(
+            ("bitcoin", datetime.date(2024, 7, 10)),
+            ("ethereum", datetime.date(2024, 7, 2)),
+            ("bitcoin", datetime.date(2024, 7, 3)),
+        ),
+    )
+
+    assert response.status_code == 200
+    predictions = response.json()
+    assert [(entry["coin_id"], len(entry["predictions"])) for entry in predictions] == [
+        ("bitcoin", 10),
+        ("ethereum", 2),
+        ("bitcoin", 3),
+    ]
+    assert sorted(forecasted_coins) == [("bitcoin", 10), ("ethereum", 2)]
+
+    # Shorter horizons are slices of the longest forecast
+    longest, shortest = predictions[0]["predictions"], predictions[2]["predictions"]
+    assert shortest == {date: longest[date] for date in list(longest)[:3]}
+
+
+def test_batch_predictions_reject_unknown_coin_before_forecasting(forecasted_coins):
+    # A loaded model could be forecasted before the unknown coin is looked up on disk
+    forecasting_api.model_registry.get("bitcoin")
+
+    response = TestClient(forecasting_api.app).post(
+        "/predictions",
+        json=batch(
+            ("bitcoin", datetime.date(2024, 7, 10)), ("dogecoin", datetime.date(2024, 7, 2))
+        ),
+    )
+
+    assert response.status_code == 404
+    assert "dogecoin" in response.json()["detail"]
+    assert forecasted_coins == []
+
+
+def test_batch_predictions_reject_past_target_date_before_forecasting(forecasted_coins):
+    response = TestClient(forecasting_api.app).post(
+        "/predictions",
+        json=batch(
+            ("bitcoin", datetime.date(2024, 7, 10)), ("ethereum", datetime.date(2024, 6, 1))
+        ),
+    )
+
+    assert response.status_code == 422
+    assert forecasted_coins == []
+
+
+def test_batch_predictions_reject_oversized_batch(forecasted_coins):
+    response = TestClient(forecasting_api.app).post(
+        "/predictions",
+        json=batch(*[("bitcoin", datetime.date(2024, 7, 10))] * (BATCH_PREDICTIONS_MAX_SIZE + 1)),
+    )
+
+    assert response.status_code == 422
+    assert forecasted_coins == []
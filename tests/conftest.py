@@ -0,0 +1,15 @@
+import pytest
+
+from src.db_scripts import db_connection
+from tests.scraped_db import ScrapedDb
+
+
+@pytest.fixture
+def scraped_db(tmp_path, monkeypatch) -> ScrapedDb:
+    """SQLite scraping database, connected to by every PostgresDb created in the test."""
+    db = ScrapedDb(tmp_path / "scraped.db")
+
+    monkeypatch.setattr(db_connection, "create_engine", lambda constring: db.engine)
+    monkeypatch.setattr(db_connection.PostgresDb, "_create_table", lambda self: None)
+
+    return db
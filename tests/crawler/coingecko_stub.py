@@ -0,0 +1,194 @@
+"""Stub of the Coingecko API endpoints used by the crawler, served on a local port.
+
+Prices are a function of the coin, day and time of day only, so tests can check the scraped values
+without storing the served responses.
+"""
+
+import json
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.constants import API_DATE_FORMAT
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def stub_price(coin_id: str, day: date, seconds: int = 0) -> float:
+    """USD price served for a coin at some seconds after midnight UTC of a day.
+
+    Args:
+        coin_id (str): Coin of the price.
+        day (date): Day of the price.
+        seconds (int, optional): Seconds after midnight UTC. Defaults to 0.
+
+    Returns:
+        float: The served price.
+    """
+    return 1000.0 + 100 * len(coin_id) + day.toordinal() % 100 + seconds / SECONDS_PER_DAY
+
+
+class CoingeckoStub:
+    """Coingecko API stub serving the history and market_chart/range endpoints.
+
+    Market caps and volumes are the price times 10 and 5. Served requests are counted by endpoint
+    in requests, and requests answered with 429 under "throttled".
+
+    Args:
+        skip_days (Iterable[date], optional): Days left out of range series, as the API does for
+            some coins and days. Defaults to no days.
+        points_per_day (int, optional): Points per day of range series, 1 for the daily series of
+            ranges over 90 days, 24 for the hourly series of shorter ones. Defaults to 1.
+        rate_limit (int | None, optional): Requests accepted in any second, over which requests are
+            answered with 429, like the API quota. Defaults to no limit.
+        retry_after (int | None, optional): Retry-After header of 429 responses, in seconds.
+            Defaults to no header.
+        latency (float, optional): Seconds taken to answer accepted requests. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        skip_days: Iterable[date] = (),
+        points_per_day: int = 1,
+        rate_limit: int | None = None,
+        retry_after: int | None = None,
+        latency: float = 0.0,
+    ):
+        self.skip_days = set(skip_days)
+        self.points_per_day = points_per_day
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.latency = latency
+        self.requests: Counter[str] = Counter()
+
+        # Arrival times of the requests accepted in the last second
+        self._arrivals: deque[float] = deque()
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.stub = self
+
+    @property
+    def api_url(self) -> str:
+        """Base url of the stub API."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v3"
+
+    def start(self):
+        """Serves requests in a background thread."""
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        """Stops serving requests and closes the server socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "CoingeckoStub":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def accept(self) -> bool:
+        """Checks if a request arriving now is within the rate limit."""
+        now = time.monotonic()
+
+        with self._lock:
+            while self._arrivals and now - self._arrivals[0] >= 1:
+                self._arrivals.popleft()
+
+            if self.rate_limit is not None and len(self._arrivals) >= self.rate_limit:
+                self.requests["throttled"] += 1
+                return False
+
+            self._arrivals.append(now)
+
+        return True
+
+    def history(self, coin_id: str, day: date) -> dict:
+        """Builds the history snapshot of a coin on a day, with its USD market data only."""
+        price = stub_price(coin_id, day)
+
+        return {
+            "id": coin_id,
+            "market_data": {
+                "current_price": {"usd": price},
+                "market_cap": {"usd": price * 10},
+                "total_volume": {"usd": price * 5},
+            },
+        }
+
+    def market_chart_range(self, coin_id: str, start: int, end: int) -> dict:
+        """Builds the USD time series of a coin between two unix timestamps, both included."""
+        series = {"prices": [], "market_caps": [], "total_volumes": []}
+
+        step = SECONDS_PER_DAY // self.points_per_day
+        for timestamp in range(start, end + 1, step):
+            moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+            if moment.date() in self.skip_days:
+                continue
+
+            price = stub_price(coin_id, moment.date(), timestamp % SECONDS_PER_DAY)
+            for name, value in [
+                ("prices", price),
+                ("market_caps", price * 10),
+                ("total_volumes", price * 5),
+            ]:
+                series[name].append([timestamp * 1000, value])
+
+        return series
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Serves /coins/{coin_id}/history and /coins/{coin_id}/market_chart/range requests."""
+
+    server: ThreadingHTTPServer
+
+    def do_GET(self):
+        stub = self.server.stub
+
+        if not stub.accept():
+            self.send_response(429)
+            if stub.retry_after is not None:
+                self.send_header("Retry-After", str(stub.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        time.sleep(stub.latency)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path.strip("/").split("/")
+
+        if path[-1] == "history":
+            endpoint = "history"
+            day = datetime.strptime(query["date"][0], API_DATE_FORMAT).date()
+            body = stub.history(path[-2], day)
+        elif path[-2:] == ["market_chart", "range"]:
+            endpoint = "range"
+            body = stub.market_chart_range(path[-3], int(query["from"][0]), int(query["to"][0]))
+        else:
+            self.send_error(404)
+            return
+
+        stub.requests[endpoint] += 1
+        self._send_json(body)
+
+    def _send_json(self, body: dict):
+        content = json.dumps(body).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # Keep test output clean
+        pass
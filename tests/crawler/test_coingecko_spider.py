@@ -0,0 +1,122 @@
+import urllib.request
+from datetime import date, timedelta
+
+import pytest
+import scrapy
+from scrapy.http import TextResponse
+
+from src.constants import COIN_PRICE, COINGECKO_RANGE_CHUNK_DAYS, DATE, FULL_SCRAPE_DATA
+from src.crawler.items import CoingeckoItem
+from src.crawler.spiders.coingecko_spider import CoingeckoSpider, _chunk_days
+from tests.crawler.coingecko_stub import CoingeckoStub, stub_price
+
+START_DATE = date(2024, 1, 1)
+END_DATE = date(2024, 1, 10)
+
+
+def fetch(request: scrapy.Request) -> TextResponse:
+    """Downloads a spider request from the stub, outside of a crawl."""
+    with urllib.request.urlopen(request.url) as response:
+        return TextResponse(request.url, body=response.read(), encoding="utf-8", request=request)
+
+
+def range_spider(stub: CoingeckoStub) -> CoingeckoSpider:
+    return CoingeckoSpider(
+        coin_ids="bitcoin",
+        start_date=START_DATE.isoformat(),
+        end_date=END_DATE.isoformat(),
+        mode="range",
+        api_url=stub.api_url,
+    )
+
+
+def split_output(output) -> tuple[list[CoingeckoItem], list[scrapy.Request]]:
+    output = list(output)
+    items = [element for element in output if isinstance(element, CoingeckoItem)]
+    requests = [element for element in output if isinstance(element, scrapy.Request)]
+
+    return items, requests
+
+
+@pytest.mark.parametrize("points_per_day", [1, 24])
+def test_parse_range_splits_series_into_days(points_per_day):
+    with CoingeckoStub(points_per_day=points_per_day) as stub:
+        spider = range_spider(stub)
+        (request,) = spider.start_requests()
+
+        items, requests = split_output(spider.parse_range(fetch(request)))
+
+    assert requests == []
+    assert [item[DATE] for item in items] == [
+        START_DATE + timedelta(days=i) for i in range((END_DATE - START_DATE).days + 1)
+    ]
+
+    for item in items:
+        # The midnight point of each day, as in history snapshots
+        price = stub_price("bitcoin", item[DATE])
+        assert item[COIN_PRICE] == price
+        assert item[FULL_SCRAPE_DATA]["market_data"] == {
+            "current_price": {"usd": price},
+            "market_cap": {"usd": price * 10},
+            "total_volume": {"usd": price * 5},
+        }
+
+    assert spider.coin_progress["bitcoin"]["scraped"] == len(items)
+
+
+def test_parse_range_requests_history_of_missing_days():
+    skip_days = [date(2024, 1, 1), date(2024, 1, 5), date(2024, 1, 10)]
+
+    with CoingeckoStub(skip_days=skip_days) as stub:
+        spider = range_spider(stub)
+        (request,) = spider.start_requests()
+
+        items, requests = split_output(spider.parse_range(fetch(request)))
+        assert [request.meta["target_date"] for request in requests] == skip_days
+        assert not {item[DATE] for item in items} & set(skip_days)
+
+        history_items = [item for request in requests for item in spider.parse(fetch(request))]
+
+    assert [item[DATE] for item in history_items] == skip_days
+    assert [item[COIN_PRICE] for item in history_items] == [
+        stub_price("bitcoin", day) for day in skip_days
+    ]
+    assert spider.coin_progress["bitcoin"] == {"days": 10, "scraped": 10, "failed": 0}
+
+
+def consecutive_days(start: date, num_days: int) -> list[date]:
+    return [start + timedelta(days=i) for i in range(num_days)]
+
+
+@pytest.mark.parametrize(
+    "days, chunks",
+    [
+        ([], []),
+        ([START_DATE], [(START_DATE, START_DATE)]),
+        (consecutive_days(START_DATE, 10), [(START_DATE, END_DATE)]),
+        (
+            [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 4), date(2024, 1, 6)],
+            [
+                (date(2024, 1, 1), date(2024, 1, 2)),
+                (date(2024, 1, 4), date(2024, 1, 4)),
+                (date(2024, 1, 6), date(2024, 1, 6)),
+            ],
+        ),
+        (
+            consecutive_days(START_DATE, COINGECKO_RANGE_CHUNK_DAYS),
+            [(START_DATE, START_DATE + timedelta(days=COINGECKO_RANGE_CHUNK_DAYS - 1))],
+        ),
+        (
+            consecutive_days(START_DATE, COINGECKO_RANGE_CHUNK_DAYS + 1),
+            [
+                (START_DATE, START_DATE + timedelta(days=COINGECKO_RANGE_CHUNK_DAYS - 1)),
+                (
+                    START_DATE + timedelta(days=COINGECKO_RANGE_CHUNK_DAYS),
+                    START_DATE + timedelta(days=COINGECKO_RANGE_CHUNK_DAYS),
+                ),
+            ],
+        ),
+    ],
+)
+def test_chunk_days(days, chunks):
+    assert _chunk_days(days) == chunks
@@ -0,0 +1,202 @@
+import multiprocessing
+import time
+from datetime import date, timedelta
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+import scrapy
+from scrapy.http import Response
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+from twisted.internet.defer import Deferred
+
+from src.constants import (
+    CRAWL_BACKOFF_BASE_SECONDS,
+    CRAWL_BACKOFF_MAX_SECONDS,
+    CRAWL_RATE_LIMIT,
+    CRAWL_THROTTLE_MAX_RETRIES,
+)
+from src.crawler.middlewares import (
+    AdaptiveThrottleMiddleware,
+    CustomRetryMiddleware,
+    retry_after,
+)
+from src.crawler.spiders.coingecko_spider import CoingeckoSpider
+from tests.crawler.coingecko_stub import CoingeckoStub
+
+START_DATE = date(2024, 1, 1)
+
+
+def throttle(settings: dict | None = None) -> AdaptiveThrottleMiddleware:
+    """Builds the middleware outside of a crawl, with no download slots to size."""
+    crawler = SimpleNamespace(
+        settings=Settings(settings),
+        engine=SimpleNamespace(downloader=SimpleNamespace(slots={})),
+    )
+    return AdaptiveThrottleMiddleware(crawler)
+
+
+def respond(middleware: AdaptiveThrottleMiddleware, status: int = 200):
+    request = scrapy.Request("http://127.0.0.1/api/v3", meta={"download_latency": 0.1})
+    response = Response(request.url, status=status, request=request)
+    middleware.process_response(request, response, spider=None)
+
+
+def test_throttle_rate_limit_defaults_to_public_quota():
+    middleware = throttle()
+
+    assert middleware.rate == CRAWL_RATE_LIMIT / 2
+    for _ in range(1000):
+        respond(middleware)
+    assert middleware.rate == CRAWL_RATE_LIMIT
+
+
+def test_throttle_rate_limit_setting():
+    rate_limit = 10 * CRAWL_RATE_LIMIT
+    middleware = throttle({"CRAWL_RATE_LIMIT": rate_limit})
+
+    assert middleware.rate == rate_limit / 2
+    for _ in range(10000):
+        respond(middleware)
+    assert middleware.rate == rate_limit
+
+    respond(middleware, status=429)
+    assert middleware.rate < rate_limit
+
+
+def crawl(api_url: str, num_days: int, rate_limit: float, stats: multiprocessing.Queue):
+    """Crawls the history of bitcoin from the stub API, without storing items, and puts the crawl
+    stats in stats. Runs in its own process, as the reactor can only be started once."""
+    from scrapy.crawler import CrawlerProcess
+
+    settings = Settings()
+    settings.setmodule("src.crawler.settings")
+    settings.update({"ITEM_PIPELINES": {}, "CRAWL_RATE_LIMIT": rate_limit, "LOG_LEVEL": "WARNING"})
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(CoingeckoSpider)
+    process.crawl(
+        crawler,
+        coin_ids="bitcoin",
+        start_date=START_DATE.isoformat(),
+        end_date=(START_DATE + timedelta(days=num_days - 1)).isoformat(),
+        api_url=api_url,
+    )
+    process.start()
+
+    stats.put(crawler.stats.get_stats())
+
+
+def test_crawl_converges_under_api_quota():
+    # The key is configured for more than the API accepts, so the throttle has to find the quota
+    num_days, quota = 30, 3
+
+    with CoingeckoStub(rate_limit=quota, latency=0.3) as stub:
+        context = multiprocessing.get_context("spawn")
+        stats = context.Queue()
+        process = context.Process(target=crawl, args=(stub.api_url, num_days, 2 * quota, stats))
+        process.start()
+        crawl_stats = stats.get(timeout=120)
+        process.join()
+
+    assert crawl_stats["coins/bitcoin/scraped"] == num_days
+    assert stub.requests["history"] == num_days
+    # Throttled requests are retried, a few while probing the quota
+    assert stub.requests["throttled"] <= num_days // 5
+    # The rate settles under the quota, without collapsing to the minimum rate
+    assert crawl_stats["throttle/rate"] <= quota
+    assert quota / 4 <= crawl_stats["throttle/effective_rate"] <= quota
+
+
+def throttled(request: scrapy.Request, retry_after_header: str | None = None) -> Response:
+    headers = {} if retry_after_header is None else {"Retry-After": retry_after_header}
+    return Response(request.url, status=429, headers=headers, request=request)
+
+
+@pytest.fixture
+def spider() -> scrapy.Spider:
+    """Spider of a crawler that is never started, collecting the retry stats."""
+    crawler = get_crawler(scrapy.Spider)
+    crawler.stats.open_spider(None)
+    spider = scrapy.Spider("test")
+    spider.crawler = crawler
+
+    return spider
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [("12", 12), (" 1.5 ", 1.5), ("-3", 0), (None, None), ("soon", None)],
+)
+def test_retry_after_seconds(header, expected):
+    request = scrapy.Request("http://127.0.0.1/api/v3")
+
+    assert retry_after(throttled(request, header)) == expected
+
+
+def test_retry_after_http_date():
+    request = scrapy.Request("http://127.0.0.1/api/v3")
+
+    delay = retry_after(throttled(request, formatdate(time.time() + 60, usegmt=True)))
+    assert 58 <= delay <= 60
+
+    assert retry_after(throttled(request, formatdate(time.time() - 60, usegmt=True))) == 0
+
+
+def test_retry_waits_for_retry_after(spider):
+    middleware = CustomRetryMiddleware(Settings())
+    request = scrapy.Request("http://127.0.0.1/api/v3")
+
+    before = time.monotonic()
+    retry_request = middleware.process_response(request, throttled(request, "30"), spider)
+
+    assert retry_request.meta["retry_times"] == 1
+    assert 30 <= retry_request.meta["retry_at"] - before <= 30 + (time.monotonic() - before)
+
+
+@pytest.mark.parametrize("retry_times", [0, 3, 7])
+def test_retry_backs_off_exponentially_with_jitter(spider, retry_times):
+    middleware = CustomRetryMiddleware(Settings())
+    request = scrapy.Request("http://127.0.0.1/api/v3", meta={"retry_times": retry_times})
+    backoff = min(CRAWL_BACKOFF_BASE_SECONDS * 2**retry_times, CRAWL_BACKOFF_MAX_SECONDS)
+
+    delays = []
+    for _ in range(20):
+        before = time.monotonic()
+        retry_request = middleware.process_response(request, throttled(request), spider)
+        delays.append(retry_request.meta["retry_at"] - before)
+
+    # Half of the backoff is fixed, the other half spreads retries out
+    assert all(backoff / 2 <= delay <= backoff + 1 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_gives_up_after_max_retries(spider):
+    middleware = CustomRetryMiddleware(Settings())
+    request = scrapy.Request(
+        "http://127.0.0.1/api/v3", meta={"retry_times": CRAWL_THROTTLE_MAX_RETRIES}
+    )
+    response = throttled(request, "1")
+
+    assert middleware.process_response(request, response, spider) is response
+    assert spider.crawler.stats.get_value("retry/max_reached") == 1
+
+
+def test_retry_request_waits_until_retry_at(spider):
+    from twisted.internet import reactor
+
+    middleware = CustomRetryMiddleware(Settings())
+
+    waiting = scrapy.Request("http://127.0.0.1/api/v3", meta={"retry_at": time.monotonic() + 30})
+    deferred = middleware.process_request(waiting, spider)
+    try:
+        assert isinstance(deferred, Deferred) and not deferred.called
+        (delayed_call,) = reactor.getDelayedCalls()
+        assert 29 <= delayed_call.getTime() - reactor.seconds() <= 30
+    finally:
+        deferred.cancel()
+
+    due = scrapy.Request("http://127.0.0.1/api/v3", meta={"retry_at": time.monotonic() - 1})
+    assert middleware.process_request(due, spider) is None
+    assert middleware.process_request(scrapy.Request("http://127.0.0.1/api/v3"), spider) is None
@@ -0,0 +1,58 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+from src.crawler.stored_days import StoredSources, gap_days, missing_days, stored_days
+
+COIN_IDS = ["bitcoin", "ethereum"]
+
+
+def day(day_of_january: int) -> datetime.date:
+    return datetime.date(2024, 1, day_of_january)
+
+
+def days(*days_of_january: int) -> list[datetime.date]:
+    return [day(day_of_january) for day_of_january in days_of_january]
+
+
+@pytest.fixture
+def stored(scraped_db):
+    """Stores bitcoin from January 3rd to 10th, but the 6th, and nothing for ethereum."""
+    scraped_db.store(
+        pd.DataFrame({COIN_ID: "bitcoin", DATE: days(3, 4, 5, 7, 8, 9, 10), COIN_PRICE: 1.0})
+    )
+
+
+def test_missing_days(stored):
+    missing = missing_days(COIN_IDS, day(1), day(12), StoredSources.DATABASE)
+
+    # Gaps at the start of the range, of a single day, and at its end
+    assert missing == {"bitcoin": days(1, 2, 6, 11, 12), "ethereum": days(*range(1, 13))}
+
+
+def test_missing_days_inside_stored_range(stored):
+    assert missing_days(COIN_IDS, day(7), day(10), StoredSources.DATABASE) == {
+        "bitcoin": [],
+        "ethereum": days(7, 8, 9, 10),
+    }
+
+
+def test_gap_days(stored):
+    # History starts on the first stored day, coins without stored days are skipped
+    assert gap_days(COIN_IDS, day(12), StoredSources.DATABASE) == {"bitcoin": days(6, 11, 12)}
+    assert gap_days(COIN_IDS, day(8), StoredSources.DATABASE) == {"bitcoin": days(6)}
+
+
+def test_gap_days_without_stored_days(scraped_db):
+    assert gap_days(COIN_IDS, day(12), StoredSources.DATABASE) == {}
+
+
+def test_stored_days_from_json_files(tmp_path):
+    for name in ["bitcoin_2024-01-01", "bitcoin_2024-01-03", "ethereum_2024-01-02", "bitcoin_x"]:
+        (tmp_path / f"{name}.json").write_text("{}")
+
+    assert stored_days(["bitcoin"], StoredSources.JSON, start_date=day(2), json_dir=tmp_path) == {
+        ("bitcoin", day(3))
+    }
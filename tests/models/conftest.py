@@ -0,0 +1,46 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+from src.models import artifact_store, forecasters
+
+
+def random_walk_prices(
+    coin_ids=("bitcoin",), num_days: int = 300, end: str = "2024-06-30", seed: int = 0
+) -> pd.DataFrame:
+    """Daily prices of every coin, a random walk with drift."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=end, periods=num_days, freq="D")
+
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    COIN_ID: coin_id,
+                    DATE: dates,
+                    COIN_PRICE: 100 * (i + 1) + np.cumsum(rng.normal(0.1, 1, num_days)),
+                }
+            )
+            for i, coin_id in enumerate(coin_ids)
+        ],
+        ignore_index=True,
+    )
+
+
+@pytest.fixture
+def prices() -> pd.DataFrame:
+    return random_walk_prices()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> artifact_store.ArtifactStore:
+    """Artifact store in a temporary directory, also used by models saving to the default one."""
+    root = tmp_path / "forecasting"
+    monkeypatch.setattr(
+        forecasters, "ArtifactStore", functools.partial(artifact_store.ArtifactStore, root)
+    )
+
+    return artifact_store.ArtifactStore(root)
@@ -0,0 +1,167 @@
+import datetime
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.constants import FIT_TIMESTAMP_FORMAT
+from src.models.artifact_store import ArtifactStore
+
+NOW = datetime.datetime(2024, 6, 30, 12)
+
+
+def make_version(
+    store: ArtifactStore,
+    fit_time: datetime.datetime,
+    model_name: str = "bitcoin_ARIMA_1.1.1_0.0.0.0",
+    coin_id: str = "bitcoin",
+) -> dict:
+    """Builds the metadata of a version with one artifact of its own, without adding it."""
+    fit_timestamp = fit_time.strftime(FIT_TIMESTAMP_FORMAT)
+
+    return {
+        "version": f"{model_name}_{fit_timestamp}",
+        "coin_id": coin_id,
+        "model_name": model_name,
+        "fit_timestamp": fit_timestamp,
+        "artifacts": {"params": store.put_arrays(params=np.array([fit_time.timestamp()]))},
+    }
+
+
+def age(path, seconds: float):
+    """Moves the modification time of a file seconds into the past."""
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_add_version_promotes_to_latest(tmp_path):
+    store = ArtifactStore(tmp_path)
+    first = make_version(store, NOW)
+    second = make_version(store, NOW + datetime.timedelta(hours=1))
+
+    store.add_version(first)
+    store.add_version(second, promote=False)
+
+    assert store.latest(first["model_name"]) == first
+    assert store.versions() == [first, second]
+
+
+def test_add_version_rejects_duplicate_id(tmp_path):
+    store = ArtifactStore(tmp_path)
+    version = make_version(store, NOW)
+    store.add_version(version)
+
+    duplicate = dict(version, artifacts={"params": store.put_arrays(params=np.zeros(1))})
+    with pytest.raises(ValueError, match="already stored"):
+        store.add_version(duplicate)
+
+    assert store.versions() == [version]
+
+
+def test_latest_by_coin_picks_most_recent_fit(tmp_path):
+    store = ArtifactStore(tmp_path)
+    old = make_version(store, NOW, model_name="bitcoin_ARIMA_1.1.1_0.0.0.0")
+    new = make_version(store, NOW + datetime.timedelta(days=1), model_name="bitcoin_ARIMA_2.1.2")
+    other = make_version(store, NOW, model_name="ethereum_ARIMA_1.1.1", coin_id="ethereum")
+
+    for version in [new, old, other]:
+        store.add_version(version)
+
+    assert store.latest_by_coin() == {"bitcoin": new, "ethereum": other}
+
+
+def test_apply_retention(tmp_path):
+    store = ArtifactStore(tmp_path)
+
+    # Versions at 18h, 12h, 6h and 0h of every day of the 8 weeks to sunday 2024-06-30, newest first
+    last_fit = datetime.datetime(2024, 6, 30, 18)
+    versions = [
+        make_version(store, last_fit - datetime.timedelta(days=day, hours=6 * i))
+        for day in range(56)
+        for i in range(4)
+    ]
+    # An older version is the latest, e.g. after a rollback
+    latest = versions[100]
+    for version in reversed(versions):
+        store.add_version(version, promote=version is latest)
+
+    dropped = store.apply_retention(keep_last=2, keep_daily=3, keep_weekly=4)
+
+    expected = [
+        # Last 2
+        last_fit,
+        last_fit - datetime.timedelta(hours=6),
+        # Last version of the last 3 days
+        last_fit - datetime.timedelta(days=1),
+        last_fit - datetime.timedelta(days=2),
+        # Last version of the last 4 weeks, ending on sundays
+        last_fit - datetime.timedelta(weeks=1),
+        last_fit - datetime.timedelta(weeks=2),
+        last_fit - datetime.timedelta(weeks=3),
+    ]
+    kept = {make_version(store, fit_time)["version"] for fit_time in expected} | {latest["version"]}
+
+    assert {version["version"] for version in store.versions()} == kept
+    assert set(dropped) == {version["version"] for version in versions} - kept
+    assert store.latest(latest["model_name"]) == latest
+
+
+def test_collect_garbage(tmp_path):
+    store = ArtifactStore(tmp_path)
+    kept = make_version(store, NOW)
+    dropped = make_version(store, NOW + datetime.timedelta(days=1))
+    store.add_version(kept)
+
+    unreferenced = store.object_path(dropped["artifacts"]["params"])
+    referenced = store.object_path(kept["artifacts"]["params"])
+    recent = store.object_path(store.put_arrays(recent=np.ones(1)))
+    tmp_file = store.temporary_path()
+
+    for path in [unreferenced, referenced, tmp_file]:
+        age(path, 2 * 3600)
+
+    assert store.collect_garbage(grace_seconds=3600) == 1
+
+    assert not unreferenced.exists()
+    assert not tmp_file.exists()
+    # Referenced by a version, and within the grace period, e.g. of a version being written
+    assert referenced.exists()
+    assert recent.exists()
+
+
+def add_versions(root, writer: int, num_versions: int):
+    """Adds versions of one model name to the store at root. Runs in a writer process."""
+    store = ArtifactStore(root)
+
+    for i in range(num_versions):
+        fit_time = NOW + datetime.timedelta(seconds=i, microseconds=writer)
+        store.add_version(make_version(store, fit_time))
+
+
+def test_concurrent_writers_promote_atomically(tmp_path):
+    num_writers, num_versions = 4, 25
+    context = multiprocessing.get_context("spawn")
+    writers = [
+        context.Process(target=add_versions, args=(tmp_path, writer, num_versions))
+        for writer in range(num_writers)
+    ]
+    for writer in writers:
+        writer.start()
+
+    # Readers only ever see complete manifests, whose latest version is stored
+    store = ArtifactStore(tmp_path)
+    while any(writer.is_alive() for writer in writers):
+        manifest = store.manifest()
+        for version_id in manifest["latest"].values():
+            assert version_id in manifest["versions"]
+
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    # No version was lost to a concurrent manifest write
+    versions = store.versions()
+    assert len(versions) == num_writers * num_versions
+    assert store.latest(versions[0]["model_name"]) in versions
@@ -0,0 +1,71 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+from src.models.coin_prices import CoinPrices
+from tests.models.conftest import random_walk_prices
+
+
+@pytest.fixture
+def data() -> pd.DataFrame:
+    return random_walk_prices(coin_ids=("bitcoin", "ethereum", "tether"), num_days=50)
+
+
+def assert_frame_matches(coin_prices: CoinPrices, data: pd.DataFrame):
+    frame = coin_prices.to_frame()
+
+    assert frame[COIN_ID].tolist() == data[COIN_ID].tolist()
+    assert (frame[DATE].values == data[DATE].values).all()
+    np.testing.assert_array_equal(frame[COIN_PRICE].values, data[COIN_PRICE].values)
+
+
+def test_from_frame_round_trip(data):
+    coin_prices = CoinPrices.from_frame(data)
+
+    assert coin_prices.coins == ["bitcoin", "ethereum", "tether"]
+    assert_frame_matches(coin_prices, data)
+
+    ethereum = coin_prices.frame("ethereum")
+    pd.testing.assert_frame_equal(
+        ethereum, data[data[COIN_ID] == "ethereum"].reset_index(drop=True)
+    )
+    assert np.shares_memory(ethereum[COIN_PRICE].values, coin_prices.prices)
+
+
+def test_from_frame_sorts_unsorted_input(data):
+    shuffled = data.sample(frac=1, random_state=0)
+
+    assert_frame_matches(CoinPrices.from_frame(shuffled), data)
+
+
+def test_coin_slice_of_unknown_coin(data):
+    with pytest.raises(KeyError, match="No prices for dogecoin"):
+        CoinPrices.from_frame(data).coin_slice("dogecoin")
+
+
+def test_saved_prices_pickle_as_their_directory(data, tmp_path):
+    saved = CoinPrices.from_frame(data).save(tmp_path / "coin_prices")
+    pickled = pickle.dumps(saved)
+
+    # Only the directory is pickled, the arrays are mapped again from the same files
+    assert len(pickled) < saved.nbytes / 10
+    unpickled = pickle.loads(pickled)
+
+    assert unpickled.path == saved.path
+    for name in ("dates", "prices"):
+        array = getattr(unpickled, name)
+        assert isinstance(array, np.memmap) and not array.flags.writeable
+        assert Path(array.filename) == (saved.path / f"{name}.npy").resolve()
+    assert_frame_matches(unpickled, data)
+
+
+def test_unsaved_prices_pickle_their_arrays(data):
+    coin_prices = CoinPrices.from_frame(data)
+    unpickled = pickle.loads(pickle.dumps(coin_prices))
+
+    assert unpickled.path is None
+    assert_frame_matches(unpickled, data)
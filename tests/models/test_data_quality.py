@@ -0,0 +1,103 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+from src.models.data_quality import (
+    ImputationMethods,
+    data_quality_report,
+    fill_daily_gaps,
+)
+
+
+def daily_prices(coin_id: str, start: str, prices: list[float], skip: tuple[str, ...] = ()):
+    """Prices of consecutive days from start, without the skipped dates."""
+    data = pd.DataFrame(
+        {
+            COIN_ID: coin_id,
+            DATE: pd.date_range(start, periods=len(prices), freq="D"),
+            COIN_PRICE: prices,
+        }
+    )
+
+    return data[~data[DATE].isin(pd.to_datetime(list(skip)))]
+
+
+def test_data_quality_report():
+    rng = np.random.default_rng(0)
+    log_returns = rng.normal(0, 0.01, 29)
+    log_returns[20] = 1
+    bitcoin = daily_prices(
+        "bitcoin",
+        "2024-06-01",
+        list(100 * np.exp(np.cumsum(np.r_[0, log_returns]))),
+        skip=("2024-06-05", "2024-06-06", "2024-06-12"),
+    )
+    ethereum = daily_prices("ethereum", "2024-06-01", list(10 + rng.normal(0, 0.1, 35)))
+
+    # 2024-06-03 is scraped twice
+    bitcoin = pd.concat([bitcoin.iloc[:3], bitcoin.iloc[[2]], bitcoin.iloc[3:]])
+    data = pd.concat([bitcoin, ethereum], ignore_index=True)
+
+    report = data_quality_report(data, reference_date=datetime.date(2024, 7, 5))
+
+    assert report.loc["bitcoin"].to_dict() == {
+        "num_rows": 28,
+        "first_date": pd.Timestamp("2024-06-01"),
+        "last_date": pd.Timestamp("2024-06-30"),
+        "num_duplicates": 1,
+        "num_gaps": 2,
+        "missing_days": 3,
+        "max_gap_days": 2,
+        "missing_prices": 0,
+        "num_outliers": 1,
+        "stale_days": 5,
+    }
+    assert report.loc["ethereum"].to_dict() == {
+        "num_rows": 35,
+        "first_date": pd.Timestamp("2024-06-01"),
+        "last_date": pd.Timestamp("2024-07-05"),
+        "num_duplicates": 0,
+        "num_gaps": 0,
+        "missing_days": 0,
+        "max_gap_days": 0,
+        "missing_prices": 0,
+        "num_outliers": 0,
+        "stale_days": 0,
+    }
+
+
+@pytest.fixture
+def gapped_prices() -> pd.DataFrame:
+    return pd.concat(
+        [
+            daily_prices(
+                "bitcoin", "2024-06-01", [100, 0, 0, 130, 140], skip=("2024-06-02", "2024-06-03")
+            ),
+            daily_prices("ethereum", "2024-06-02", [np.nan, 20, np.nan, 40]),
+        ],
+        ignore_index=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "method, bitcoin_prices, ethereum_prices",
+    [
+        (ImputationMethods.FFILL, [100, 100, 100, 130, 140], [np.nan, 20, 20, 40]),
+        (ImputationMethods.LINEAR, [100, 110, 120, 130, 140], [np.nan, 20, 30, 40]),
+    ],
+)
+def test_fill_daily_gaps(gapped_prices, method, bitcoin_prices, ethereum_prices):
+    filled = fill_daily_gaps(gapped_prices, method)
+
+    # Leading null prices are never filled from the previous coin
+    expected = pd.concat(
+        [
+            daily_prices("bitcoin", "2024-06-01", bitcoin_prices),
+            daily_prices("ethereum", "2024-06-02", ethereum_prices),
+        ],
+        ignore_index=True,
+    )
+    pd.testing.assert_frame_equal(filled, expected, check_dtype=False)
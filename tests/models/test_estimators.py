@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.arima.estimators.hannan_rissanen import hannan_rissanen
+from statsmodels.tsa.arima_process import ArmaProcess
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from src.constants import COIN_PRICE
+from src.models.estimators import hannan_rissanen_params, reflect_roots
+from src.models.serving_model import constant_exog
+
+HORIZON = 30
+
+
+def forecast(X: np.ndarray, order: tuple[int, int, int], params: np.ndarray) -> np.ndarray:
+    results = SARIMAX(X, constant_exog(len(X)), order=order).filter(params)
+    return results.get_forecast(HORIZON, exog=constant_exog(HORIZON)).predicted_mean
+
+
+@pytest.mark.parametrize("order", [(1, 1, 0), (2, 1, 1)])
+def test_constant_coefficient_does_not_affect_differenced_forecasts(prices, order):
+    X = prices[COIN_PRICE].values
+    params = hannan_rissanen_params(X, order)
+
+    shifted = params.copy()
+    shifted[0] += 1000
+
+    np.testing.assert_allclose(forecast(X, order, shifted), forecast(X, order, params), rtol=1e-9)
+
+
+def test_hannan_rissanen_params_are_stationary_and_invertible():
+    # Explosive ARMA(1, 1) prices
+    rng = np.random.default_rng(0)
+    innovations = rng.normal(size=200)
+    X = np.zeros(200)
+    for t in range(1, 200):
+        X[t] = 1.03 * X[t - 1] + innovations[t] + 0.5 * innovations[t - 1]
+
+    raw_estimates, _ = hannan_rissanen(X, ar_order=1, ma_order=1, demean=True)
+    assert not ArmaProcess(np.r_[1, -raw_estimates.ar_params]).isstationary
+
+    _, ar_param, ma_param, _ = hannan_rissanen_params(X, (1, 0, 1))
+    process = ArmaProcess(np.r_[1, -ar_param], np.r_[1, ma_param])
+
+    assert process.isstationary and process.isinvertible
+    np.testing.assert_allclose(ar_param, 1 / raw_estimates.ar_params)
+    np.testing.assert_allclose(ma_param, raw_estimates.ma_params)
+
+
+def test_reflect_roots():
+    # Roots inside (0.5), outside (4) and on (-1) the unit circle
+    polynomial = np.poly([0.5, 4, -1])[::-1]
+
+    reflected_roots = np.sort(np.roots(reflect_roots(polynomial)[::-1]).real)
+
+    np.testing.assert_allclose(reflected_roots, [-1.001, 2, 4])
+    assert reflect_roots(polynomial)[0] == 1
@@ -0,0 +1,122 @@
+import datetime
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from src.constants import COIN_PRICE, FIT_TIMESTAMP_FORMAT
+from src.models.forecasters import ARIMAModel
+
+
+def search(prices, **kwargs):
+    model = ARIMAModel(coin_id="bitcoin")
+    model.train_data = prices
+
+    return model.search_order(
+        max_p=1, max_q=1, seasonal_orders=((0, 0, 0, 0),), max_workers=2, save=False, **kwargs
+    )
+
+
+def test_search_order_ranks_every_candidate(prices):
+    ranking = search(prices, time_budget=120, patience=10)
+
+    assert len(ranking) == 4
+    assert ranking["score"].is_monotonic_increasing
+    assert not multiprocessing.active_children()
+
+
+def test_search_order_terminates_workers_after_time_budget(prices):
+    # Workers can't even start in time, so every candidate is still pending or running
+    with pytest.raises(ValueError, match="No ARIMA order candidate"):
+        search(prices, time_budget=0.01)
+
+    assert not multiprocessing.active_children()
+
+
+def fit_previous(prices, num_new_days: int = 10) -> ARIMAModel:
+    """Fits and saves a model on every day of prices but the last num_new_days."""
+    previous = ARIMAModel(coin_id="bitcoin")
+    previous.train_data = prices.iloc[:-num_new_days].reset_index(drop=True)
+    previous.fit(order=(1, 1, 1), max_horizon=30)
+
+    return previous
+
+
+def update(previous: ARIMAModel, prices, **kwargs) -> ARIMAModel:
+    model = ARIMAModel(coin_id="bitcoin")
+    model.train_data = prices
+    model.update(previous, max_horizon=30, **kwargs)
+
+    return model
+
+
+def assert_appended(model: ARIMAModel, previous: ARIMAModel, prices):
+    assert model.model.nobs == len(prices)
+    assert model.estimation_timestamp == previous.estimation_timestamp
+    assert model.estimation_nobs == previous.estimation_nobs
+    np.testing.assert_array_equal(model.model.params, previous.model.params)
+
+
+def assert_estimated(model: ARIMAModel, prices):
+    assert model.model.nobs == len(prices)
+    assert model.estimation_timestamp == model.fit_timestamp
+    assert model.estimation_nobs == len(prices)
+
+
+def test_update_appends_new_days(prices, store):
+    previous = fit_previous(prices)
+    model = update(previous, prices)
+
+    assert_appended(model, previous, prices)
+    assert model.fit_timestamp != previous.fit_timestamp
+    assert len(store.versions()) == 2
+
+
+def test_update_estimates_stale_parameters(prices, store):
+    previous = fit_previous(prices)
+    estimated_at = datetime.datetime.now() - datetime.timedelta(days=8)
+    previous.estimation_timestamp = estimated_at.strftime(FIT_TIMESTAMP_FORMAT)
+
+    model = update(previous, prices, full_refit_days=7)
+
+    assert_estimated(model, prices)
+    assert len(store.versions()) == 2
+
+
+def test_update_estimates_when_history_changed(prices, store):
+    previous = fit_previous(prices)
+    corrected = prices.copy()
+    corrected.loc[100, COIN_PRICE] += 5
+
+    model = update(previous, corrected)
+
+    assert_estimated(model, corrected)
+    assert len(store.versions()) == 2
+
+
+def test_update_estimates_when_likelihood_drops(prices, store):
+    previous = fit_previous(prices)
+
+    # New days 50 times as volatile as the history
+    rng = np.random.default_rng(1)
+    volatile = prices.copy()
+    volatile.loc[len(prices) - 10 :, COIN_PRICE] = volatile[COIN_PRICE].iloc[-11] + np.cumsum(
+        rng.normal(0, 50, 10)
+    )
+
+    # The same days are appended when any drop is tolerated
+    assert_appended(update(previous, volatile, llf_tolerance=np.inf), previous, volatile)
+
+    model = update(previous, volatile, llf_tolerance=0.5)
+
+    assert_estimated(model, volatile)
+    assert len(store.versions()) == 3
+
+
+def test_update_keeps_model_without_new_days(prices, store):
+    previous = fit_previous(prices, num_new_days=1)
+    model = update(previous, previous.train_data)
+
+    assert model.model is previous.model
+    assert model.fit_timestamp == previous.fit_timestamp
+    assert len(store.versions()) == 1
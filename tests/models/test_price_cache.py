@@ -0,0 +1,115 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+from src.models.price_cache import PriceCache
+from tests.models.conftest import random_walk_prices
+
+CORRECTION_DAYS = 7
+
+
+@pytest.fixture
+def history() -> pd.DataFrame:
+    return random_walk_prices(coin_ids=("bitcoin", "ethereum"), num_days=100)
+
+
+@pytest.fixture
+def cache(tmp_path, scraped_db, history) -> PriceCache:
+    """Cache loaded from a database holding every day of history but the last 10."""
+    scraped_db.store(history[history[DATE] < history[DATE].max() - pd.Timedelta(days=9)])
+
+    cache = PriceCache(tmp_path / "price_cache", correction_days=CORRECTION_DAYS)
+    assert cache.refresh() == {"bitcoin": "reloaded", "ethereum": "reloaded"}
+
+    return cache
+
+
+def assert_cached(cache: PriceCache, expected: pd.DataFrame):
+    cached = cache.load(refresh=False)
+    expected = expected.sort_values([COIN_ID, DATE], ignore_index=True)
+
+    assert cached[COIN_ID].tolist() == expected[COIN_ID].tolist()
+    assert (cached[DATE].values == expected[DATE].values).all()
+    np.testing.assert_array_equal(cached[COIN_PRICE].values, expected[COIN_PRICE].values)
+
+
+def last_day(data: pd.DataFrame, coin_id: str, days_before: int = 0) -> pd.DataFrame:
+    coin_data = data[data[COIN_ID] == coin_id]
+    return coin_data[coin_data[DATE] == coin_data[DATE].max() - pd.Timedelta(days=days_before)]
+
+
+def test_refresh_unchanged(cache):
+    assert cache.refresh() == {"bitcoin": "unchanged", "ethereum": "unchanged"}
+
+
+def test_refresh_appends_new_days(cache, scraped_db, history):
+    scraped_db.store(history[history[COIN_ID] == "bitcoin"])
+
+    assert cache.refresh() == {"bitcoin": "updated", "ethereum": "unchanged"}
+    assert_cached(
+        cache,
+        history[
+            (history[COIN_ID] == "bitcoin")
+            | (history[DATE] < history[DATE].max() - pd.Timedelta(days=9))
+        ],
+    )
+
+
+def test_refresh_applies_corrections_inside_window(cache, scraped_db, history):
+    stored = history[history[DATE] < history[DATE].max() - pd.Timedelta(days=9)].copy()
+
+    # The first day of the correction window
+    corrected = last_day(stored, "ethereum", days_before=CORRECTION_DAYS - 1).index
+    stored.loc[corrected, COIN_PRICE] += 1e-3
+    scraped_db.store(stored.loc[corrected])
+
+    assert cache.refresh() == {"bitcoin": "unchanged", "ethereum": "updated"}
+    assert_cached(cache, stored)
+
+
+def test_refresh_reloads_corrections_before_window(cache, scraped_db, history):
+    stored = history[history[DATE] < history[DATE].max() - pd.Timedelta(days=9)].copy()
+
+    corrected = last_day(stored, "ethereum", days_before=CORRECTION_DAYS).index
+    stored.loc[corrected, COIN_PRICE] += 1e-3
+    scraped_db.store(stored.loc[corrected])
+
+    assert cache.refresh() == {"bitcoin": "unchanged", "ethereum": "reloaded"}
+    assert_cached(cache, stored)
+
+
+def test_refresh_reloads_after_deleted_row(cache, scraped_db, history):
+    stored = history[history[DATE] < history[DATE].max() - pd.Timedelta(days=9)]
+    deleted = last_day(stored, "bitcoin", days_before=50)
+    scraped_db.delete("bitcoin", deleted[DATE].iloc[0].date())
+
+    # The count still does not match after fetching the correction window again
+    assert cache.refresh() == {"bitcoin": "reloaded", "ethereum": "unchanged"}
+    assert_cached(cache, stored.drop(deleted.index))
+
+
+def test_refresh_applies_deleted_row_inside_window(cache, scraped_db, history):
+    stored = history[history[DATE] < history[DATE].max() - pd.Timedelta(days=9)]
+    deleted = last_day(stored, "bitcoin", days_before=1)
+    scraped_db.delete("bitcoin", deleted[DATE].iloc[0].date())
+
+    # The fetched window replaces the cached one, without the deleted day
+    assert cache.refresh() == {"bitcoin": "updated", "ethereum": "unchanged"}
+    assert_cached(cache, stored.drop(deleted.index))
+
+
+def test_refresh_removes_deleted_coins(cache, scraped_db):
+    scraped_db.delete("ethereum")
+
+    assert cache.refresh() == {"bitcoin": "unchanged", "ethereum": "removed"}
+    assert cache.coins() == ["bitcoin"]
+
+
+def test_load_start_date_is_included(cache):
+    start_date = datetime.date(2024, 6, 1)
+    loaded = cache.load(["bitcoin"], start_date=start_date, refresh=False)
+
+    assert loaded[DATE].min() == pd.Timestamp(start_date)
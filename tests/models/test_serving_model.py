@@ -0,0 +1,61 @@
+import datetime
+import warnings
+
+import numpy as np
+import pytest
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from src.constants import COIN_PRICE
+from src.models.serving_model import ServingModel, constant_exog
+
+HORIZON = 30
+
+
+def fit_sarimax(prices: np.ndarray, order, seasonal_order=(0, 0, 0, 0)):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return SARIMAX(
+            prices, constant_exog(len(prices)), order=order, seasonal_order=seasonal_order
+        ).fit(disp=False)
+
+
+def assert_matches_statsmodels(results, tmp_path):
+    serving_model = ServingModel.from_results(
+        "bitcoin", "2024-06-30 00-00-00.000000", datetime.date(2024, 6, 30), results
+    )
+    expected = results.get_forecast(HORIZON, exog=constant_exog(HORIZON))
+
+    mean, var = serving_model.forecast_mean_var(HORIZON)
+    np.testing.assert_allclose(mean, expected.predicted_mean, rtol=1e-9)
+    np.testing.assert_allclose(var, expected.var_pred_mean, rtol=1e-9)
+    np.testing.assert_allclose(serving_model.forecast_mean(HORIZON), mean, rtol=1e-12)
+
+    # The saved artifact forecasts the same
+    serving_model.save(tmp_path / "serving_model.npz")
+    loaded = ServingModel.load(tmp_path / "serving_model.npz")
+    np.testing.assert_array_equal(loaded.forecast_mean_var(HORIZON), (mean, var))
+
+
+@pytest.mark.parametrize(
+    "order, seasonal_order",
+    [
+        ((1, 0, 0), (0, 0, 0, 0)),
+        ((0, 1, 2), (0, 0, 0, 0)),
+        ((2, 1, 1), (0, 0, 0, 0)),
+        ((1, 2, 1), (0, 0, 0, 0)),
+        ((1, 1, 1), (1, 0, 1, 7)),
+    ],
+)
+def test_forecasts_match_statsmodels(prices, order, seasonal_order, tmp_path):
+    results = fit_sarimax(prices[COIN_PRICE].values, order, seasonal_order)
+
+    assert_matches_statsmodels(results, tmp_path)
+
+
+@pytest.mark.parametrize("order", [(1, 0, 1), (2, 1, 2)])
+def test_appended_forecasts_match_statsmodels(prices, order, tmp_path):
+    values = prices[COIN_PRICE].values
+    results = fit_sarimax(values[:-20], order)
+    appended = results.append(values[-20:], exog=constant_exog(20))
+
+    assert_matches_statsmodels(appended, tmp_path)
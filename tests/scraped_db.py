@@ -0,0 +1,57 @@
+"""SQLite stand-in for the scraping database, used through PostgresDb by the code under test."""
+
+import datetime
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from src.constants import COIN_ID, COIN_PRICE, DATE
+
+
+class ScrapedDb:
+    """SQLite database file holding a coingecko_scraped_data table.
+
+    The table is created by hand, as its JSONB column has no SQLite DDL.
+
+    Args:
+        path (Path): Database file.
+    """
+
+    def __init__(self, path: Path):
+        self.engine = create_engine(f"sqlite:///{path}")
+
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE coingecko_scraped_data (coin_id VARCHAR(15), date DATE, usd_price"
+                    " FLOAT, full_response JSON, PRIMARY KEY (coin_id, date))"
+                )
+            )
+
+    def store(self, data: pd.DataFrame):
+        """Inserts or replaces the coin, date and price rows of data."""
+        rows = [
+            {"coin_id": coin_id, "date": date.date().isoformat(), "usd_price": price}
+            for coin_id, date, price in zip(
+                data[COIN_ID], pd.to_datetime(data[DATE]), data[COIN_PRICE]
+            )
+        ]
+
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "INSERT OR REPLACE INTO coingecko_scraped_data VALUES (:coin_id, :date,"
+                    " :usd_price, '{}')"
+                ),
+                rows,
+            )
+
+    def delete(self, coin_id: str, date: datetime.date | None = None):
+        """Deletes the row of a coin and day, or every row of the coin."""
+        query = "DELETE FROM coingecko_scraped_data WHERE coin_id = :coin_id"
+        if date is not None:
+            query += " AND date = :date"
+
+        with self.engine.begin() as connection:
+            connection.execute(text(query), {"coin_id": coin_id, "date": date and date.isoformat()})